@@ -0,0 +1,12 @@
+"""
+ASGI application entry point of the asyncio variant of the REST API
+"""
+
+from ecom_app.aio import create_asgi_app
+
+app = create_asgi_app()
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0")
@@ -0,0 +1,148 @@
+"""
+This script compares the throughput and latency of the sync flask REST API and its asyncio variant
+on a local SQLite database. It needs the async extras: pip install -e .[async]
+
+    python benchmarks/async_vs_sync.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ecom_app import create_app  # noqa: E402
+from ecom_app.aio import create_asgi_app  # noqa: E402
+from ecom_app.database import db  # noqa: E402
+from ecom_app.models import Seller, Product, Order, Status  # noqa: E402
+
+
+# These are the requests of each workload
+WORKLOADS = {
+    'list': ('GET', '/api/orders?limit=50', None),
+    'create': ('POST', '/api/orders', {'product_id': 1, 'quantity': 1, 'customer_details': 'Benchmark customer',
+                                       'status': 'In progress'}),
+}
+
+
+def populate_db(orders, inventory, products=100):
+    """
+    This function fills the database with an admin seller, products and orders
+    :param orders: number of orders to create
+    :param inventory: inventory of each product
+    :param products: number of products to create
+    """
+    db.create_all()
+    db.session.add(Seller(name='Benchmark', email='benchmark@example.com', phone='+380961234567',
+                          password=generate_password_hash('benchmark', method='sha256'), is_admin=True))
+    db.session.flush()
+    db.session.execute(insert(Product), [
+        {'name': f'Product {index}', 'description': 'Description', 'price': 100, 'inventory': inventory,
+         'seller_id': 1}
+        for index in range(1, products + 1)
+    ])
+    db.session.execute(insert(Order), [
+        {'quantity': 1, 'customer_details': 'Customer details', 'status': Status.complete.name, 'seller_id': 1,
+         'product_id': index % products + 1}
+        for index in range(orders)
+    ])
+    db.session.commit()
+    db.session.remove()
+
+
+def summarize(name, workload, latencies, elapsed, errors):
+    """
+    This function prints the throughput and the latency percentiles of a run, it exits instead if any request failed
+    """
+    if errors:
+        sys.exit(f'{name} {workload}: {errors} of {len(latencies)} requests failed, no timings reported')
+
+    latencies = sorted(latencies)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f'{name:<6} {workload:<7} {len(latencies) / elapsed:>9.1f} req/s  p50 {quantiles[49] * 1000:>7.2f} ms  '
+          f'p95 {quantiles[94] * 1000:>7.2f} ms  p99 {quantiles[98] * 1000:>7.2f} ms  errors {errors}')
+
+
+def run_sync(flask_app, cookie, workload, requests, concurrency):
+    """
+    This function sends the requests of the workload to the flask application from a pool of worker threads
+    """
+    method, url, body = WORKLOADS[workload]
+    cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+
+    def send(_):
+        client = flask_app.test_client()
+        client.set_cookie('localhost', cookie_name, cookie)
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        return time.perf_counter() - start, response.status_code >= 400
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    summarize('sync', workload, [latency for latency, _ in results], elapsed, sum(error for _, error in results))
+
+
+async def run_async(asgi_app, cookie_name, cookie, workload, requests, concurrency):
+    """
+    This function sends the requests of the workload to the ASGI application from concurrent tasks
+    """
+    method, url, body = WORKLOADS[workload]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(app=asgi_app, base_url='http://localhost', cookies={cookie_name: cookie}) as client:
+        async def send():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                return time.perf_counter() - start, response.status_code >= 400
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[send() for _ in range(requests)])
+        elapsed = time.perf_counter() - start
+
+    summarize('async', workload, [latency for latency, _ in results], elapsed, sum(error for _, error in results))
+    await asgi_app.state.engine.dispose()
+
+
+def main():
+    """
+    This function runs the benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='requests per workload and application')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent requests')
+    parser.add_argument('--orders', type=int, default=10000, help='orders in the database')
+    parser.add_argument('--workload', choices=list(WORKLOADS), action='append', help='workloads to run, all by default')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        flask_app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(db_dir, 'bench.db'),
+                                            'SECRET_KEY': 'benchmark'})
+        workloads = args.workload or list(WORKLOADS)
+        with flask_app.app_context():
+            # Each workload runs on both applications and every request may create an order of product 1
+            populate_db(args.orders, 2 * args.requests * len(workloads))
+
+        cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+        cookie = flask_app.session_interface.get_signing_serializer(flask_app).dumps({'_user_id': '1'})
+
+        for workload in workloads:
+            run_sync(flask_app, cookie, workload, args.requests, args.concurrency)
+            asyncio.run(run_async(create_asgi_app(flask_app), cookie_name, cookie, workload, args.requests,
+                                  args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
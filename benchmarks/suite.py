@@ -0,0 +1,518 @@
+"""
+This script measures the latency percentiles and the throughput of the service functions and the REST API endpoints
+on databases filled by the seed command with 10k, 100k and 1M orders. It is run separately from the unit tests:
+
+    python benchmarks/suite.py run --sizes 10k 100k --output current.json
+    python benchmarks/suite.py run --baseline baseline.json --output current.json
+    python benchmarks/suite.py compare baseline.json current.json
+
+The seeded SQLite databases are kept in --data-dir between runs, under names including a hash of the schema of
+the models so that they are seeded again when the schema changes, and every run works on a fresh copy of them.
+With --database-uri the suite uses another empty database instead, dropping and recreating its tables for each size
+"""
+
+import argparse
+import functools
+import hashlib
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import sqlalchemy
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ecom_app import create_app  # noqa: E402
+from ecom_app.database import db  # noqa: E402
+from ecom_app.models import Product, Status  # noqa: E402
+from ecom_app.service import order_service, product_service, seller_service, seed_service  # noqa: E402
+
+
+# These are the numbers of orders of each dataset, the datasets have a product per 100 orders
+# and a seller per 10000 orders
+SIZES = {'10k': 10000, '100k': 100000, '1m': 1000000}
+
+# This is the end date of the seeded orders, fixed so that the datasets do not change from day to day
+SEED_END = datetime(2023, 1, 1)
+
+PAGE_SIZE = 50
+BATCH_SIZE = 100
+ADMIN_PASSWORD = 'benchmark'
+
+# This is the inventory the benchmarked products are given before each benchmark, so that the orders they create
+# never run out of stock
+BENCHMARK_INVENTORY = 10 ** 9
+
+
+class BenchmarkError(Exception):
+    """
+    This class is the error raised when a benchmarked call fails, so that no timings of failed calls are reported
+    """
+
+
+def get_dataset_counts(orders):
+    """
+    This function returns the numbers of sellers, products and orders of a dataset
+    :param orders: number of orders of the dataset
+    """
+    return max(orders // 10000, 2), max(orders // 100, 10), orders
+
+
+def populate_db(orders, random_seed):
+    """
+    This function creates the tables, an admin seller and the seeded sellers, products and orders
+    :param orders: number of orders to create
+    :param random_seed: seed of the generated data
+    """
+    db.create_all()
+    seller_service.create_seller('Benchmark admin', 'admin@example.com', '+380961234567',
+                                 generate_password_hash(ADMIN_PASSWORD, method='sha256'), True)
+    sellers, products, orders = get_dataset_counts(orders)
+    seed_service.seed(sellers, products, orders, random_seed=random_seed, end=SEED_END)
+    db.session.remove()
+
+
+def get_schema_hash():
+    """
+    This function returns a short hash of the SQLite DDL of the tables and indexes of the models
+    """
+    dialect = sqlite.dialect()
+    statements = []
+    for model_table in db.metadata.sorted_tables:
+        statements.append(str(CreateTable(model_table).compile(dialect=dialect)))
+        statements.extend(str(CreateIndex(index).compile(dialect=dialect))
+                          for index in sorted(model_table.indexes, key=lambda index: index.name))
+    return hashlib.sha256('\n'.join(statements).encode()).hexdigest()[:12]
+
+
+def prepare_database(size, args, work_dir):
+    """
+    This function returns the URI of a database with the dataset of the size, ready to be changed by the benchmarks
+    :param size: name of the dataset size
+    :param args: command line arguments
+    :param work_dir: directory of the working copies of the SQLite databases
+    """
+    if args.database_uri:
+        app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': args.database_uri, 'SECRET_KEY': 'benchmark'})
+        with app.app_context():
+            db.drop_all()
+            populate_db(SIZES[size], args.seed)
+        return args.database_uri
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = os.path.join(args.data_dir, f'orders-{size}-seed-{args.seed}-schema-{get_schema_hash()}.db')
+    if not os.path.exists(path):
+        log(f'Seeding the {size} dataset into {path}')
+        app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path + '.tmp',
+                                      'SECRET_KEY': 'benchmark'})
+        with app.app_context():
+            populate_db(SIZES[size], args.seed)
+            db.engine.dispose()
+        os.replace(path + '.tmp', path)
+
+    work_path = os.path.join(work_dir, f'orders-{size}.db')
+    shutil.copyfile(path, work_path)
+    return 'sqlite:///' + work_path
+
+
+def get_ids(orders):
+    """
+    This function returns the ids of the rows the benchmarks read and change
+    :param orders: number of orders of the dataset
+    """
+    return {
+        'admin': 1,
+        'seller': 2,
+        'seller_email': 'seeded2@example.com',
+        'product': 1,
+        'product_name': 'Seeded product 1',
+        'products': list(range(1, BATCH_SIZE + 1)),
+        'order': orders // 2,
+        'orders': list(range(orders // 2, orders // 2 + BATCH_SIZE)),
+    }
+
+
+def stock_products(ids):
+    """
+    This function gives the benchmarked products enough inventory for the orders of a benchmark
+    :param ids: ids of the rows to read and change
+    """
+    db.session.execute(sqlalchemy.update(Product).where(Product.id.in_([ids['product'], *ids['products']])).values(
+        inventory=BENCHMARK_INVENTORY
+    ))
+    db.session.commit()
+    db.session.remove()
+
+
+def service_cases(ids):
+    """
+    This function returns the benchmarks of the service functions. Each benchmark is a name and a function that
+    prepares the rows it needs and returns the call to measure
+    :param ids: ids of the rows to read and change
+    """
+    unique = itertools.count(1)
+
+    def new_order():
+        return order_service.create_order(1, 'Benchmark customer', Status.in_progress, ids['seller'],
+                                          ids['product']).id
+
+    def new_product():
+        return product_service.create_product(f'Benchmark product {next(unique)}', 'Description', 100, 10,
+                                              ids['seller']).id
+
+    def new_seller():
+        number = next(unique)
+        return seller_service.create_seller(f'Benchmark seller {number}', f'benchmark{number}@example.com',
+                                            f'+38097{number:07d}', 'password', False).id
+
+    def new_orders():
+        return [{'quantity': 1, 'customer_details': 'Benchmark customer', 'status': 'In progress',
+                 'seller_id': ids['seller'], 'product_id': product_id} for product_id in ids['products']]
+
+    def new_products():
+        return [{'name': f'Benchmark product {next(unique)}', 'description': 'Description', 'price': 100,
+                 'inventory': 10} for _ in range(BATCH_SIZE)]
+
+    def next_status():
+        return Status.complete if next(unique) % 2 else Status.in_progress
+
+    call = functools.partial
+    return [
+        ('order_service.get_orders', lambda: call(order_service.get_orders, PAGE_SIZE)),
+        ('order_service.get_orders after', lambda: call(order_service.get_orders, PAGE_SIZE, ids['order'])),
+        ('order_service.get_orders_filtered',
+         lambda: call(order_service.get_orders_filtered, 'In progress', PAGE_SIZE)),
+        ('order_service.get_order_by_id', lambda: call(order_service.get_order_by_id, ids['order'])),
+        ('order_service.get_orders_by_seller',
+         lambda: call(order_service.get_orders_by_seller, ids['seller'], PAGE_SIZE)),
+        ('order_service.get_orders_by_seller_filtered',
+         lambda: call(order_service.get_orders_by_seller_filtered, ids['seller'], 'In progress', PAGE_SIZE)),
+        ('order_service.create_order', lambda: new_order),
+        ('order_service.create_orders', lambda: call(order_service.create_orders, new_orders())),
+        ('order_service.update_orders_status',
+         lambda: call(order_service.update_orders_status, next_status(), ids['orders'])),
+        ('order_service.update_order',
+         lambda: call(order_service.update_order, ids['order'], quantity=next(unique) % 5 + 1)),
+        ('order_service.delete_order', lambda: call(order_service.delete_order, new_order())),
+        ('order_service.get_available_statuses', lambda: order_service.get_available_statuses),
+        ('product_service.get_products', lambda: call(product_service.get_products, PAGE_SIZE)),
+        ('product_service.get_products_filtered',
+         lambda: call(product_service.get_products_filtered, 10, 500, 1, None, PAGE_SIZE)),
+        ('product_service.get_product_by_id', lambda: call(product_service.get_product_by_id, ids['product'])),
+        ('product_service.get_products_by_ids', lambda: call(product_service.get_products_by_ids, ids['products'])),
+        ('product_service.get_product_by_name',
+         lambda: call(product_service.get_product_by_name, ids['product_name'])),
+        ('product_service.get_products_by_seller',
+         lambda: call(product_service.get_products_by_seller, ids['seller'], PAGE_SIZE)),
+        ('product_service.get_products_by_seller_filtered',
+         lambda: call(product_service.get_products_by_seller_filtered, ids['seller'], 10, 500, 1, None, PAGE_SIZE)),
+        ('product_service.create_product', lambda: new_product),
+        ('product_service.upsert_products', lambda: call(product_service.upsert_products, new_products(),
+                                                         ids['seller'])),
+        ('product_service.update_product',
+         lambda: call(product_service.update_product, ids['product'], inventory=next(unique) % 1000)),
+        ('product_service.delete_product', lambda: call(product_service.delete_product, new_product())),
+        ('product_service.rebuild_ordered_quantity',
+         lambda: call(product_service.rebuild_ordered_quantity, check_only=True)),
+        ('seller_service.get_sellers', lambda: call(seller_service.get_sellers, PAGE_SIZE)),
+        ('seller_service.get_seller_by_id', lambda: call(seller_service.get_seller_by_id, ids['seller'])),
+        ('seller_service.get_seller_by_email',
+         lambda: call(seller_service.get_seller_by_email, ids['seller_email'])),
+        ('seller_service.create_seller', lambda: new_seller),
+        ('seller_service.update_seller',
+         lambda: call(seller_service.update_seller, ids['seller'], name=f'Benchmark renamed {next(unique)}')),
+        ('seller_service.delete_seller', lambda: call(seller_service.delete_seller, new_seller())),
+    ]
+
+
+def endpoint_cases(ids, clients):
+    """
+    This function returns the benchmarks of the REST API endpoints. Each benchmark is a name and a function that
+    prepares the rows it needs and returns the request to measure
+    :param ids: ids of the rows to read and change
+    :param clients: test clients logged in as the admin and as a seller
+    """
+    unique = itertools.count(1)
+    admin, seller = clients['admin'], clients['seller']
+
+    def new_order():
+        return order_service.create_order(1, 'Benchmark customer', Status.in_progress, ids['admin'],
+                                          ids['product']).id
+
+    def new_product():
+        return product_service.create_product(f'Benchmark API product {next(unique)}', 'Description', 100, 10,
+                                              ids['admin']).id
+
+    def new_seller():
+        number = next(unique)
+        return seller_service.create_seller(f'Benchmark API seller {number}', f'api{number}@example.com',
+                                            f'+38098{number:07d}', 'password', False).id
+
+    def new_profile():
+        response = admin.get('/api/stats/pool', headers={'X-Profile': '1'})
+        return response.headers['X-Profile-Id']
+
+    def new_products_file():
+        rows = ''.join(f'Benchmark import {next(unique)},Description,100,10\n' for _ in range(BATCH_SIZE))
+        return ('name,description,price,inventory\n' + rows).encode()
+
+    def next_status():
+        return 'Complete' if next(unique) % 2 else 'In progress'
+
+    order_body = {'product_id': ids['product'], 'quantity': 1, 'customer_details': 'Benchmark customer',
+                  'status': 'In progress'}
+
+    call = functools.partial
+    return [
+        ('GET /api/sellers', lambda: call(admin.get, f'/api/sellers?limit={PAGE_SIZE}')),
+        ('POST /api/sellers', lambda: call(admin.post, '/api/sellers', json={
+            'name': f'Benchmark API seller {next(unique)}', 'email': f'api{next(unique)}@example.com',
+            'phone': f'+38099{next(unique):07d}', 'password': 'benchmark_password'})),
+        ('GET /api/seller/<id>', lambda: call(admin.get, f'/api/seller/{ids["seller"]}')),
+        ('GET /api/seller', lambda: call(seller.get, '/api/seller')),
+        ('PUT /api/seller/<id>', lambda: call(admin.put, f'/api/seller/{ids["seller"]}', json={
+            'name': f'Benchmark renamed {next(unique)}'})),
+        ('DELETE /api/seller/<id>', lambda: call(admin.delete, f'/api/seller/{new_seller()}')),
+        ('GET /api/products', lambda: call(admin.get, f'/api/products?limit={PAGE_SIZE}')),
+        ('GET /api/products filtered',
+         lambda: call(admin.get, f'/api/products?limit={PAGE_SIZE}&inventory_from=10&inventory_to=500')),
+        ('GET /api/products as seller', lambda: call(seller.get, f'/api/products?limit={PAGE_SIZE}')),
+        ('POST /api/products', lambda: call(admin.post, '/api/products', json={
+            'name': f'Benchmark API product {next(unique)}', 'description': 'Description', 'price': 100,
+            'inventory': 10})),
+        ('POST /api/products/import',
+         lambda: call(admin.post, '/api/products/import', data=new_products_file(), content_type='text/csv')),
+        ('GET /api/product/<id>', lambda: call(admin.get, f'/api/product/{ids["product"]}')),
+        ('PUT /api/product/<id>', lambda: call(admin.put, f'/api/product/{ids["product"]}', json={
+            'inventory': next(unique) % 1000})),
+        ('DELETE /api/product/<id>', lambda: call(admin.delete, f'/api/product/{new_product()}')),
+        ('GET /api/orders', lambda: call(admin.get, f'/api/orders?limit={PAGE_SIZE}')),
+        ('GET /api/orders filtered', lambda: call(admin.get, f'/api/orders?limit={PAGE_SIZE}&status=In progress')),
+        ('GET /api/orders as seller', lambda: call(seller.get, f'/api/orders?limit={PAGE_SIZE}')),
+        ('POST /api/orders', lambda: call(admin.post, '/api/orders', json=order_body)),
+        ('POST /api/orders/bulk', lambda: call(admin.post, '/api/orders/bulk', json={
+            'orders': [dict(order_body, product_id=product_id) for product_id in ids['products']]})),
+        ('PUT /api/orders/status', lambda: call(admin.put, '/api/orders/status', json={
+            'status': next_status(), 'ids': ids['orders']})),
+        ('GET /api/order/<id>', lambda: call(admin.get, f'/api/order/{ids["order"]}')),
+        ('PUT /api/order/<id>', lambda: call(admin.put, f'/api/order/{ids["order"]}', json={
+            'quantity': next(unique) % 5 + 1})),
+        ('DELETE /api/order/<id>', lambda: call(admin.delete, f'/api/order/{new_order()}')),
+        ('GET /api/stats/pool', lambda: call(admin.get, '/api/stats/pool')),
+        ('GET /api/profiles', lambda: call(admin.get, '/api/profiles')),
+        ('GET /api/profile/<id>', lambda: call(admin.get, f'/api/profile/{new_profile()}?format=text')),
+    ]
+
+
+def measure(prepare, args):
+    """
+    This function measures a benchmark and returns its latency percentiles and throughput
+    :param prepare: function that prepares the rows the benchmark needs and returns the call to measure
+    :param args: command line arguments
+    """
+    latencies = []
+
+    for iteration in range(args.warmup + args.iterations):
+        run = prepare()
+        start = time.perf_counter()
+        result = run()
+        latency = time.perf_counter() - start
+        db.session.remove()
+
+        if getattr(result, 'status_code', 200) >= 400:
+            raise BenchmarkError(f'Call {iteration + 1} returned {result.status_code}: {result.get_data(as_text=True)}')
+        if iteration < args.warmup:
+            continue
+
+        latencies.append(latency)
+        if sum(latencies) > args.max_time:
+            break
+
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        'iterations': len(latencies),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'min_ms': round(min(latencies) * 1000, 3),
+        'p50_ms': round(quantiles[49] * 1000, 3),
+        'p95_ms': round(quantiles[94] * 1000, 3),
+        'p99_ms': round(quantiles[98] * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3),
+        'ops_per_s': round(len(latencies) / sum(latencies), 1),
+    }
+
+
+def run_size(size, args, work_dir):
+    """
+    This function runs the benchmarks on the dataset of a size and returns their results by name
+    :param size: name of the dataset size
+    :param args: command line arguments
+    :param work_dir: directory of the working copies of the SQLite databases and the profiles
+    """
+    app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': prepare_database(size, args, work_dir),
+                                  'SECRET_KEY': 'benchmark', 'DB_QUERY_BUDGETS_RAISE': False})
+    app.instance_path = work_dir
+
+    ids = get_ids(SIZES[size])
+    serializer = app.session_interface.get_signing_serializer(app)
+    clients = {}
+    for name in ('admin', 'seller'):
+        clients[name] = app.test_client()
+        clients[name].set_cookie('localhost', app.config['SESSION_COOKIE_NAME'],
+                                 serializer.dumps({'_user_id': str(ids[name])}))
+
+    results = {}
+    with app.app_context():
+        for name, prepare in service_cases(ids) + endpoint_cases(ids, clients):
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+
+            stock_products(ids)
+            try:
+                results[name] = measure(prepare, args)
+            except Exception as error:
+                raise BenchmarkError(f'Benchmark {name} on the {size} dataset failed: {error}') from error
+            log(f'{size:<5} {name:<52} p50 {results[name]["p50_ms"]:>9.3f} ms  p95 {results[name]["p95_ms"]:>9.3f} ms  '
+                f'{results[name]["ops_per_s"]:>9.1f} ops/s')
+        db.engine.dispose()
+
+    return results
+
+
+def compare(baseline, current, threshold, min_delta, metric):
+    """
+    This function returns the benchmarks of the current results that are slower than the baseline
+    :param baseline: results of the baseline run
+    :param current: results of the current run
+    :param threshold: relative slowdown of the metric that counts as a regression
+    :param min_delta: smallest slowdown of the metric in milliseconds that counts as a regression
+    :param metric: name of the compared latency metric
+    """
+    regressions = []
+    for size, results in current['results'].items():
+        for name, result in results.items():
+            base = baseline['results'].get(size, {}).get(name)
+            if base is None:
+                continue
+
+            delta = result[metric] - base[metric]
+            if delta > min_delta and result[metric] > base[metric] * (1 + threshold):
+                regressions.append({'size': size, 'name': name, 'baseline_ms': base[metric],
+                                    'current_ms': result[metric], 'change': round(delta / base[metric], 3)})
+
+    return regressions
+
+
+def report_regressions(regressions, metric):
+    """
+    This function prints the regressions and returns the exit code of the comparison
+    :param regressions: regressions found by the comparison
+    :param metric: name of the compared latency metric
+    """
+    for regression in regressions:
+        log(f'REGRESSION {regression["size"]:<5} {regression["name"]:<52} {metric} {regression["baseline_ms"]:.3f} ms '
+            f'-> {regression["current_ms"]:.3f} ms (+{regression["change"]:.0%})')
+    log(f'{len(regressions)} regressions found' if regressions else 'No regressions found')
+    return 1 if regressions else 0
+
+
+def log(message):
+    """
+    This function prints a progress message to the standard error
+    """
+    print(message, file=sys.stderr, flush=True)
+
+
+def load_results(path):
+    """
+    This function reads results stored in a JSON file
+    """
+    with open(path, encoding='utf-8') as results_file:
+        return json.load(results_file)
+
+
+def run(args):
+    """
+    This function runs the benchmarks, stores their results and compares them with the baseline
+    """
+    results = {
+        'meta': {
+            'date': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'database': args.database_uri.split(':', 1)[0] if args.database_uri else 'sqlite',
+            'seed': args.seed,
+            'iterations': args.iterations,
+        },
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            results['results'][size] = run_size(size, args, work_dir)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        return report_regressions(compare(load_results(args.baseline), results, args.threshold, args.min_delta,
+                                          args.metric), args.metric)
+    return 0
+
+
+def main():
+    """
+    This function parses the command line and runs the chosen mode
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    comparison = argparse.ArgumentParser(add_help=False)
+    comparison.add_argument('--threshold', type=float, default=0.2, help='relative slowdown flagged as a regression')
+    comparison.add_argument('--min-delta', type=float, default=0.5,
+                            help='smallest slowdown in ms flagged as a regression')
+    comparison.add_argument('--metric', choices=['p50_ms', 'p95_ms', 'p99_ms', 'mean_ms'], default='p50_ms',
+                            help='compared latency metric')
+
+    run_parser = modes.add_parser('run', parents=[comparison], help='run the benchmarks')
+    run_parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES), help='dataset sizes')
+    run_parser.add_argument('--iterations', type=int, default=50, help='measured calls per benchmark')
+    run_parser.add_argument('--warmup', type=int, default=2, help='unmeasured calls before each benchmark')
+    run_parser.add_argument('--max-time', type=float, default=10, help='seconds after which a benchmark stops early')
+    run_parser.add_argument('--seed', type=int, default=0, help='seed of the generated datasets')
+    run_parser.add_argument('--only', nargs='+', help='run only the benchmarks whose names contain these strings')
+    run_parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'ecom_app_benchmarks'),
+                            help='directory of the seeded SQLite databases')
+    run_parser.add_argument('--database-uri', help='empty database to use instead of the SQLite files, '
+                                                   'its tables are dropped for each size')
+    run_parser.add_argument('--output', help='JSON file of the results, printed by default')
+    run_parser.add_argument('--baseline', help='JSON file of the results to compare with')
+
+    compare_parser = modes.add_parser('compare', parents=[comparison], help='compare stored results')
+    compare_parser.add_argument('baseline', help='JSON file of the baseline results')
+    compare_parser.add_argument('current', help='JSON file of the current results')
+
+    args = parser.parse_args()
+
+    if args.mode == 'compare':
+        return report_regressions(compare(load_results(args.baseline), load_results(args.current), args.threshold,
+                                          args.min_delta, args.metric), args.metric)
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,15 +3,18 @@ The flask application package. Contains the application factory
 """
 
 import os
+import time
 
 import click
-from flask import Flask
-from flask_login import LoginManager
+from flask import Flask, request, redirect, flash
+from flask_login import LoginManager, login_url
 from flask.cli import with_appcontext
 from werkzeug.security import generate_password_hash
 
-from ecom_app import database, views, rest
+from ecom_app import database, pool, cache, principal, tokens, autocomplete, query_stats, profiling, views, rest
 from ecom_app.models import Seller, Product, Order
+from ecom_app.service import product_service, seller_service, import_service, seed_service, rollup_service, \
+    search_service, version_service
 
 
 def create_app(test_config=None):
@@ -22,8 +25,14 @@ def create_app(test_config=None):
 
     if test_config is None:
         app.config.from_mapping(
-            SECRET_KEY=os.urandom(24),
+            SECRET_KEY=os.getenv('SECRET_KEY') or os.urandom(24),
             SQLALCHEMY_DATABASE_URI=os.getenv('SQLALCHEMY_DATABASE_URI'),
+            SQLALCHEMY_ASYNC_DATABASE_URI=os.getenv('SQLALCHEMY_ASYNC_DATABASE_URI'),
+            SQLALCHEMY_REPLICA_URIS=os.getenv('SQLALCHEMY_REPLICA_URIS'),
+            **{key: os.getenv(key) for key in pool.POOL_DEFAULTS},
+            **{key: os.getenv(key) for key in cache.CACHE_DEFAULTS},
+            **{key: os.getenv(key) for key in tokens.TOKEN_DEFAULTS},
+            **{key: os.getenv(key) for key in autocomplete.AUTOCOMPLETE_DEFAULTS},
         )
     else:
         app.config.from_mapping(test_config)
@@ -33,8 +42,24 @@ def create_app(test_config=None):
     except OSError:
         pass
 
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool.get_engine_options(app.config,
+                                                                      app.config.get('SQLALCHEMY_DATABASE_URI'))
     database.db.init_app(app)
-    database.migrate.init_app(app, database.db)
+    database.init_replicas(app)
+
+    with app.app_context():
+        app.extensions['pool_stats'] = {'primary': pool.init_pool_stats(database.db.engine)}
+        for index, engine in enumerate(app.extensions['replicas']):
+            app.extensions['pool_stats'][f'replica_{index}'] = pool.init_pool_stats(engine)
+
+        query_stats.init_query_stats(app, [database.db.engine] + app.extensions['replicas'])
+
+    app.extensions['product_cache'] = cache.create_cache(app.config, app.instance_path)
+    app.extensions['principal_cache'] = cache.create_principal_cache(app.config)
+    app.extensions['token_revocations'] = tokens.create_token_revocations(app.config, app.instance_path)
+    app.extensions['autocomplete_index'] = autocomplete.create_autocomplete_index(app.config)
+    profiling.init_profiling(app)
+    database.migrate.init_app(app, database.db, directory=os.path.join(os.path.dirname(__file__), 'migrations'))
 
     login_manager = LoginManager()
     login_manager.login_view = 'auth.login'
@@ -42,7 +67,19 @@ def create_app(test_config=None):
 
     @login_manager.user_loader
     def load_user(user_id):
-        return Seller.query.get(int(user_id))
+        return principal.load_principal(int(user_id))
+
+    @login_manager.request_loader
+    def load_user_from_request(user_request):
+        return tokens.load_token_principal(app, user_request.headers)
+
+    @login_manager.unauthorized_handler
+    def unauthorized():
+        if tokens.get_bearer_token(request.headers):
+            return {'message': 'Invalid token'}, 401
+
+        flash(login_manager.login_message, category=login_manager.login_message_category)
+        return redirect(login_url(login_manager.login_view, request.url))
 
     @app.cli.command('create_admin')
     @click.argument('name')
@@ -60,6 +97,98 @@ def create_app(test_config=None):
         database.db.session.commit()
         click.echo('Admin created successfully')
 
+    @app.cli.command('rebuild_ordered')
+    @click.option('--check', is_flag=True, help='Only verify the counters without fixing them')
+    @with_appcontext
+    def rebuild_ordered(check):
+        """
+        This function rebuilds or verifies the ordered quantity counters of products from the orders table
+        """
+        mismatches = product_service.rebuild_ordered_quantity(check_only=check)
+        for product_id, stored, actual in mismatches:
+            click.echo(f'Product {product_id}: ordered quantity {stored}, orders contain {actual}')
+
+        if check and mismatches:
+            raise click.ClickException(f'{len(mismatches)} ordered quantity counters are out of date')
+        click.echo('Ordered quantity counters are up to date' if check else
+                   f'{len(mismatches)} ordered quantity counters rebuilt')
+
+    @app.cli.command('rebuild_rollup')
+    @with_appcontext
+    def rebuild_rollup():
+        """
+        This function regenerates the daily sales rollup from the orders table
+        """
+        click.echo(f'{rollup_service.rebuild_rollup()} rollup rows rebuilt')
+
+    @app.cli.command('rebuild_search_index')
+    @with_appcontext
+    def rebuild_search_index():
+        """
+        This function regenerates the full-text index of the names and descriptions of products
+        """
+        click.echo(f'{search_service.rebuild_index()} products indexed')
+
+    @app.cli.command('prune_data_versions')
+    @with_appcontext
+    def prune_data_versions():
+        """
+        This function removes the rows of the data versions of sellers that are no longer their latest
+        """
+        click.echo(f'{version_service.prune_data_versions()} data version rows removed')
+
+    @app.cli.command('import_products')
+    @click.argument('seller_id', type=int)
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'file_format', type=click.Choice(import_service.IMPORT_FORMATS),
+                  help='Format of the file, guessed from its extension by default')
+    @with_appcontext
+    def import_products(seller_id, path, file_format):
+        """
+        This function creates or updates products of the seller from a CSV or NDJSON file
+        """
+        if not seller_service.get_seller_by_id(seller_id):
+            raise click.ClickException('Seller not found')
+
+        file_format = file_format or path.rsplit('.', 1)[-1].lower()
+        if file_format not in import_service.IMPORT_FORMATS:
+            raise click.ClickException('Format is not valid')
+
+        with open(path, 'rb') as stream:
+            summary = import_service.import_products(stream, file_format, seller_id)
+
+        for error in summary['errors']:
+            click.echo(f'Row {error["row"]}: {error["message"]}')
+        click.echo(f'{summary["created"]} products created, {summary["updated"]} products updated, '
+                   f'{summary["error_count"]} rows rejected')
+
+    @app.cli.command('seed')
+    @click.option('--sellers', type=click.IntRange(min=0), default=10, show_default=True, help='Sellers to add')
+    @click.option('--products', type=click.IntRange(min=0), default=1000, show_default=True, help='Products to add')
+    @click.option('--orders', type=click.IntRange(min=0), default=100000, show_default=True, help='Orders to add')
+    @click.option('--seed', 'random_seed', type=int, default=0, show_default=True, help='Seed of the random generator')
+    @click.option('--years', type=click.IntRange(min=1), default=3, show_default=True,
+                  help='Years the order dates are spread over')
+    @click.option('--in-progress', 'in_progress_share', type=click.FloatRange(0, 1), default=0.1, show_default=True,
+                  help='Share of the orders in progress')
+    @click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']),
+                  help='Date of the newest orders, today by default')
+    @click.option('--batch-size', type=click.IntRange(min=1), default=seed_service.SEED_BATCH_SIZE, show_default=True,
+                  help='Rows inserted in one transaction')
+    @with_appcontext
+    def seed(sellers, products, orders, random_seed, years, in_progress_share, end, batch_size):
+        """
+        This function fills the database with generated sellers, products and orders
+        """
+        if orders and not products or products and not sellers:
+            raise click.ClickException('Products need sellers and orders need products')
+
+        start = time.perf_counter()
+        summary = seed_service.seed(sellers, products, orders, random_seed=random_seed, years=years,
+                                    in_progress_share=in_progress_share, end=end, batch_size=batch_size)
+        click.echo(f'{summary["sellers"]} sellers, {summary["products"]} products and {summary["orders"]} orders '
+                   f'added in {time.perf_counter() - start:.1f} s')
+
     app.register_blueprint(views.auth)
     app.register_blueprint(views.sellers)
     app.register_blueprint(views.products)
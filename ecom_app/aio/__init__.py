@@ -0,0 +1,47 @@
+"""
+The asyncio variant of the REST API. Contains the ASGI application factory which serves the /api routes of the sellers,
+products and orders with async services on an AsyncSession, sharing the config and login sessions of the flask
+application
+"""
+
+import contextlib
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.routing import Mount
+
+from ecom_app import create_app
+from ecom_app.aio import api
+from ecom_app.aio.database import create_session_factory
+
+
+async def http_exception(request, exc):
+    """
+    This function returns the JSON error response of an HTTP exception like the flask REST API does
+    """
+    return JSONResponse({'message': exc.detail}, exc.status_code)
+
+
+def create_asgi_app(flask_app=None):
+    """
+    This function creates the ASGI application
+    :param flask_app: flask application to share the config with, created by create_app if not given
+    """
+    if flask_app is None:
+        flask_app = create_app()
+
+    engine, sessions = create_session_factory(flask_app)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    app = Starlette(routes=[Mount('/api', routes=api.routes)], exception_handlers={HTTPException: http_exception},
+                    lifespan=lifespan)
+    app.state.flask_app = flask_app
+    app.state.engine = engine
+    app.state.sessions = sessions
+
+    return app
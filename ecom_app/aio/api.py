@@ -0,0 +1,469 @@
+"""
+This module contains the endpoints of the ASGI application, they mirror the REST API resources of ecom_app.rest
+on the async services
+"""
+
+import functools
+
+from flask_restful import marshal
+from itsdangerous import BadSignature
+from starlette.endpoints import HTTPEndpoint
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from werkzeug.security import generate_password_hash
+
+from ecom_app.aio import order_service, product_service, seller_service
+from ecom_app.principal import Principal, get_principal_key, dump_principal
+from ecom_app.tokens import load_token_principal
+from ecom_app.rest.pagination import parse_page_args, marshal_page
+from ecom_app.rest.sellers_api import sellers_fields
+from ecom_app.rest.seller_api import seller_fields
+from ecom_app.rest.products_api import products_fields
+from ecom_app.rest.product_api import product_fields
+from ecom_app.rest.orders_api import orders_fields
+from ecom_app.rest.order_api import order_fields
+from ecom_app.service.order_service import OutOfStock, get_available_statuses
+from ecom_app.service.import_service import validate_product
+from ecom_app.validation import (InvalidInput, get_json_object, parse_count_arg, validate_new_seller,
+                                 validate_seller_changes, validate_product_changes, validate_new_order,
+                                 validate_order_changes)
+
+
+async def load_user(request, session):
+    """
+    This function returns the seller logged in by the session cookie of the flask application, from the principal
+    cache if it is there, or the seller the bearer token of the request was issued to. None if there is none
+    :param request: request to authenticate
+    :param session: async session
+    """
+    flask_app = request.app.state.flask_app
+    user = load_token_principal(flask_app, request.headers)
+    if user is not None:
+        return user
+
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+
+    if not cookie or serializer is None:
+        return None
+
+    try:
+        flask_session = serializer.loads(cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+        user_id = int(flask_session['_user_id'])
+    except (BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+    cache = session.info.get('principal_cache')
+    if cache is None:
+        return await seller_service.get_seller_by_id(session, user_id)
+
+    values = cache.get(get_principal_key(user_id))
+    if values is not None:
+        return Principal(**values)
+
+    seller = await seller_service.get_seller_by_id(session, user_id)
+    if seller is not None:
+        cache.set(get_principal_key(user_id), dump_principal(seller))
+    return seller
+
+
+def login_required(method):
+    """
+    This function decorates an endpoint method to be called with an async session and the logged in seller
+    :param method: endpoint method to decorate
+    """
+    @functools.wraps(method)
+    async def wrapper(self, request):
+        async with request.app.state.sessions() as session:
+            user = await load_user(request, session)
+            if user is None:
+                return JSONResponse({'message': 'You are not logged in'}, 401)
+            return await method(self, request, session, user)
+
+    return wrapper
+
+
+async def get_json(request):
+    """
+    This function returns the JSON object of the request body, an empty dict if the body is not a JSON object
+    :param request: request to read
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        return {}
+
+    return get_json_object(body)
+
+
+def get_page_args(request):
+    """
+    This function returns the limit and the decoded after cursor of the request, None for absent values
+    :param request: request to read
+    """
+    try:
+        return parse_page_args(request.query_params)
+    except InvalidInput as error:
+        raise HTTPException(400, error.message)
+
+
+def get_count_arg(request, name):
+    """
+    This function returns a non-negative integer argument of the request, None if it is absent
+    :param request: request to read
+    :param name: name of the argument
+    """
+    try:
+        return parse_count_arg(request.query_params, name)
+    except InvalidInput as error:
+        raise HTTPException(400, error.message)
+
+
+class SellersEndpoint(HTTPEndpoint):
+    """
+    This class is used to handle the requests for sellers
+    """
+    @login_required
+    async def get(self, request, session, user):
+        """
+        This method is used to handle the GET request for sellers
+        """
+        if not user.is_admin:
+            raise HTTPException(403, 'You are not authorized')
+
+        limit, after = get_page_args(request)
+        sellers = await seller_service.get_sellers(session, limit + 1 if limit else None, after)
+
+        return JSONResponse(marshal_page(sellers, sellers_fields, limit))
+
+    @login_required
+    async def post(self, request, session, user):
+        """
+        This method is used to handle the POST request for sellers
+        """
+        if not user.is_admin:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        try:
+            values = validate_new_seller(await get_json(request))
+        except InvalidInput as error:
+            return JSONResponse({'message': error.message}, 400)
+
+        password = generate_password_hash(values['password'], method='sha256')
+
+        try:
+            await seller_service.create_seller(session, values['name'], values['email'], values['phone'], password,
+                                               is_admin=False)
+        except Exception:
+            return JSONResponse({'message': 'Error creating seller'}, 500)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+
+class SellerEndpoint(HTTPEndpoint):
+    """
+    This class is used to handle the requests for single seller
+    """
+    @login_required
+    async def get(self, request, session, user):
+        """
+        This method is used to handle the GET request for sellers
+        """
+        seller_id = request.path_params.get('seller_id')
+        if seller_id and seller_id != user.id and not user.is_admin:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        seller = await seller_service.get_seller_by_id(session, seller_id or user.id)
+        if not seller:
+            return JSONResponse({'message': 'Seller not found'}, 404)
+        return JSONResponse(marshal(seller, seller_fields))
+
+    @login_required
+    async def put(self, request, session, user):
+        """
+        This method is used to handle the PUT request for sellers
+        """
+        seller_id = request.path_params.get('seller_id')
+        if seller_id and seller_id != user.id and not user.is_admin:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+        seller_id = seller_id or user.id
+
+        try:
+            values = validate_seller_changes(await get_json(request), allow_password=user.is_admin)
+        except InvalidInput as error:
+            return JSONResponse({'message': error.message}, 400)
+
+        password = generate_password_hash(values['password'], method='sha256') if values['password'] else None
+
+        try:
+            update_successful = await seller_service.update_seller(session, seller_id, values['name'], values['email'],
+                                                                    values['phone'], password)
+        except Exception:
+            return JSONResponse({'message': 'Error updating seller'}, 500)
+
+        if not update_successful:
+            return JSONResponse({'message': 'Seller not found'}, 404)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+    @login_required
+    async def delete(self, request, session, user):
+        """
+        This method is used to handle the DELETE request for sellers
+        """
+        if not user.is_admin:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        seller_id = request.path_params.get('seller_id')
+        if not seller_id:
+            return JSONResponse({'message': 'Seller not found'}, 404)
+
+        try:
+            delete_successful = await seller_service.delete_seller(session, seller_id)
+        except Exception:
+            return JSONResponse({'message': 'Error deleting seller'}, 500)
+
+        if not delete_successful:
+            return JSONResponse({'message': 'Seller not found'}, 404)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+
+class ProductsEndpoint(HTTPEndpoint):
+    """
+    This class is used to handle the requests for products
+    """
+    @login_required
+    async def get(self, request, session, user):
+        """
+        This method is used to handle the GET request for products
+        """
+        inventory_from = get_count_arg(request, 'inventory_from')
+        inventory_to = get_count_arg(request, 'inventory_to')
+        ordered_from = get_count_arg(request, 'ordered_from')
+        ordered_to = get_count_arg(request, 'ordered_to')
+        limit, after = get_page_args(request)
+        page_limit = limit + 1 if limit else None
+
+        if user.is_admin:
+            if any([inventory_from, inventory_to, ordered_from, ordered_to]):
+                products = await product_service.get_products_filtered(session, inventory_from, inventory_to,
+                                                                       ordered_from, ordered_to, page_limit, after)
+            else:
+                products = await product_service.get_products(session, page_limit, after)
+        else:
+            if any([inventory_from, inventory_to, ordered_from, ordered_to]):
+                products = await product_service.get_products_by_seller_filtered(session, user.id, inventory_from,
+                                                                                 inventory_to, ordered_from,
+                                                                                 ordered_to, page_limit, after)
+            else:
+                products = await product_service.get_products_by_seller(session, user.id, page_limit, after)
+
+        return JSONResponse(marshal_page(products, products_fields, limit))
+
+    @login_required
+    async def post(self, request, session, user):
+        """
+        This method is used to handle the POST request for products
+        """
+        values = validate_product(await get_json(request))
+        if values is None:
+            return JSONResponse({'message': 'Invalid input'}, 400)
+
+        try:
+            await product_service.create_product(session, values['name'], values['description'], values['price'],
+                                                 values['inventory'], user.id)
+        except Exception:
+            return JSONResponse({'message': 'Error creating product'}, 500)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+
+class ProductEndpoint(HTTPEndpoint):
+    """
+    This class is used to handle the requests for single product
+    """
+    @login_required
+    async def get(self, request, session, user):
+        """
+        This method is used to handle the GET request for products
+        """
+        product = await product_service.get_product_by_id(session, request.path_params['product_id'])
+        if not product:
+            raise HTTPException(404, 'Product not found')
+        if not user.is_admin and product.seller_id != user.id:
+            raise HTTPException(403, 'You are not authorized')
+        return JSONResponse(marshal(product, product_fields))
+
+    @login_required
+    async def put(self, request, session, user):
+        """
+        This method is used to handle the PUT request for products
+        """
+        product_id = request.path_params['product_id']
+        product = await product_service.get_product_by_id(session, product_id)
+        if not product:
+            return JSONResponse({'message': 'Product not found'}, 404)
+        if not user.is_admin and product.seller_id != user.id:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        try:
+            values = validate_product_changes(await get_json(request))
+        except InvalidInput as error:
+            return JSONResponse({'message': error.message}, 400)
+
+        try:
+            await product_service.update_product(session, product_id, values['name'], values['description'],
+                                                 values['price'], values['inventory'])
+        except Exception:
+            return JSONResponse({'message': 'Error updating product'}, 500)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+    @login_required
+    async def delete(self, request, session, user):
+        """
+        This method is used to handle the DELETE request for products
+        """
+        product_id = request.path_params['product_id']
+        product = await product_service.get_product_by_id(session, product_id)
+        if not product:
+            return JSONResponse({'message': 'Product not found'}, 404)
+        if not user.is_admin and product.seller_id != user.id:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        try:
+            await product_service.delete_product(session, product_id)
+        except Exception:
+            return JSONResponse({'message': 'Error deleting product'}, 500)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+
+class OrdersEndpoint(HTTPEndpoint):
+    """
+    This class is used to handle the requests for orders
+    """
+    @login_required
+    async def get(self, request, session, user):
+        """
+        This method is used to handle the GET request for orders
+        """
+        status = request.query_params.get('status')
+        limit, after = get_page_args(request)
+        page_limit = limit + 1 if limit else None
+
+        if status:
+            if status not in get_available_statuses():
+                raise HTTPException(400, 'Status is not valid')
+            if user.is_admin:
+                orders = await order_service.get_orders_filtered(session, status, page_limit, after)
+            else:
+                orders = await order_service.get_orders_by_seller_filtered(session, user.id, status, page_limit,
+                                                                           after)
+        else:
+            if user.is_admin:
+                orders = await order_service.get_orders(session, page_limit, after)
+            else:
+                orders = await order_service.get_orders_by_seller(session, user.id, page_limit, after)
+
+        return JSONResponse(marshal_page(orders, orders_fields, limit))
+
+    @login_required
+    async def post(self, request, session, user):
+        """
+        This method is used to handle the POST request for orders
+        """
+        try:
+            values = validate_new_order(await get_json(request))
+        except InvalidInput as error:
+            return JSONResponse({'message': error.message}, 400)
+
+        if not await product_service.get_product_by_id(session, values['product_id']):
+            return JSONResponse({'message': 'Product is not valid'}, 400)
+
+        try:
+            order = await order_service.create_order(session, values['quantity'], values['customer_details'],
+                                                     values['status'], user.id, values['product_id'])
+        except OutOfStock:
+            return JSONResponse({'message': 'Product is out of stock'}, 409)
+
+        return JSONResponse({'message': 'Order created', 'order_id': order.id}, 201)
+
+
+class OrderEndpoint(HTTPEndpoint):
+    """
+    This class is used to handle the requests for single order
+    """
+    @login_required
+    async def get(self, request, session, user):
+        """
+        This method is used to handle the GET request for orders
+        """
+        order = await order_service.get_order_by_id(session, request.path_params['order_id'])
+        if not order:
+            raise HTTPException(404, 'Order not found')
+        if not user.is_admin and order.seller_id != user.id:
+            raise HTTPException(403, 'You are not authorized')
+        return JSONResponse(marshal(order, order_fields))
+
+    @login_required
+    async def put(self, request, session, user):
+        """
+        This method is used to handle the PUT request for orders
+        """
+        order_id = request.path_params['order_id']
+        order = await order_service.get_order_by_id(session, order_id)
+        if not order:
+            return JSONResponse({'message': 'Order not found'}, 404)
+        if not user.is_admin and order.seller_id != user.id:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        try:
+            values = validate_order_changes(await get_json(request))
+        except InvalidInput as error:
+            return JSONResponse({'message': error.message}, 400)
+
+        if values['product'] is not None and not await product_service.get_product_by_id(session, values['product']):
+            return JSONResponse({'message': 'Product is not valid'}, 400)
+
+        try:
+            await order_service.update_order(session, order_id, values['quantity'], values['customer_details'],
+                                             values['status'], None, values['product'])
+        except OutOfStock:
+            return JSONResponse({'message': 'Product is out of stock'}, 409)
+        except Exception:
+            return JSONResponse({'message': 'Error updating order'}, 500)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+    @login_required
+    async def delete(self, request, session, user):
+        """
+        This method is used to handle the DELETE request for orders
+        """
+        order_id = request.path_params['order_id']
+        order = await order_service.get_order_by_id(session, order_id)
+        if not order:
+            return JSONResponse({'message': 'Order not found'}, 404)
+        if not user.is_admin and order.seller_id != user.id:
+            return JSONResponse({'message': 'You are not authorized'}, 403)
+
+        try:
+            await order_service.delete_order(session, order_id)
+        except Exception:
+            return JSONResponse({'message': 'Error deleting order'}, 500)
+
+        return JSONResponse({'message': 'Success'}, 200)
+
+
+routes = [
+    Route('/seller/{seller_id:int}', SellerEndpoint),
+    Route('/seller', SellerEndpoint),
+    Route('/sellers', SellersEndpoint),
+    Route('/product/{product_id:int}', ProductEndpoint),
+    Route('/products', ProductsEndpoint),
+    Route('/order/{order_id:int}', OrderEndpoint),
+    Route('/orders', OrdersEndpoint),
+]
@@ -0,0 +1,58 @@
+"""
+This module is used to create the async engine and session factory of the ASGI application
+"""
+
+import os
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+# These are the async drivers used for the drivers of the sync database URI
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def get_async_database_uri(uri, instance_path):
+    """
+    This function returns the database URI with the driver replaced by the async driver of the same database.
+    Relative SQLite paths are resolved against the instance folder like Flask-SQLAlchemy does
+    :param uri: sync database URI
+    :param instance_path: instance folder of the flask application
+    """
+    url = sa.engine.make_url(uri)
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver for {backend} databases')
+
+    if backend == 'sqlite' and url.database not in (None, '', ':memory:') and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(instance_path, url.database))
+
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_session_factory(app):
+    """
+    This function creates the async engine of the database from the config of the flask application
+    and returns it with a factory of sessions bound to it
+    :param app: flask application
+    """
+    uri = app.config.get('SQLALCHEMY_ASYNC_DATABASE_URI') or get_async_database_uri(
+        app.config['SQLALCHEMY_DATABASE_URI'], app.instance_path
+    )
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    # The sync queue pool can't be used by an async engine, so the async engine gets its own with the same settings
+    if engine_options.pop('poolclass', None) is not None:
+        engine_options['poolclass'] = AsyncAdaptedQueuePool
+
+    engine = create_async_engine(uri, **engine_options)
+    # The writes of the async services invalidate the product and principal caches and the tokens of the flask
+    # application
+    return engine, async_sessionmaker(engine, expire_on_commit=False,
+                                      info={'product_cache': app.extensions.get('product_cache'),
+                                            'principal_cache': app.extensions.get('principal_cache'),
+                                            'token_revocations': app.extensions.get('token_revocations')})
@@ -0,0 +1,267 @@
+"""
+This module contains async functions to work with orders table, they mirror the functions of
+ecom_app.service.order_service on an AsyncSession
+"""
+
+from sqlalchemy import select, update
+
+from ecom_app.models import Order, Product, Status
+from ecom_app.aio import product_service, rollup_service, version_service
+from ecom_app.service.order_service import OutOfStock, load_order_columns, paginate_orders, filter_orders_by_status, \
+    get_order_ordered, get_reserve_statement, get_release_statement
+
+
+def get_status_name(status):
+    """
+    This function returns the name of the status given by member, name or label, None if it is not valid
+    :param status: status of the order
+    """
+    if isinstance(status, Status):
+        return status.name
+
+    for member in Status:
+        if status in (member.name, member.label):
+            return member.name
+    return None
+
+
+async def get_orders(session, limit=None, after=None):
+    """
+    This function returns all orders
+    :param session: async session
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    """
+    return await fetch_orders(session, paginate_orders(load_order_columns(select(Order), None), limit, after))
+
+
+async def get_orders_filtered(session, status, limit=None, after=None):
+    """
+    This function returns all orders filtered by status
+    :param session: async session
+    :param status: status of the order
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    """
+    order_query = filter_orders_by_status(load_order_columns(select(Order), None), get_status_name(status))
+
+    return await fetch_orders(session, paginate_orders(order_query, limit, after))
+
+
+async def get_order_by_id(session, order_id):
+    """
+    This function returns order by id
+    :param session: async session
+    :param order_id: id of the order
+    """
+    order_query = load_order_columns(select(Order), None).filter_by(id=order_id)
+
+    return (await session.execute(order_query)).scalars().first()
+
+
+async def get_orders_by_seller(session, seller_id, limit=None, after=None):
+    """
+    This function returns all orders filtered by seller
+    :param session: async session
+    :param seller_id: id of the seller
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    """
+    order_query = load_order_columns(select(Order), None).filter_by(seller_id=seller_id)
+
+    return await fetch_orders(session, paginate_orders(order_query, limit, after))
+
+
+async def get_orders_by_seller_filtered(session, seller_id, status, limit=None, after=None):
+    """
+    This function returns all orders filtered by seller and status
+    :param session: async session
+    :param seller_id: id of the seller
+    :param status: status of the order
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    """
+    order_query = load_order_columns(select(Order), None).filter_by(seller_id=seller_id)
+    order_query = filter_orders_by_status(order_query, get_status_name(status))
+
+    return await fetch_orders(session, paginate_orders(order_query, limit, after))
+
+
+async def fetch_orders(session, order_query):
+    """
+    This function returns orders of the query as a list
+    :param session: async session
+    :param order_query: query to fetch
+    """
+    return (await session.execute(order_query)).scalars().all()
+
+
+async def create_order(session, quantity, customer_details, status, seller_id, product_id):
+    """
+    This function creates new order
+    :param session: async session
+    :param quantity: quantity of the product
+    :param customer_details: customer details
+    :param status: status of the order
+    :param seller_id: id of the seller
+    :param product_id: id of the product
+    """
+    await reserve_inventory(session, {product_id: quantity})
+
+    order = Order(quantity=quantity, customer_details=customer_details, status=get_status_name(status) or status,
+                  seller_id=seller_id, product_id=product_id)
+    session.add(order)
+    await session.flush()
+
+    await rollup_service.add_orders(session, Order.id == order.id)
+    await change_product_ordered(session, order.product_id, get_order_ordered(order))
+    await version_service.bump_data_versions(session, [seller_id], [product_id])
+
+    await session.commit()
+
+    await product_service.invalidate_ordered_products(session, [product_id])
+    return order
+
+
+async def update_order(session, order_id, quantity=None, customer_details=None, status=None, seller_id=None,
+                       product_id=None):
+    """
+    This function updates order
+    :param session: async session
+    :param order_id: id of the order
+    :param quantity: quantity of the product
+    :param customer_details: customer details
+    :param status: status of the order
+    :param seller_id: id of the seller
+    :param product_id: id of the product
+    """
+    order = (await session.execute(select(Order).filter_by(id=order_id))).scalars().first()
+
+    if not order:
+        return False
+
+    old_seller_id, old_product_id, old_ordered = order.seller_id, order.product_id, get_order_ordered(order)
+    old_quantity = order.quantity
+    old_rollup = await rollup_service.get_order_deltas(session, Order.id == order_id, sign=-1)
+
+    status = get_status_name(status)
+
+    if quantity:
+        order.quantity = quantity
+    if customer_details:
+        order.customer_details = customer_details
+    if status:
+        order.status = status
+    if seller_id:
+        order.seller_id = seller_id
+    if product_id:
+        order.product_id = product_id
+
+    if order.product_id != old_product_id:
+        await reserve_inventory(session, {order.product_id: order.quantity})
+        await release_inventory(session, {old_product_id: old_quantity})
+        stock_product_ids = [old_product_id, order.product_id]
+    elif order.quantity > old_quantity:
+        await reserve_inventory(session, {order.product_id: order.quantity - old_quantity})
+        stock_product_ids = [order.product_id]
+    elif order.quantity < old_quantity:
+        await release_inventory(session, {order.product_id: old_quantity - order.quantity})
+        stock_product_ids = [order.product_id]
+    else:
+        stock_product_ids = []
+
+    await session.flush()
+
+    new_rollup = await rollup_service.get_order_deltas(session, Order.id == order_id)
+    await rollup_service.change_rollup(session, old_rollup + new_rollup)
+    new_ordered = get_order_ordered(order)
+    if order.product_id != old_product_id:
+        await change_product_ordered(session, old_product_id, -old_ordered)
+        await change_product_ordered(session, order.product_id, new_ordered)
+        changed_product_ids = [product_id for product_id, ordered in ((old_product_id, old_ordered),
+                                                                      (order.product_id, new_ordered)) if ordered]
+    else:
+        await change_product_ordered(session, order.product_id, new_ordered - old_ordered)
+        changed_product_ids = [order.product_id] if new_ordered != old_ordered else []
+    changed_product_ids = list(set(changed_product_ids + stock_product_ids))
+
+    await version_service.bump_data_versions(session, {old_seller_id, order.seller_id}, changed_product_ids or None)
+
+    await session.commit()
+
+    await product_service.invalidate_ordered_products(session, changed_product_ids)
+    return order
+
+
+async def delete_order(session, order_id):
+    """
+    This function deletes order
+    :param session: async session
+    :param order_id: id of the order
+    """
+    order = (await session.execute(select(Order).filter_by(id=order_id))).scalars().first()
+
+    if not order:
+        return False
+
+    await rollup_service.add_orders(session, Order.id == order_id, sign=-1)
+    await change_product_ordered(session, order.product_id, -get_order_ordered(order))
+    await release_inventory(session, {order.product_id: order.quantity})
+    await version_service.bump_data_versions(session, [order.seller_id], [order.product_id])
+
+    await session.delete(order)
+    await session.commit()
+
+    await product_service.invalidate_ordered_products(session, [order.product_id])
+    return True
+
+
+async def change_product_ordered(session, product_id, quantity):
+    """
+    This function changes the ordered quantity counter of the product in the current transaction
+    :param session: async session
+    :param product_id: id of the product
+    :param quantity: quantity to add to the counter, negative to subtract
+    """
+    if quantity:
+        await session.execute(update(Product).where(Product.id == product_id).values(
+            ordered_quantity=Product.ordered_quantity + quantity
+        ))
+
+
+async def reserve_inventory(session, product_quantities):
+    """
+    This function takes the quantities from the inventory of the products with a single conditional update
+    in the current transaction. If any product has not enough left, the transaction is rolled back and OutOfStock
+    is raised with the ids of those products
+    :param session: async session
+    :param product_quantities: dict of the quantities to take by product id
+    """
+    if not product_quantities:
+        return
+
+    if (await session.execute(get_reserve_statement(product_quantities))).rowcount == len(product_quantities):
+        return
+
+    await session.rollback()
+    if len(product_quantities) == 1:
+        raise OutOfStock(list(product_quantities))
+
+    out_of_stock = []
+    for product_id, quantity in product_quantities.items():
+        if not (await session.execute(get_reserve_statement({product_id: quantity}))).rowcount:
+            out_of_stock.append(product_id)
+    if out_of_stock:
+        await session.rollback()
+        raise OutOfStock(out_of_stock)
+
+
+async def release_inventory(session, product_quantities):
+    """
+    This function returns the quantities to the inventory of the products in the current transaction
+    :param session: async session
+    :param product_quantities: dict of the quantities to return by product id
+    """
+    if product_quantities:
+        await session.execute(get_release_statement(), [{'stock_product_id': product_id, 'released': quantity}
+                                                        for product_id, quantity in product_quantities.items()])
@@ -0,0 +1,203 @@
+"""
+This module contains async functions to work with products table, they mirror the functions of
+ecom_app.service.product_service on an AsyncSession
+"""
+
+from sqlalchemy import select
+
+from ecom_app.models import Product
+from ecom_app.aio import rollup_service, search_service, version_service
+from ecom_app.service.product_service import paginate_products, filter_products_by_inventory, \
+    filter_products_by_ordered, get_cache_keys
+
+
+async def get_products(session, limit=None, after=None):
+    """
+    This function returns all products
+    :param session: async session
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    """
+    return await fetch_products(session, paginate_products(select(Product), limit, after))
+
+
+async def get_products_filtered(session, inventory_from, inventory_to, ordered_from, ordered_to, limit=None,
+                                after=None):
+    """
+    This function returns all products filtered by inventory and ordered
+    :param session: async session
+    :param inventory_from: inventory start range value
+    :param inventory_to: inventory end range value
+    :param ordered_from: ordered start range value
+    :param ordered_to: ordered end range value
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    """
+    product_query = filter_products_by_inventory(select(Product), inventory_from, inventory_to)
+    product_query = filter_products_by_ordered(product_query, ordered_from, ordered_to)
+
+    return await fetch_products(session, paginate_products(product_query, limit, after))
+
+
+async def get_product_by_id(session, product_id):
+    """
+    This function returns product by id
+    :param session: async session
+    :param product_id: id of the product
+    """
+    return (await session.execute(select(Product).filter_by(id=product_id))).scalars().first()
+
+
+async def get_products_by_seller(session, seller_id, limit=None, after=None):
+    """
+    This function returns all products filtered by seller
+    :param session: async session
+    :param seller_id: id of the seller
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    """
+    product_query = select(Product).filter_by(seller_id=seller_id)
+
+    return await fetch_products(session, paginate_products(product_query, limit, after))
+
+
+async def get_products_by_seller_filtered(session, seller_id, inventory_from, inventory_to, ordered_from, ordered_to,
+                                          limit=None, after=None):
+    """
+    This function returns all products filtered by seller and inventory and ordered
+    :param session: async session
+    :param seller_id: id of the seller
+    :param inventory_from: inventory start range value
+    :param inventory_to: inventory end range value
+    :param ordered_from: ordered start range value
+    :param ordered_to: ordered end range value
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    """
+    product_query = select(Product).filter_by(seller_id=seller_id)
+    product_query = filter_products_by_inventory(product_query, inventory_from, inventory_to)
+    product_query = filter_products_by_ordered(product_query, ordered_from, ordered_to)
+
+    return await fetch_products(session, paginate_products(product_query, limit, after))
+
+
+async def fetch_products(session, product_query):
+    """
+    This function returns products of the query as a list
+    :param session: async session
+    :param product_query: query to fetch
+    """
+    return (await session.execute(product_query)).scalars().all()
+
+
+async def create_product(session, name, description, price, inventory, seller_id):
+    """
+    This function creates a new product
+    :param session: async session
+    :param name: name of the product
+    :param description: description of the product
+    :param price: price of the product
+    :param inventory: inventory of the product
+    :param seller_id: id of the seller
+    """
+    product = Product(name=name, description=description, price=price, inventory=inventory, seller_id=seller_id)
+    session.add(product)
+    await version_service.bump_data_versions(session, [seller_id])
+    await session.flush()
+    await search_service.index_products(session, [product.id])
+    await session.commit()
+
+    invalidate_cached_products(session, seller_ids=[seller_id])
+    return product
+
+
+async def update_product(session, product_id, name=None, description=None, price=None, inventory=None,
+                         seller_id=None):
+    """
+    This function updates a product
+    :param session: async session
+    :param product_id: id of the product
+    :param name: name of the product
+    :param description: description of the product
+    :param price: price of the product
+    :param inventory: inventory of the product
+    :param seller_id: id of the seller
+    """
+    product = await get_product_by_id(session, product_id)
+
+    if not product:
+        return False
+
+    seller_ids = {product.seller_id, seller_id or product.seller_id}
+    await version_service.bump_data_versions(session, seller_ids,
+                                             order_product_ids=[product_id] if name or price else None)
+
+    if name:
+        product.name = name
+    if description:
+        product.description = description
+    if price:
+        product.price = price
+        await rollup_service.change_revenue(session, {product_id: price})
+    if inventory:
+        product.inventory = inventory
+    if seller_id:
+        product.seller_id = seller_id
+    if name or description:
+        await search_service.index_products(session, [product_id])
+
+    await session.commit()
+
+    invalidate_cached_products(session, [product_id], seller_ids)
+    return product
+
+
+async def delete_product(session, product_id):
+    """
+    This function deletes a product
+    :param session: async session
+    :param product_id: id of the product
+    """
+    product = await get_product_by_id(session, product_id)
+
+    if not product:
+        return False
+
+    await version_service.bump_data_versions(session, [product.seller_id], order_product_ids=[product_id])
+    await rollup_service.remove_orders(session, product_ids=[product_id])
+    await search_service.unindex_products(session, [product_id])
+
+    await session.delete(product)
+    await session.commit()
+
+    invalidate_cached_products(session, [product_id], [product.seller_id])
+    return True
+
+
+def invalidate_cached_products(session, product_ids=(), seller_ids=()):
+    """
+    This function invalidates the cached products and listings of the sellers, after the write changing them
+    is committed
+    :param session: async session
+    :param product_ids: ids of the changed products
+    :param seller_ids: ids of the sellers whose listings changed
+    """
+    cache = session.info.get('product_cache')
+    if cache is not None:
+        cache.delete(*get_cache_keys(product_ids, {seller_id for seller_id in seller_ids if seller_id is not None}))
+
+
+async def invalidate_ordered_products(session, product_ids):
+    """
+    This function invalidates the cached products whose ordered quantity or inventory changed and the listings
+    of their sellers, after the write changing them is committed
+    :param session: async session
+    :param product_ids: ids of the changed products
+    """
+    if session.info.get('product_cache') is None or not product_ids:
+        return
+
+    seller_ids = (await session.execute(
+        select(Product.seller_id).where(Product.id.in_(product_ids)).distinct()
+    )).scalars().all()
+    invalidate_cached_products(session, product_ids, seller_ids)
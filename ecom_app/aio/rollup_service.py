@@ -0,0 +1,59 @@
+"""
+This module contains async functions to work with order_daily_rollup table, they mirror the functions of
+ecom_app.service.rollup_service on an AsyncSession
+"""
+
+from ecom_app.service.rollup_service import get_orders_select, get_deltas, merge_deltas, get_upsert_statement, \
+    get_revenue_statement, get_remove_statement
+
+
+async def change_rollup(session, deltas):
+    """
+    This function adds changes to the rollup rows in the current transaction
+    :param session: async session
+    :param deltas: changes of the rollup rows
+    """
+    deltas = merge_deltas(deltas)
+    if deltas:
+        await session.execute(get_upsert_statement(session.bind.dialect.name), deltas)
+
+
+async def get_order_deltas(session, *criteria, sign=1):
+    """
+    This function returns the changes of the rollup rows that add or subtract the orders in the current transaction
+    :param session: async session
+    :param criteria: criteria of the orders
+    :param sign: 1 to add the orders to the rollup, -1 to subtract them
+    """
+    return get_deltas((await session.execute(get_orders_select(*criteria))).all(), sign)
+
+
+async def add_orders(session, *criteria, sign=1):
+    """
+    This function adds the orders to the rollup, or subtracts them, in the current transaction
+    :param session: async session
+    :param criteria: criteria of the orders
+    :param sign: 1 to add the orders to the rollup, -1 to subtract them
+    """
+    await change_rollup(session, await get_order_deltas(session, *criteria, sign=sign))
+
+
+async def change_revenue(session, product_prices):
+    """
+    This function recomputes the revenue of the rollup rows of the products in the current transaction
+    :param session: async session
+    :param product_prices: dict of the new prices by product id
+    """
+    if product_prices:
+        await session.execute(get_revenue_statement(), [{'rollup_product_id': product_id, 'price': price}
+                                                        for product_id, price in product_prices.items()])
+
+
+async def remove_orders(session, seller_ids=None, product_ids=None):
+    """
+    This function removes the rollup rows of deleted sellers and products in the current transaction
+    :param session: async session
+    :param seller_ids: ids of the sellers whose orders are deleted
+    :param product_ids: ids of the products whose orders are deleted, or a select of them
+    """
+    await session.execute(get_remove_statement(seller_ids, product_ids))
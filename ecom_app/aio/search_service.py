@@ -0,0 +1,27 @@
+"""
+This module contains async functions to work with the full-text index of products, they mirror the functions of
+ecom_app.service.search_service on an AsyncSession
+"""
+
+from ecom_app.service.search_service import get_index_statements
+
+
+async def index_products(session, product_ids):
+    """
+    This function indexes the current names and descriptions of the products in the current transaction
+    :param session: async session
+    :param product_ids: ids of the products or a select of them
+    """
+    await session.flush()
+    for statement in get_index_statements(session.bind.dialect.name, product_ids):
+        await session.execute(statement)
+
+
+async def unindex_products(session, product_ids):
+    """
+    This function removes the products from the full-text index in the current transaction
+    :param session: async session
+    :param product_ids: ids of the products or a select of them
+    """
+    for statement in get_index_statements(session.bind.dialect.name, product_ids, reindex=False):
+        await session.execute(statement)
@@ -0,0 +1,163 @@
+"""
+This module contains async functions to work with sellers table, they mirror the functions of
+ecom_app.service.seller_service on an AsyncSession
+"""
+
+from sqlalchemy import select, func
+
+from ecom_app.models import Seller, Product, Order, Status
+from ecom_app.principal import get_principal_key
+from ecom_app.aio import order_service, product_service, rollup_service, search_service, version_service
+
+
+async def get_sellers(session, limit=None, after=None):
+    """
+    This function returns all sellers
+    :param session: async session
+    :param limit: maximum number of sellers to return
+    :param after: id of the seller to return sellers after
+    """
+    seller_query = select(Seller)
+
+    if after is not None:
+        seller_query = seller_query.filter(Seller.id > after)
+    if limit is not None or after is not None:
+        seller_query = seller_query.order_by(Seller.id).limit(limit)
+
+    return (await session.execute(seller_query)).scalars().all()
+
+
+async def get_seller_by_id(session, seller_id):
+    """
+    This function returns seller by id
+    :param session: async session
+    :param seller_id: id of the seller
+    """
+    return (await session.execute(select(Seller).filter_by(id=seller_id))).scalars().first()
+
+
+async def get_seller_by_email(session, email):
+    """
+    This function returns seller by email
+    :param session: async session
+    :param email: email of the seller
+    """
+    return (await session.execute(select(Seller).filter_by(email=email))).scalars().first()
+
+
+async def create_seller(session, name, email, phone, password, is_admin):
+    """
+    This function creates new seller
+    :param session: async session
+    :param name: name of the seller
+    :param email: email of the seller
+    :param phone: phone of the seller
+    :param password: password of the seller
+    :param is_admin: is seller admin
+    """
+    seller = Seller(name=name, email=email, phone=phone, password=password, is_admin=is_admin)
+    session.add(seller)
+    await session.commit()
+    return seller
+
+
+async def update_seller(session, seller_id, name=None, email=None, phone=None, password=None, is_admin=None):
+    """
+    This function updates seller
+    :param session: async session
+    :param seller_id: id of the seller
+    :param name: name of the seller
+    :param email: email of the seller
+    :param phone: phone of the seller
+    :param password: password of the seller
+    :param is_admin: is seller admin
+    """
+    seller = await get_seller_by_id(session, seller_id)
+
+    if not seller:
+        return False
+
+    if name:
+        seller.name = name
+    if email:
+        seller.email = email
+    if phone:
+        seller.phone = phone
+    if password:
+        seller.password = password
+    if is_admin:
+        seller.is_admin = is_admin
+
+    await session.commit()
+
+    invalidate_principal(session, seller_id)
+    if password or is_admin:
+        revoke_seller_tokens(session, seller_id)
+    return seller
+
+
+async def delete_seller(session, seller_id):
+    """
+    This function deletes seller
+    :param session: async session
+    :param seller_id: id of the seller
+    """
+    seller = await get_seller_by_id(session, seller_id)
+
+    if not seller:
+        return False
+
+    seller_ordered = (await session.execute(
+        select(Order.product_id, func.sum(Order.quantity)).filter(
+            Order.seller_id == seller_id, Order.status == Status.in_progress
+        ).group_by(Order.product_id)
+    )).all()
+    for product_id, ordered in seller_ordered:
+        await order_service.change_product_ordered(session, product_id, -ordered)
+    # The orders of the seller on the products of other sellers are deleted with it, so their quantities are
+    # returned to the inventory of those products
+    seller_reserved = dict((await session.execute(
+        select(Order.product_id, func.sum(Order.quantity)).join(Order.product).filter(
+            Order.seller_id == seller_id, Product.seller_id != seller_id
+        ).group_by(Order.product_id)
+    )).all())
+    await order_service.release_inventory(session, seller_reserved)
+    changed_product_ids = list({*[product_id for product_id, _ in seller_ordered], *seller_reserved})
+    await version_service.bump_data_versions(session, product_ids=changed_product_ids,
+                                             order_product_ids=select(Product.id).where(Product.seller_id == seller_id))
+    seller_product_ids = (await session.execute(
+        select(Product.id).where(Product.seller_id == seller_id)
+    )).scalars().all()
+    await rollup_service.remove_orders(session, [seller_id], seller_product_ids)
+    await search_service.unindex_products(session, seller_product_ids)
+
+    await session.delete(seller)
+    await session.commit()
+
+    invalidate_principal(session, seller_id)
+    revoke_seller_tokens(session, seller_id)
+    product_service.invalidate_cached_products(session, seller_product_ids, [seller_id])
+    await product_service.invalidate_ordered_products(session, list(seller_reserved))
+    return True
+
+
+def invalidate_principal(session, seller_id):
+    """
+    This function removes the seller from the principal cache, after the write changing it is committed
+    :param session: async session
+    :param seller_id: id of the seller
+    """
+    cache = session.info.get('principal_cache')
+    if cache is not None:
+        cache.delete(get_principal_key(seller_id))
+
+
+def revoke_seller_tokens(session, seller_id):
+    """
+    This function revokes all API tokens of the seller, after the write changing it is committed
+    :param session: async session
+    :param seller_id: id of the seller
+    """
+    revocations = session.info.get('token_revocations')
+    if revocations is not None:
+        revocations.revoke_seller(seller_id)
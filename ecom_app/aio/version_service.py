@@ -0,0 +1,19 @@
+"""
+This module contains async functions to work with the data versions of sellers, they mirror the functions of
+ecom_app.service.version_service on an AsyncSession
+"""
+
+from ecom_app.service.version_service import get_bump_statement
+
+
+async def bump_data_versions(session, seller_ids=None, product_ids=None, order_product_ids=None):
+    """
+    This function changes the data versions of the sellers in the current transaction
+    :param session: async session
+    :param seller_ids: ids of the sellers or a select of them
+    :param product_ids: ids of the products whose sellers see a change
+    :param order_product_ids: ids of the products whose orders are seen by their sellers with a change
+    """
+    statement = get_bump_statement(seller_ids, product_ids, order_product_ids)
+    if statement is not None:
+        await session.execute(statement)
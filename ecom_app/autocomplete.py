@@ -0,0 +1,234 @@
+"""
+This module contains the prefix index of product names used to autocomplete them. Each worker keeps sorted arrays
+of the names of the products of each seller it served, built from the products table on first use and updated
+by the product writes of the worker after they are committed. The arrays are rebuilt after a TTL, so that
+the writes of the other workers are seen
+"""
+
+import bisect
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+from ecom_app.database import db
+from ecom_app.models import Product
+
+
+# These are the default autocomplete settings, each can be overridden by the config key of the same name
+AUTOCOMPLETE_DEFAULTS = {
+    'AUTOCOMPLETE_TTL': 300,
+    'AUTOCOMPLETE_LIMIT': 10,
+}
+
+
+class PrefixIndex:
+    """
+    This class is a sorted array of the case folded names of products with their ids and names
+    """
+    def __init__(self, products=()):
+        self.names = dict(products)
+        self.entries = sorted((name.casefold(), product_id, name) for product_id, name in self.names.items())
+
+    def add(self, product_id, name):
+        """
+        This method adds a product to the index, replacing its previous name
+        :param product_id: id of the product
+        :param name: name of the product
+        """
+        self.remove(product_id)
+        self.names[product_id] = name
+        bisect.insort(self.entries, (name.casefold(), product_id, name))
+
+    def remove(self, product_id):
+        """
+        This method removes a product from the index if it is there
+        :param product_id: id of the product
+        """
+        name = self.names.pop(product_id, None)
+        if name is not None:
+            entry = (name.casefold(), product_id, name)
+            del self.entries[bisect.bisect_left(self.entries, entry)]
+
+    def complete(self, prefix, limit):
+        """
+        This method returns the ids and names of the products whose names start with the prefix, ignoring case,
+        in the order of their names
+        :param prefix: prefix of the names
+        :param limit: maximum number of products to return
+        """
+        prefix = prefix.casefold()
+        products = []
+        position = bisect.bisect_left(self.entries, (prefix,))
+        while len(products) < limit and position < len(self.entries) and self.entries[position][0].startswith(prefix):
+            _, product_id, name = self.entries[position]
+            products.append((product_id, name))
+            position += 1
+        return products
+
+
+class AutocompleteIndex:
+    """
+    This class holds the prefix indexes of a worker by seller id, None for the index of the products of all sellers
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.indexes = {}
+        self.writes = 0
+
+    def get(self, seller_id, load):
+        """
+        This method returns the prefix index of the seller, built from the products returned by load
+        if it is missing or expired
+        :param seller_id: id of the seller, None for all sellers
+        :param load: function returning the ids and names of the products of the seller
+        """
+        with self._lock:
+            built_at, index = self.indexes.get(seller_id, (None, None))
+            if index is not None and (self.ttl <= 0 or time.monotonic() - built_at < self.ttl):
+                return index
+            writes = self.writes
+
+        index = PrefixIndex(load())
+        with self._lock:
+            # An index loaded while a write was applied to the other indexes might miss it, so it is not kept
+            if writes == self.writes:
+                self.indexes[seller_id] = (time.monotonic(), index)
+        return index
+
+    def complete(self, seller_id, load, prefix, limit):
+        """
+        This method returns the ids and names of the products of the seller whose names start with the prefix,
+        ignoring case, in the order of their names
+        :param seller_id: id of the seller, None for all sellers
+        :param load: function returning the ids and names of the products of the seller
+        :param prefix: prefix of the names
+        :param limit: maximum number of products to return
+        """
+        index = self.get(seller_id, load)
+        with self._lock:
+            return index.complete(prefix, limit)
+
+    def add_product(self, product_id, name, seller_id):
+        """
+        This method adds a product to the built indexes of its seller and of all sellers, removing it from the others
+        :param product_id: id of the product
+        :param name: name of the product
+        :param seller_id: id of the seller of the product
+        """
+        with self._lock:
+            self.writes += 1
+            for index_seller_id, (_, index) in self.indexes.items():
+                if index_seller_id in (seller_id, None):
+                    index.add(product_id, name)
+                else:
+                    index.remove(product_id)
+
+    def remove_products(self, product_ids):
+        """
+        This method removes products from the built indexes
+        :param product_ids: ids of the products
+        """
+        with self._lock:
+            self.writes += 1
+            for _, index in self.indexes.values():
+                for product_id in product_ids:
+                    index.remove(product_id)
+
+    def reset(self, seller_ids):
+        """
+        This method drops the built indexes of the sellers and of all sellers, so that they are built again
+        :param seller_ids: ids of the sellers
+        """
+        with self._lock:
+            self.writes += 1
+            for seller_id in [*seller_ids, None]:
+                self.indexes.pop(seller_id, None)
+
+
+def get_autocomplete_settings(config):
+    """
+    This function returns the autocomplete settings of the config with the defaults of the missing ones
+    :param config: config of the application
+    """
+    return {key: config.get(key) if config.get(key) is not None else default
+            for key, default in AUTOCOMPLETE_DEFAULTS.items()}
+
+
+def create_autocomplete_index(config):
+    """
+    This function returns the prefix indexes of the worker configured by the config
+    :param config: config of the application
+    """
+    return AutocompleteIndex(float(get_autocomplete_settings(config)['AUTOCOMPLETE_TTL']))
+
+
+def get_autocomplete_index():
+    """
+    This function returns the prefix indexes of the application, None if the application has none
+    """
+    return current_app.extensions.get('autocomplete_index')
+
+
+def load_product_names(seller_id=None):
+    """
+    This function returns the ids and names of the products of the seller
+    :param seller_id: id of the seller, None for all sellers
+    """
+    names_query = select(Product.id, Product.name)
+    if seller_id is not None:
+        names_query = names_query.where(Product.seller_id == seller_id)
+    return db.session.execute(names_query).all()
+
+
+def complete_product_names(prefix, seller_id=None, limit=None):
+    """
+    This function returns the ids and names of the products of the seller whose names start with the prefix,
+    ignoring case, in the order of their names
+    :param prefix: prefix of the names
+    :param seller_id: id of the seller, None for all sellers
+    :param limit: maximum number of products to return, the AUTOCOMPLETE_LIMIT setting by default
+    """
+    if limit is None:
+        limit = int(get_autocomplete_settings(current_app.config)['AUTOCOMPLETE_LIMIT'])
+
+    autocomplete_index = get_autocomplete_index()
+    if autocomplete_index is None:
+        return PrefixIndex(load_product_names(seller_id)).complete(prefix, limit)
+
+    return autocomplete_index.complete(seller_id, lambda: load_product_names(seller_id), prefix, limit)
+
+
+def index_product(product_id, name, seller_id):
+    """
+    This function adds a product to the prefix indexes of the worker, after the write changing it is committed
+    :param product_id: id of the product
+    :param name: name of the product
+    :param seller_id: id of the seller of the product
+    """
+    autocomplete_index = get_autocomplete_index()
+    if autocomplete_index is not None:
+        autocomplete_index.add_product(product_id, name, seller_id)
+
+
+def unindex_products(product_ids):
+    """
+    This function removes products from the prefix indexes of the worker, after the write deleting them is committed
+    :param product_ids: ids of the products
+    """
+    autocomplete_index = get_autocomplete_index()
+    if autocomplete_index is not None:
+        autocomplete_index.remove_products(product_ids)
+
+
+def reset_product_names(seller_ids):
+    """
+    This function drops the prefix indexes of the sellers from the worker, after a write changing many of their
+    products is committed
+    :param seller_ids: ids of the sellers
+    """
+    autocomplete_index = get_autocomplete_index()
+    if autocomplete_index is not None:
+        autocomplete_index.reset(seller_ids)
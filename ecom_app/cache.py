@@ -0,0 +1,283 @@
+"""
+This module contains the cache backends of the application and the statistics of their use. The in-process LRU
+backend is private to a worker, so the writes handled by the other workers are only seen once the entries expire
+after the TTL. The shared backend keeps its entries in an SQLite file of the instance folder so that all workers
+of a server see the same entries and invalidations, it should be used when a server runs several workers
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+# These are the default cache settings, each can be overridden by the config key of the same name. The TTL of the
+# product cache bounds how long a worker using the lru backend can return products changed by the other workers
+CACHE_DEFAULTS = {
+    'PRODUCT_CACHE_BACKEND': 'lru',
+    'PRODUCT_CACHE_TTL': 60,
+    'PRODUCT_CACHE_SIZE': 10000,
+    'PRODUCT_CACHE_PATH': None,
+    'PRINCIPAL_CACHE_TTL': 30,
+    'PRINCIPAL_CACHE_SIZE': 10000,
+}
+
+# This is the number of writes of the shared backend between the removals of its expired entries
+SHARED_CACHE_PRUNE_INTERVAL = 1000
+
+
+class Cache(ABC):
+    """
+    This class is the base of the cache backends, it counts their hits, misses, writes and invalidations.
+    Values have to be JSON serializable
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def count(self, name, value=1):
+        """
+        This method adds to a counter of the statistics of the cache
+        :param name: name of the counter
+        :param value: value to add
+        """
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def get(self, key):
+        """
+        This method returns the value of the key, None if it is missing or expired
+        :param key: key of the entry
+        """
+        value = self.load(key)
+        self.count('misses' if value is None else 'hits')
+        return value
+
+    def set(self, key, value):
+        """
+        This method stores the value of the key for the TTL of the cache
+        :param key: key of the entry
+        :param value: value of the entry
+        """
+        self.store(key, value)
+        self.count('sets')
+
+    def delete(self, *keys):
+        """
+        This method removes the entries of the keys
+        :param keys: keys of the entries
+        """
+        if keys:
+            self.remove(keys)
+            self.count('invalidations', len(keys))
+
+    def get_generation(self, name):
+        """
+        This method returns the current generation token of a group of entries. The keys of the entries include
+        the token, so deleting it invalidates them all, including the ones stored by reads that raced the deletion
+        :param name: name of the group of entries
+        """
+        token = self.load(name)
+        if token is None:
+            token = uuid.uuid4().hex[:12]
+            self.store(name, token)
+        return token
+
+    @abstractmethod
+    def load(self, key):
+        """
+        This method returns the stored value of the key without counting it, None if it is missing or expired
+        :param key: key of the entry
+        """
+
+    @abstractmethod
+    def store(self, key, value):
+        """
+        This method stores the value of the key without counting it
+        :param key: key of the entry
+        :param value: value of the entry
+        """
+
+    @abstractmethod
+    def remove(self, keys):
+        """
+        This method removes the entries of the keys without counting them
+        :param keys: keys of the entries
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        This method removes all entries
+        """
+
+    @abstractmethod
+    def size(self):
+        """
+        This method returns the number of stored entries
+        """
+
+    def snapshot(self):
+        """
+        This method returns the statistics of the cache as a dict
+        """
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self).__name__,
+                'ttl': self.ttl,
+                'size': self.size(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'sets': self.sets,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
+
+
+class LRUCache(Cache):
+    """
+    This class is an in-process cache that evicts the least recently used entries beyond its maximum size
+    """
+    def __init__(self, ttl, max_size):
+        super().__init__(ttl)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def store(self, key, value):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+
+        if evicted:
+            self.count('evictions', evicted)
+
+    def remove(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class SharedCache(Cache):
+    """
+    This class is a cache shared by the processes of a server through an SQLite file
+    """
+    def __init__(self, ttl, path):
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self.connection().execute('CREATE TABLE IF NOT EXISTS cache '
+                                  '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def connection(self):
+        """
+        This method returns the connection of the current thread to the cache file
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def load(self, key):
+        row = self.connection().execute('SELECT value FROM cache WHERE key = ? AND expires_at > ?',
+                                        (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, key, value):
+        connection = self.connection()
+        connection.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                           (key, json.dumps(value), time.time() + self.ttl))
+
+        self._writes += 1
+        if self._writes % SHARED_CACHE_PRUNE_INTERVAL == 0:
+            evicted = connection.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),)).rowcount
+            self.count('evictions', evicted)
+
+    def remove(self, keys):
+        self.connection().executemany('DELETE FROM cache WHERE key = ?', [(key,) for key in keys])
+
+    def clear(self):
+        self.connection().execute('DELETE FROM cache')
+
+    def size(self):
+        return self.connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+def get_cache_settings(config):
+    """
+    This function returns the cache settings of the config with the defaults of the missing ones
+    :param config: config of the application
+    """
+    return {key: config.get(key) if config.get(key) is not None else default for key, default in CACHE_DEFAULTS.items()}
+
+
+def create_cache(config, instance_path):
+    """
+    This function returns the product cache configured by the config, None if it is disabled
+    :param config: config of the application
+    :param instance_path: instance folder of the application, where the shared cache file is kept by default
+    """
+    settings = get_cache_settings(config)
+    backend = str(settings['PRODUCT_CACHE_BACKEND']).lower()
+    ttl = float(settings['PRODUCT_CACHE_TTL'])
+
+    if backend == 'none':
+        return None
+    if backend == 'lru':
+        return LRUCache(ttl, int(settings['PRODUCT_CACHE_SIZE']))
+    if backend == 'shared':
+        return SharedCache(ttl, settings['PRODUCT_CACHE_PATH'] or os.path.join(instance_path, 'product_cache.db'))
+
+    raise ValueError(f'Unknown product cache backend {backend}')
+
+
+def create_principal_cache(config):
+    """
+    This function returns the in-process cache of the logged in sellers configured by the config,
+    None if its TTL is 0
+    :param config: config of the application
+    """
+    settings = get_cache_settings(config)
+    ttl = float(settings['PRINCIPAL_CACHE_TTL'])
+
+    if ttl <= 0:
+        return None
+    return LRUCache(ttl, int(settings['PRINCIPAL_CACHE_SIZE']))
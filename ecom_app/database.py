@@ -2,8 +2,75 @@
 This file is used to create the database object and migrate object
 """
 
+import random
+
+import sqlalchemy as sa
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
 
-db = SQLAlchemy()
+from ecom_app.pool import get_engine_options
+
+
+class RoutingSession(Session):
+    """
+    This class is the session of the database object which sends the queries marked with use_replica to a replica
+    engine. Flushes and other writes go to the primary engine, and a session that has written keeps reading from the
+    primary engine so it sees its own changes
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """
+        This method returns the engine for the query
+        """
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['has_written'] = True
+        elif bind is None and not self.info.get('has_written') and clause is not None \
+                and clause.get_execution_options().get('replica'):
+            replica = self.get_replica()
+            if replica is not None:
+                return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def get_replica(self):
+        """
+        This method returns the replica engine of the session, chosen once per session, or None without replicas
+        """
+        if 'replica' not in self.info:
+            replicas = current_app.extensions.get('replicas')
+            self.info['replica'] = random.choice(replicas) if replicas else None
+
+        return self.info['replica']
+
+
+def get_replica_uris(replica_uris):
+    """
+    This function returns the list of replica database URIs
+    :param replica_uris: list or comma separated string of replica database URIs
+    """
+    if isinstance(replica_uris, str):
+        return [uri.strip() for uri in replica_uris.split(',') if uri.strip()]
+
+    return list(replica_uris or [])
+
+
+def init_replicas(app):
+    """
+    This function creates the replica engines of the application from the SQLALCHEMY_REPLICA_URIS config
+    :param app: flask application
+    """
+    app.extensions['replicas'] = [sa.create_engine(uri, **get_engine_options(app.config, uri))
+                                  for uri in get_replica_uris(app.config.get('SQLALCHEMY_REPLICA_URIS'))]
+
+
+def use_replica(query):
+    """
+    This function marks the query to be executed on a replica engine if the application has any
+    :param query: query to mark
+    """
+    return query.execution_options(replica=True)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
@@ -0,0 +1,37 @@
+"""add products full text index
+
+Revision ID: 5e0c7b3f2d81
+Revises: 3b8d1f6a9c27
+Create Date: 2026-10-18 23:47:12.804331
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0c7b3f2d81'
+down_revision = '3b8d1f6a9c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == 'sqlite':
+        op.execute('CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(name, description, '
+                   'tokenize="unicode61 remove_diacritics 2")')
+        op.execute('INSERT INTO products_fts (rowid, name, description) SELECT id, name, description FROM products')
+    elif dialect_name in ('mysql', 'mariadb'):
+        op.execute('ALTER TABLE products ADD FULLTEXT INDEX ix_products_name_description_fulltext (name, description)')
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS products_fts')
+    elif dialect_name in ('mysql', 'mariadb'):
+        with op.batch_alter_table('products', schema=None) as batch_op:
+            batch_op.drop_index('ix_products_name_description_fulltext')
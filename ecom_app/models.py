@@ -5,7 +5,7 @@ This file contains the models for the database.
 import enum
 
 from sqlalchemy.sql import func as sql_func
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Integer, Boolean, Enum, select, func
+from sqlalchemy import Column, String, Float, Date, DateTime, ForeignKey, Integer, Boolean, Enum, Index, event, DDL
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy_utils import force_auto_coercion
@@ -34,6 +34,11 @@ class Order(db.Model):
     This class represents the orders table
     """
     __tablename__ = 'orders'
+    __table_args__ = (
+        Index('ix_orders_seller_id_status_date', 'seller_id', 'status', 'date'),
+        Index('ix_orders_product_id_status_quantity', 'product_id', 'status', 'quantity'),
+        Index('ix_orders_status', 'status'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(DateTime, nullable=False, server_default=sql_func.now())
@@ -88,6 +93,10 @@ class Product(db.Model):
     This class represents the products table
     """
     __tablename__ = 'products'
+    __table_args__ = (
+        Index('ix_products_seller_id_inventory', 'seller_id', 'inventory'),
+        Index('ix_products_inventory', 'inventory'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(50), nullable=False, unique=True)
@@ -95,6 +104,8 @@ class Product(db.Model):
     price = Column(Float, nullable=False)
     inventory = Column(Integer, nullable=False)
     seller_id = Column(Integer, ForeignKey('sellers.id'), nullable=False)
+    # Quantity in in-progress orders, kept up to date by order_service writes
+    ordered_quantity = Column(Integer, nullable=False, default=0, server_default='0', index=True)
 
     orders = relationship('Order', backref='product', cascade="all,delete")
 
@@ -109,14 +120,66 @@ class Product(db.Model):
         """
         This function returns the total quantity of the product that has been ordered
         """
-        return sum([order.quantity for order in self.orders if order.status == Status.in_progress])
+        return self.ordered_quantity
 
-    @ordered.expression
-    def ordered(cls):
+
+# The names and descriptions of products are indexed for full-text search by an FTS5 table kept in sync by
+# search_service on SQLite, and by a FULLTEXT index kept in sync by the database on MySQL
+event.listen(Product.__table__, 'after_create', DDL(
+    'CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(name, description, '
+    'tokenize="unicode61 remove_diacritics 2")'
+).execute_if(dialect='sqlite'))
+event.listen(Product.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS products_fts').execute_if(dialect='sqlite'))
+event.listen(Product.__table__, 'after_create', DDL(
+    'ALTER TABLE products ADD FULLTEXT INDEX ix_products_name_description_fulltext (name, description)'
+).execute_if(dialect=('mysql', 'mariadb')))
+
+
+class OrderDailyRollup(db.Model):
+    """
+    This class represents the order_daily_rollup table, the quantity and revenue of the orders of a seller
+    for a product per day and status. It is kept up to date by the order_service writes
+    """
+    __tablename__ = 'order_daily_rollup'
+    __table_args__ = (
+        Index('ix_order_daily_rollup_seller_id_day', 'seller_id', 'day'),
+        Index('ix_order_daily_rollup_product_id', 'product_id'),
+        Index('ix_order_daily_rollup_day', 'day'),
+    )
+
+    seller_id = Column(Integer, ForeignKey('sellers.id'), primary_key=True)
+    product_id = Column(Integer, ForeignKey('products.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(Status), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+    def __repr__(self):
         """
-        This function returns the total quantity of the product that has been ordered
+        This function returns the string representation of the rollup row
         """
+        return f'{self.seller_id} - {self.product_id} - {self.day} - {self.status}'
+
 
-        return select(func.sum(Order.quantity)).where(
-            and_(Order.product_id == cls.id, Order.status == Status.in_progress)
-        ).label('ordered')
\ No newline at end of file
+class DataVersion(db.Model):
+    """
+    This class represents the data_versions table, a row is added by version_service for each seller in every write
+    that changes the products or orders the seller sees. The data version of a seller is the id of its latest row,
+    the writes add rows instead of increasing a counter of the seller so that concurrent writes don't wait for
+    the lock of the same row
+    """
+    __tablename__ = 'data_versions'
+    __table_args__ = (
+        Index('ix_data_versions_seller_id_id', 'seller_id', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # There is no foreign key, so that the inserts don't check the rows of the sellers
+    seller_id = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        """
+        This function returns the string representation of the data version
+        """
+        return f'{self.seller_id} - {self.id}'
@@ -0,0 +1,195 @@
+"""
+This module contains the connection pool settings of the database engines and the statistics of their pools
+"""
+
+import threading
+import time
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+
+# These are the default pool settings, each can be overridden by the config key of the same name
+POOL_DEFAULTS = {
+    'SQLALCHEMY_POOL_SIZE': 5,
+    'SQLALCHEMY_MAX_OVERFLOW': 10,
+    'SQLALCHEMY_POOL_TIMEOUT': 30,
+    'SQLALCHEMY_POOL_RECYCLE': 3600,
+    'SQLALCHEMY_POOL_PRE_PING': True,
+}
+
+
+class PoolStats:
+    """
+    This class collects the statistics of the connection pool of an engine from the pool events
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def on_connect(self, dbapi_connection, connection_record):
+        """
+        This method counts the new connections of the pool
+        """
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        """
+        This method counts the connections checked out from the pool
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        """
+        This method counts the connections returned to the pool
+        """
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        """
+        This method counts the connections invalidated by the pool, e.g. after a failed pre-ping
+        """
+        with self._lock:
+            self.invalidations += 1
+
+    def record_checkout_time(self, elapsed, waited):
+        """
+        This method records how long a checkout took
+        :param elapsed: seconds the checkout took
+        :param waited: whether the checkout had to wait for a connection to be returned to the exhausted pool
+        """
+        with self._lock:
+            self.checkout_time += elapsed
+            self.max_checkout_time = max(self.max_checkout_time, elapsed)
+            if waited:
+                self.waits += 1
+                self.wait_time += elapsed
+                self.max_wait_time = max(self.max_wait_time, elapsed)
+
+    def snapshot(self):
+        """
+        This method returns the statistics of the pool as a dict
+        """
+        pool = self.engine.pool
+        with self._lock:
+            timed = isinstance(pool, InstrumentedQueuePool)
+            return {
+                'pool': type(pool).__name__,
+                'size': pool.size() if timed else None,
+                'checked_in': pool.checkedin() if timed else None,
+                'checked_out': self.checked_out,
+                'max_checked_out': self.max_checked_out,
+                'overflow': pool.overflow() if timed else None,
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'checkout_latency_ms': {
+                    'mean': round(self.checkout_time / self.checkouts * 1000, 3) if timed and self.checkouts else None,
+                    'max': round(self.max_checkout_time * 1000, 3) if timed else None,
+                },
+                'wait_time_ms': {
+                    'count': self.waits,
+                    'total': round(self.wait_time * 1000, 3),
+                    'max': round(self.max_wait_time * 1000, 3),
+                },
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    This class is the queue pool of the database engines which times its checkouts for the pool statistics
+    """
+    stats = None
+
+    def connect(self):
+        """
+        This method checks out a connection and records how long it took
+        """
+        if self.stats is None:
+            return super().connect()
+
+        waited = self._max_overflow > -1 and self.checkedin() == 0 and self.overflow() >= self._max_overflow
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.stats.record_checkout_time(time.perf_counter() - start, waited)
+
+    def recreate(self):
+        """
+        This method creates a new pool with the same settings and statistics, it is used when the engine is disposed
+        """
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def is_memory_database(uri):
+    """
+    This function returns whether the database URI is an in-memory SQLite database which can't use a queue pool
+    :param uri: database URI
+    """
+    if not uri:
+        return False
+
+    url = sa.engine.make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def get_engine_options(config, uri):
+    """
+    This function returns the options of an engine from the pool settings and the SQLALCHEMY_ENGINE_OPTIONS config,
+    which take precedence
+    :param config: config of the application
+    :param uri: database URI of the engine
+    """
+    settings = {key: config.get(key) if config.get(key) is not None else default
+                for key, default in POOL_DEFAULTS.items()}
+
+    options = {
+        'pool_recycle': int(settings['SQLALCHEMY_POOL_RECYCLE']),
+        'pool_pre_ping': str(settings['SQLALCHEMY_POOL_PRE_PING']).lower() in ('1', 'true'),
+    }
+    if not is_memory_database(uri):
+        options.update({
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': int(settings['SQLALCHEMY_POOL_SIZE']),
+            'max_overflow': int(settings['SQLALCHEMY_MAX_OVERFLOW']),
+            'pool_timeout': float(settings['SQLALCHEMY_POOL_TIMEOUT']),
+        })
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def init_pool_stats(engine):
+    """
+    This function starts collecting the statistics of the pool of the engine and returns them
+    :param engine: engine to collect the statistics of
+    """
+    stats = PoolStats(engine)
+    event.listen(engine, 'connect', stats.on_connect)
+    event.listen(engine, 'checkout', stats.on_checkout)
+    event.listen(engine, 'checkin', stats.on_checkin)
+    event.listen(engine, 'invalidate', stats.on_invalidate)
+
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.stats = stats
+
+    return stats
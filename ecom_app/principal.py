@@ -0,0 +1,92 @@
+"""
+This module contains the cached principal of the logged in seller. The id, admin flag and name of a seller are kept
+in a short-TTL cache of the worker, so that authenticated requests don't query the sellers table to load the user
+"""
+
+import functools
+
+from flask import current_app
+from flask_login import UserMixin
+
+from ecom_app.database import db
+from ecom_app.models import Seller
+
+
+class Principal(UserMixin):
+    """
+    This class represents the logged in seller loaded from the principal cache. The other attributes of the seller
+    are loaded from the database the first time they are used
+    """
+    def __init__(self, id, is_admin, name):
+        self.id = id
+        self.is_admin = is_admin
+        self.name = name
+
+    @functools.cached_property
+    def seller(self):
+        """
+        This method returns the seller of the principal
+        """
+        return db.session.get(Seller, self.id)
+
+    def __getattr__(self, name):
+        """
+        This method returns the attributes of the seller that the principal doesn't keep
+        :param name: name of the attribute
+        """
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.seller, name)
+
+
+def get_principal_cache():
+    """
+    This function returns the principal cache of the application, None if it is disabled
+    """
+    return current_app.extensions.get('principal_cache')
+
+
+def get_principal_key(seller_id):
+    """
+    This function returns the key of the seller in the principal cache
+    :param seller_id: id of the seller
+    """
+    return f'principal:{seller_id}'
+
+
+def dump_principal(seller):
+    """
+    This function returns the values of the seller stored in the principal cache
+    :param seller: seller to store
+    """
+    return {'id': seller.id, 'is_admin': seller.is_admin, 'name': seller.name}
+
+
+def load_principal(seller_id):
+    """
+    This function returns the logged in seller, from the principal cache if it is there. None if there is no seller
+    :param seller_id: id of the seller
+    """
+    cache = get_principal_cache()
+    if cache is None:
+        return db.session.get(Seller, seller_id)
+
+    key = get_principal_key(seller_id)
+    values = cache.get(key)
+    if values is not None:
+        return Principal(**values)
+
+    seller = db.session.get(Seller, seller_id)
+    if seller is not None:
+        cache.set(key, dump_principal(seller))
+    return seller
+
+
+def invalidate_principal(seller_id):
+    """
+    This function removes the seller from the principal cache, after the write changing it is committed
+    :param seller_id: id of the seller
+    """
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.delete(get_principal_key(seller_id))
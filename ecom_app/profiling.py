@@ -0,0 +1,147 @@
+"""
+This module runs chosen requests under cProfile and stores their profiles in the instance folder of the application.
+A request is profiled when an administrator sends the X-Profile header or when its endpoint is in the PROFILE_ENDPOINTS
+config
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime
+
+from flask import g, request, current_app
+from flask_login import current_user
+
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+MAX_STORED_PROFILES = 100
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{20}-[0-9a-f]{8}$')
+
+
+def get_profiles_dir():
+    """
+    This function returns the directory of the stored profiles
+    """
+    return os.path.join(current_app.instance_path, 'profiles')
+
+
+def get_profile_path(profile_id, extension='prof'):
+    """
+    This function returns the path of a stored profile file, None if the profile id is not valid
+    :param profile_id: id of the profile
+    :param extension: prof for the cProfile data, json for the request details
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+
+    return os.path.join(get_profiles_dir(), f'{profile_id}.{extension}')
+
+
+def should_profile():
+    """
+    This function returns whether the current request has to be profiled
+    """
+    if request.endpoint in current_app.config.get('PROFILE_ENDPOINTS', ()):
+        return True
+
+    return request.headers.get(PROFILE_HEADER) in ('1', 'true') and current_user.is_authenticated \
+        and current_user.is_admin
+
+
+def start_profile():
+    """
+    This function starts profiling the request if it has to be profiled
+    """
+    if should_profile():
+        g.profile = cProfile.Profile()
+        g.profile_start = time.perf_counter()
+        g.profile.enable()
+
+
+def finish_profile(response):
+    """
+    This function stops profiling the request, stores its profile and returns its id in a header
+    :param response: response of the request
+    """
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+
+    profile.disable()
+    duration = time.perf_counter() - g.pop('profile_start')
+
+    profile_id = f'{datetime.utcnow():%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}'
+    os.makedirs(get_profiles_dir(), exist_ok=True)
+
+    profile.dump_stats(get_profile_path(profile_id))
+    with open(get_profile_path(profile_id, 'json'), 'w', encoding='utf-8') as details_file:
+        json.dump({
+            'id': profile_id,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+        }, details_file)
+
+    remove_old_profiles()
+
+    response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
+
+
+def list_profiles():
+    """
+    This function returns the details of the stored profiles, newest first
+    """
+    profiles_dir = get_profiles_dir()
+    if not os.path.isdir(profiles_dir):
+        return []
+
+    profiles = []
+    for file_name in sorted(os.listdir(profiles_dir), reverse=True):
+        if file_name.endswith('.json'):
+            with open(os.path.join(profiles_dir, file_name), encoding='utf-8') as details_file:
+                profiles.append(json.load(details_file))
+
+    return profiles
+
+
+def format_profile(profile_id, limit=50):
+    """
+    This function returns the text report of a stored profile sorted by cumulative time
+    :param profile_id: id of the profile
+    :param limit: maximum number of functions in the report
+    """
+    report = io.StringIO()
+    pstats.Stats(get_profile_path(profile_id), stream=report).sort_stats('cumulative').print_stats(limit)
+    return report.getvalue()
+
+
+def remove_old_profiles():
+    """
+    This function removes the oldest profiles beyond the MAX_STORED_PROFILES config
+    """
+    max_profiles = current_app.config.get('MAX_STORED_PROFILES', MAX_STORED_PROFILES)
+
+    for profile in list_profiles()[max_profiles:]:
+        for extension in ('prof', 'json'):
+            path = get_profile_path(profile['id'], extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def init_profiling(app):
+    """
+    This function starts profiling the chosen requests of the application
+    :param app: flask application
+    """
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
@@ -0,0 +1,125 @@
+"""
+This module counts the SQL statements and the database time of every request from the engine events,
+reports them in the response headers and a log line and checks them against the query budgets of the endpoints
+"""
+
+import json
+import logging
+import time
+
+from flask import g, request, current_app, has_request_context
+from sqlalchemy import event
+
+
+QUERY_COUNT_HEADER = 'X-DB-Queries'
+QUERY_TIME_HEADER = 'X-DB-Time'
+
+# These are the maximum numbers of SQL statements of the endpoints by method, the login lookup and the data version
+# lookup of the ETags included. They are used when the DB_QUERY_BUDGETS config is not set. Seller deletes, product
+# imports and bulk orders are not budgeted because their statements grow with the deleted products, the imported
+# batches and the products out of stock
+DEFAULT_QUERY_BUDGETS = {
+    'GET rest_api.sellersapi': 2,
+    'POST rest_api.sellersapi': 2,
+    'GET rest_api.sellerapi': 2,
+    'PUT rest_api.sellerapi': 4,
+    'GET rest_api.productsapi': 3,
+    'POST rest_api.productsapi': 5,
+    'GET rest_api.productapi': 3,
+    'PUT rest_api.productapi': 7,
+    'DELETE rest_api.productapi': 9,
+    'GET rest_api.ordersapi': 3,
+    'POST rest_api.ordersapi': 10,
+    'PUT rest_api.ordersstatusapi': 9,
+    'GET rest_api.orderapi': 3,
+    'PUT rest_api.orderapi': 14,
+    'DELETE rest_api.orderapi': 10,
+    'GET rest_api.poolstatsapi': 1,
+    'GET rest_api.cachestatsapi': 1,
+    'POST rest_api.tokensapi': 1,
+    'DELETE rest_api.tokensapi': 0,
+    'GET rest_api.salesreportapi': 3,
+    'GET rest_api.productssearchapi': 3,
+    'GET rest_api.productsautocompleteapi': 2,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    This class is the error raised when a request runs more SQL statements than the budget of its endpoint
+    """
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    This function counts a statement of the current request and remembers when it started
+    """
+    if has_request_context() and 'db_queries' in g:
+        g.db_queries += 1
+        context.db_stats_start = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    This function adds the duration of a statement to the database time of the current request
+    """
+    start = getattr(context, 'db_stats_start', None)
+    if start is not None and has_request_context() and 'db_time' in g:
+        g.db_time += time.perf_counter() - start
+
+
+def start_request_stats():
+    """
+    This function resets the statistics of the request
+    """
+    g.db_queries = 0
+    g.db_time = 0.0
+
+
+def finish_request_stats(response):
+    """
+    This function reports the statistics of the request and checks them against the budget of its endpoint
+    :param response: response of the request
+    """
+    queries, db_time = g.get('db_queries', 0), g.get('db_time', 0.0)
+
+    response.headers[QUERY_COUNT_HEADER] = str(queries)
+    response.headers[QUERY_TIME_HEADER] = f'{db_time * 1000:.3f}'
+
+    logger.info(json.dumps({
+        'event': 'request_db_stats',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'db_queries': queries,
+        'db_time_ms': round(db_time * 1000, 3),
+    }))
+
+    budgets = current_app.config.get('DB_QUERY_BUDGETS')
+    budget_key = f'{request.method} {request.endpoint}'
+    budget = (DEFAULT_QUERY_BUDGETS if budgets is None else budgets).get(budget_key)
+
+    if budget is not None and queries > budget:
+        message = f'{request.path} ran {queries} SQL statements, the budget of {budget_key} is {budget}'
+        if current_app.config.get('DB_QUERY_BUDGETS_RAISE', current_app.testing):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    return response
+
+
+def init_query_stats(app, engines):
+    """
+    This function starts collecting the statistics of the requests of the application
+    :param app: flask application
+    :param engines: engines to count the statements of
+    """
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    app.before_request(start_request_stats)
+    app.after_request(finish_request_stats)
@@ -9,8 +9,18 @@ from .sellers_api import SellersAPI
 from .seller_api import SellerAPI
 from .products_api import ProductsAPI
 from .product_api import ProductAPI
+from .products_import_api import ProductsImportAPI
+from .products_search_api import ProductsSearchAPI
+from .products_autocomplete_api import ProductsAutocompleteAPI
 from .orders_api import OrdersAPI
 from .order_api import OrderAPI
+from .orders_bulk_api import OrdersBulkAPI
+from .orders_status_api import OrdersStatusAPI
+from .pool_stats_api import PoolStatsAPI
+from .cache_stats_api import CacheStatsAPI
+from .profiles_api import ProfilesAPI, ProfileAPI
+from .tokens_api import TokensAPI
+from .sales_report_api import SalesReportAPI
 
 
 rest_api = Blueprint('rest_api', __name__)
@@ -20,5 +30,16 @@ api.add_resource(SellerAPI, '/seller/<int:seller_id>', '/seller')
 api.add_resource(SellersAPI, '/sellers')
 api.add_resource(ProductAPI, '/product/<int:product_id>', '/product')
 api.add_resource(ProductsAPI, '/products')
+api.add_resource(ProductsImportAPI, '/products/import')
+api.add_resource(ProductsSearchAPI, '/products/search')
+api.add_resource(ProductsAutocompleteAPI, '/products/autocomplete')
 api.add_resource(OrderAPI, '/order/<int:order_id>', '/order')
 api.add_resource(OrdersAPI, '/orders')
+api.add_resource(OrdersBulkAPI, '/orders/bulk')
+api.add_resource(OrdersStatusAPI, '/orders/status')
+api.add_resource(PoolStatsAPI, '/stats/pool')
+api.add_resource(CacheStatsAPI, '/stats/cache')
+api.add_resource(ProfilesAPI, '/profiles')
+api.add_resource(ProfileAPI, '/profile/<string:profile_id>')
+api.add_resource(TokensAPI, '/tokens')
+api.add_resource(SalesReportAPI, '/reports/sales')
@@ -0,0 +1,25 @@
+"""
+This module contains the CacheStatsAPI class which is used to handle the REST API requests for cache statistics
+"""
+
+from flask import abort, current_app
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+
+class CacheStatsAPI(Resource):
+    """
+    This class is used to handle the REST API requests for the statistics of the product and principal caches
+    of this worker
+    """
+    @login_required
+    def get(self):
+        """
+        This method is used to handle the GET request for cache statistics
+        """
+        if not current_user.is_admin:
+            abort(403, 'You are not authorized')
+
+        caches = {'product': current_app.extensions['product_cache'],
+                  'principal': current_app.extensions['principal_cache']}
+        return {name: cache.snapshot() if cache is not None else None for name, cache in caches.items()}, 200
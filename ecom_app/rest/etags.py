@@ -0,0 +1,56 @@
+"""
+This module contains helpers for the conditional GET requests of the REST API. The ETags of the responses are derived
+from the data versions of the sellers and the request, so matching requests get 304 without running their queries
+"""
+
+import functools
+import hashlib
+import json
+
+from flask import request, Response
+from flask_login import current_user
+from flask_restful.utils import unpack
+from werkzeug.http import quote_etag
+
+from ecom_app.service import version_service
+
+
+def get_etag():
+    """
+    This function returns the ETag of the response to the current request from the data version the user sees
+    """
+    seller_id = None if current_user.is_admin else current_user.id
+    version = version_service.get_data_version(seller_id)
+
+    key = json.dumps([seller_id, version, request.path, sorted(request.args.items(multi=True))], default=str)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def etag_cached(method):
+    """
+    This function decorates a GET method of a resource to send the ETag of its response
+    and to answer a matching If-None-Match header with 304 without calling the method
+    :param method: method to decorate
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        etag = get_etag()
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        result = method(*args, **kwargs)
+
+        if isinstance(result, Response):
+            if result.status_code == 200:
+                result.set_etag(etag)
+            return result
+
+        data, code, headers = unpack(result)
+        if code == 200:
+            headers = dict(headers, ETag=quote_etag(etag))
+        return data, code, headers
+
+    return wrapper
@@ -0,0 +1,28 @@
+"""
+This module contains helpers for the sparse fieldsets of the REST API responses
+"""
+
+from flask import request, abort
+
+
+def get_fieldset_args(fields, columns, required_columns=()):
+    """
+    This function returns the response fields and the model columns selected by the fields argument of the request
+    :param fields: structure of the JSON response
+    :param columns: model columns each field of the JSON response needs
+    :param required_columns: model columns the resource needs besides the selected fields
+    """
+    requested = request.args.get('fields')
+
+    if not requested:
+        return fields, None
+
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    if not names or any(name not in fields for name in names):
+        abort(400, 'Fields are not valid')
+
+    selected_columns = set(required_columns)
+    for name in names:
+        selected_columns.update(columns[name])
+
+    return {name: fields[name] for name in names}, sorted(selected_columns)
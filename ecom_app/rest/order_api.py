@@ -3,11 +3,12 @@ This module contains the OrderAPI class which is used to handle the REST API req
 """
 
 from flask import request, abort
-from flask_restful import Resource, fields, marshal_with
+from flask_restful import Resource, fields, marshal
 from flask_login import login_required, current_user
-import validators
-
 from ecom_app.service import order_service, product_service
+from ecom_app.rest.fieldsets import get_fieldset_args
+from ecom_app.rest.etags import etag_cached
+from ecom_app.validation import InvalidInput, validate_order_changes
 
 
 # This is the structure of the JSON response
@@ -22,24 +23,37 @@ order_fields = {
     'status': fields.String(attribute=lambda x: x.status.label),
 }
 
+# These are the model columns each field of the JSON response needs
+order_columns = {
+    'id': ['id'],
+    'product_id': ['product_id'],
+    'product_name': ['product_id', 'product.name'],
+    'quantity': ['quantity'],
+    'total': ['quantity', 'product_id', 'product.price'],
+    'date': ['date'],
+    'customer_details': ['customer_details'],
+    'status': ['status'],
+}
+
 
 class OrderAPI(Resource):
     """
     This class is used to handle the REST API requests for orders
     """
-    @marshal_with(order_fields)
     @login_required
+    @etag_cached
     def get(self, order_id):
         """
         This method is used to handle the GET request for orders
         :param order_id: The id of the order to get
         """
-        order = order_service.get_order_by_id(order_id)
+        fields, columns = get_fieldset_args(order_fields, order_columns, required_columns=['seller_id'])
+        order = order_service.get_order_by_id(order_id, columns)
         if not order:
             abort(404, "Order not found")
         if not current_user.is_admin and order.seller_id != current_user.id:
             abort(403, "You are not authorized")
-        return order
+        return marshal(order, fields)
 
     @login_required
     def put(self, order_id):
@@ -53,33 +67,19 @@ class OrderAPI(Resource):
         if not current_user.is_admin and order.seller_id != current_user.id:
             return {'message': 'You are not authorized'}, 403
 
-        product, quantity, customer_details, status = None, None, None, None
-
-        if 'product' in request.json:
-            product = request.json['product']
-            if not product_service.get_product_by_id(product):
-                return {'message': 'Product is not valid'}, 400
-
-        if 'quantity' in request.json:
-            try:
-                quantity = int(request.json['quantity'])
-            except ValueError:
-                return {'message': 'Quantity is not valid'}, 400
-            if not validators.between(quantity, min=1):
-                return {'message': 'Quantity is not valid'}, 400
-
-        if 'customer_details' in request.json:
-            customer_details = request.json['customer_details']
-            if not validators.length(customer_details, min=1, max=300):
-                return {'message': 'Customer details is not valid'}, 400
+        try:
+            values = validate_order_changes(request.json)
+        except InvalidInput as error:
+            return {'message': error.message}, 400
 
-        if 'status' in request.json:
-            status = request.json['status']
-            if status not in order_service.get_available_statuses():
-                return {'message': 'Status is not valid'}, 400
+        if values['product'] is not None and not product_service.get_product_by_id(values['product']):
+            return {'message': 'Product is not valid'}, 400
 
         try:
-            order_service.update_order(order_id, quantity, customer_details, status, None, product)
+            order_service.update_order(order_id, values['quantity'], values['customer_details'], values['status'],
+                                       None, values['product'])
+        except order_service.OutOfStock:
+            return {'message': 'Product is out of stock'}, 409
         except Exception:
             return {'message': 'Error updating order'}, 500
 
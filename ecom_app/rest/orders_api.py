@@ -3,11 +3,14 @@ This module contains the OrderAPI class which is used to handle the REST API req
 """
 
 from flask import request, abort
-from flask_restful import Resource, fields, marshal_with
+from flask_restful import Resource, fields
 from flask_login import login_required, current_user
-import validators
-
 from ecom_app.service import order_service, product_service
+from ecom_app.rest.pagination import get_page_args, marshal_page
+from ecom_app.rest.streaming import get_stream_arg, stream_json_array
+from ecom_app.rest.fieldsets import get_fieldset_args
+from ecom_app.rest.etags import etag_cached
+from ecom_app.validation import InvalidInput, validate_new_order
 
 
 # This is the structure of the JSON response
@@ -22,33 +25,52 @@ orders_fields = {
     'status': fields.String(attribute=lambda x: x.status.label),
 }
 
+# These are the model columns each field of the JSON response needs
+orders_columns = {
+    'id': ['id'],
+    'product_id': ['product_id'],
+    'product_name': ['product_id', 'product.name'],
+    'quantity': ['quantity'],
+    'total': ['quantity', 'product_id', 'product.price'],
+    'date': ['date'],
+    'customer_details': ['customer_details'],
+    'status': ['status'],
+}
+
 
 class OrdersAPI(Resource):
     """
     This class is used to handle the REST API requests for orders
     """
-    @marshal_with(orders_fields)
     @login_required
+    @etag_cached
     def get(self):
         """
         This method is used to handle the GET request for orders
         """
         status = request.args.get('status')
+        fields, columns = get_fieldset_args(orders_fields, orders_columns)
+        stream = get_stream_arg()
+        limit, after = get_page_args()
+        page_limit = limit + 1 if limit else None
 
         if status:
             if status not in order_service.get_available_statuses():
                 abort(400, "Status is not valid")
             if current_user.is_admin:
-                orders = order_service.get_orders_filtered(status)
+                orders = order_service.get_orders_filtered(status, page_limit, after, stream, columns)
             else:
-                orders = order_service.get_orders_by_seller_filtered(current_user.id, status)
+                orders = order_service.get_orders_by_seller_filtered(current_user.id, status, page_limit, after,
+                                                                     stream, columns)
         else:
             if current_user.is_admin:
-                orders = order_service.get_orders()
+                orders = order_service.get_orders(page_limit, after, stream, columns)
             else:
-                orders = order_service.get_orders_by_seller(current_user.id)
+                orders = order_service.get_orders_by_seller(current_user.id, page_limit, after, stream, columns)
 
-        return orders
+        if stream:
+            return stream_json_array(orders, fields)
+        return marshal_page(orders, fields, limit)
 
     @login_required
     def post(self):
@@ -56,28 +78,17 @@ class OrdersAPI(Resource):
         This method is used to handle the POST request for orders
         """
         try:
-            product_id = request.json['product_id']
-            quantity = request.json['quantity']
-            customer_details = request.json['customer_details']
-            status = request.json['status']
-        except KeyError:
-            return {'message': 'Invalid input'}, 400
-
-        try:
-            product_id = int(product_id)
-            quantity = int(quantity)
-        except ValueError:
-            return {'message': 'Invalid input'}, 400
-
-        if not all([validators.between(quantity, min=1), validators.length(customer_details, min=1, max=300)]):
-            return {'message': 'Invalid input'}, 400
+            values = validate_new_order(request.json)
+        except InvalidInput as error:
+            return {'message': error.message}, 400
 
-        if not product_service.get_product_by_id(product_id):
+        if not product_service.get_product_by_id(values['product_id']):
             return {'message': 'Product is not valid'}, 400
 
-        if status not in order_service.get_available_statuses():
-            return {'message': 'Status is not valid'}, 400
-
-        order = order_service.create_order(quantity, customer_details, status, current_user.id, product_id)
+        try:
+            order = order_service.create_order(values['quantity'], values['customer_details'], values['status'],
+                                               current_user.id, values['product_id'])
+        except order_service.OutOfStock:
+            return {'message': 'Product is out of stock'}, 409
 
         return {'message': 'Order created', 'order_id': order.id}, 201
@@ -0,0 +1,70 @@
+"""
+This module contains the OrdersBulkAPI class which is used to handle the REST API requests for many orders at once
+"""
+
+from flask import request
+from flask_restful import Resource
+from flask_login import login_required, current_user
+import validators
+
+from ecom_app.service import order_service, product_service
+from ecom_app.validation import InvalidInput, validate_new_order
+
+
+MAX_BULK_ORDERS = 10000
+
+
+class OrdersBulkAPI(Resource):
+    """
+    This class is used to handle the REST API requests for many orders at once
+    """
+    @login_required
+    def post(self):
+        """
+        This method is used to handle the POST request for many orders
+        """
+        items = request.json.get('orders') if isinstance(request.json, dict) else None
+        if not isinstance(items, list) or not validators.between(len(items), min=1, max=MAX_BULK_ORDERS):
+            return {'message': 'Invalid input'}, 400
+
+        available_statuses = order_service.get_available_statuses()
+        results, pending = [], []
+
+        for index, item in enumerate(items):
+            try:
+                values = validate_new_order(item, available_statuses)
+            except InvalidInput as error:
+                results.append({'index': index, 'status': 400, 'message': error.message})
+                continue
+
+            result = {'index': index, 'status': 201, 'message': 'Order created'}
+            results.append(result)
+            pending.append((result, dict(values, seller_id=current_user.id)))
+
+        product_ids = {order['product_id'] for _, order in pending}
+        products = product_service.get_products_by_ids(product_ids, columns=[]) if product_ids else []
+        existing_product_ids = {product.id for product in products}
+
+        orders = []
+        for result, order in pending:
+            if order['product_id'] in existing_product_ids:
+                orders.append((result, order))
+            else:
+                result.update({'status': 400, 'message': 'Product is not valid'})
+
+        # The orders of the products out of stock are marked and the others are created again, until all the products
+        # left have enough stock
+        while True:
+            try:
+                created = order_service.create_orders([order for _, order in orders])
+                break
+            except order_service.OutOfStock as error:
+                out_of_stock = set(error.product_ids)
+                for result, order in orders:
+                    if order['product_id'] in out_of_stock:
+                        result.update({'status': 409, 'message': 'Product is out of stock'})
+                orders = [(result, order) for result, order in orders if order['product_id'] not in out_of_stock]
+            except Exception:
+                return {'message': 'Error creating orders'}, 500
+
+        return {'message': 'Orders processed', 'created': created, 'results': results}, 200
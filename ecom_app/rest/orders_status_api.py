@@ -0,0 +1,60 @@
+"""
+This module contains the OrdersStatusAPI class which is used to handle the REST API requests for order status changes
+"""
+
+from flask import request
+from flask_restful import Resource
+from flask_login import login_required, current_user
+import validators
+
+from ecom_app.service import order_service
+
+
+MAX_STATUS_ORDER_IDS = 10000
+
+
+class OrdersStatusAPI(Resource):
+    """
+    This class is used to handle the REST API requests for status changes of many orders at once
+    """
+    @login_required
+    def put(self):
+        """
+        This method is used to handle the PUT request for order status changes.
+        The orders are selected by a list of ids, by their current status or by both
+        """
+        if not isinstance(request.json, dict) or 'status' not in request.json:
+            return {'message': 'Invalid input'}, 400
+
+        available_statuses = order_service.get_available_statuses()
+
+        status = request.json['status']
+        if status not in available_statuses:
+            return {'message': 'Status is not valid'}, 400
+
+        order_ids, current_status = None, None
+
+        if 'ids' in request.json:
+            order_ids = request.json['ids']
+            if not isinstance(order_ids, list) or not validators.between(len(order_ids), min=1,
+                                                                         max=MAX_STATUS_ORDER_IDS):
+                return {'message': 'Ids are not valid'}, 400
+            if not all(isinstance(order_id, int) for order_id in order_ids):
+                return {'message': 'Ids are not valid'}, 400
+
+        if 'current_status' in request.json:
+            current_status = request.json['current_status']
+            if current_status not in available_statuses:
+                return {'message': 'Current status is not valid'}, 400
+
+        if order_ids is None and current_status is None:
+            return {'message': 'Invalid input'}, 400
+
+        seller_id = None if current_user.is_admin else current_user.id
+
+        try:
+            updated = order_service.update_orders_status(status, order_ids, current_status, seller_id)
+        except Exception:
+            return {'message': 'Error updating orders'}, 500
+
+        return {'message': 'Success', 'updated': updated}, 200
@@ -0,0 +1,171 @@
+"""
+This module contains helpers for the cursor pagination of the REST API listings
+"""
+
+import base64
+import binascii
+import json
+
+from flask import request, abort
+from flask_restful import marshal
+import validators
+
+from ecom_app.validation import InvalidInput
+
+
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(last_id):
+    """
+    This function encodes the id of the last item of a page into an opaque cursor
+    :param last_id: id of the last item of the page
+    """
+    return base64.urlsafe_b64encode(json.dumps({'id': last_id}).encode()).decode()
+
+
+def read_cursor(cursor):
+    """
+    This function returns the id of the last item of the previous page from an opaque cursor, None if it is not valid
+    :param cursor: cursor to read
+    """
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))['id']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+
+    return last_id if isinstance(last_id, int) else None
+
+
+def decode_cursor(cursor):
+    """
+    This function decodes the id of the last item of the previous page from an opaque cursor
+    :param cursor: cursor to decode
+    """
+    last_id = read_cursor(cursor)
+
+    if last_id is None:
+        abort(400, 'Cursor is not valid')
+
+    return last_id
+
+
+def encode_ranked_cursor(score, last_id):
+    """
+    This function encodes the relevance score and the id of the last item of a ranked page into an opaque cursor
+    :param score: relevance score of the last item of the page
+    :param last_id: id of the last item of the page
+    """
+    return base64.urlsafe_b64encode(json.dumps({'score': score, 'id': last_id}).encode()).decode()
+
+
+def decode_ranked_cursor(cursor):
+    """
+    This function decodes the relevance score and the id of the last item of the previous ranked page
+    from an opaque cursor
+    :param cursor: cursor to decode
+    """
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        score, last_id = after['score'], after['id']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        abort(400, 'Cursor is not valid')
+
+    if not isinstance(score, (int, float)) or isinstance(score, bool) or not isinstance(last_id, int):
+        abort(400, 'Cursor is not valid')
+
+    return score, last_id
+
+
+def parse_limit_arg(args, default=None):
+    """
+    This function returns the limit of a request, it doesn't depend on the web framework
+    :param args: query arguments of the request
+    :param default: limit of the request without a limit argument
+    """
+    limit = args.get('limit')
+
+    if not limit:
+        return default
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise InvalidInput('Limit is not valid')
+
+    if not validators.between(limit, min=1, max=MAX_PAGE_LIMIT):
+        raise InvalidInput('Limit is not valid')
+
+    return limit
+
+
+def parse_page_args(args):
+    """
+    This function returns the limit and the decoded after cursor of a request, None for absent values, it doesn't
+    depend on the web framework
+    :param args: query arguments of the request
+    """
+    after = args.get('after')
+    limit = parse_limit_arg(args, MAX_PAGE_LIMIT if after else None)
+
+    if after:
+        after = read_cursor(after)
+        if after is None:
+            raise InvalidInput('Cursor is not valid')
+    else:
+        after = None
+
+    return limit, after
+
+
+def get_limit_arg(default=None):
+    """
+    This function returns the limit of the request
+    :param default: limit of the request without a limit argument
+    """
+    try:
+        return parse_limit_arg(request.args, default)
+    except InvalidInput as error:
+        abort(400, error.message)
+
+
+def get_page_args():
+    """
+    This function returns the limit and the decoded after cursor of the request, None for absent values
+    """
+    try:
+        return parse_page_args(request.args)
+    except InvalidInput as error:
+        abort(400, error.message)
+
+
+def marshal_page(items, fields, limit):
+    """
+    This function marshals a page of items together with the cursor of the next page
+    :param items: items of the page, one more than the limit if there is a next page
+    :param fields: structure of the JSON response for each item
+    :param limit: maximum number of items in the page, None to marshal a plain list
+    """
+    if limit is None:
+        return marshal(items, fields)
+
+    next_cursor = encode_cursor(items[limit - 1].id) if len(items) > limit else None
+
+    return {'items': marshal(items[:limit], fields), 'next': next_cursor}
+
+
+def marshal_ranked_page(results, fields, limit):
+    """
+    This function marshals a page of ranked items with their relevance scores together with the cursor
+    of the next page
+    :param results: items of the page with their scores, one more than the limit if there is a next page
+    :param fields: structure of the JSON response for each item, without the score
+    :param limit: maximum number of items in the page
+    """
+    next_cursor = None
+    if len(results) > limit:
+        last_item, last_score = results[limit - 1]
+        next_cursor = encode_ranked_cursor(last_score, last_item.id)
+
+    return {'items': [dict(marshal(item, fields), score=score) for item, score in results[:limit]],
+            'next': next_cursor}
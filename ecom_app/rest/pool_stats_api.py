@@ -0,0 +1,22 @@
+"""
+This module contains the PoolStatsAPI class which is used to handle the REST API requests for connection pool statistics
+"""
+
+from flask import abort, current_app
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+
+class PoolStatsAPI(Resource):
+    """
+    This class is used to handle the REST API requests for the statistics of the connection pools of this worker
+    """
+    @login_required
+    def get(self):
+        """
+        This method is used to handle the GET request for connection pool statistics
+        """
+        if not current_user.is_admin:
+            abort(403, 'You are not authorized')
+
+        return {name: stats.snapshot() for name, stats in current_app.extensions['pool_stats'].items()}, 200
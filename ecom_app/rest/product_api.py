@@ -3,11 +3,12 @@ This module contains the ProductAPI class which is used to handle the REST API r
 """
 
 from flask import request, abort
-from flask_restful import Resource, fields, marshal_with
+from flask_restful import Resource, fields, marshal
 from flask_login import login_required, current_user
-import validators
-
 from ecom_app.service import product_service
+from ecom_app.rest.fieldsets import get_fieldset_args
+from ecom_app.rest.etags import etag_cached
+from ecom_app.validation import InvalidInput, validate_product_changes
 
 
 # This is the structure of the JSON response
@@ -20,24 +21,35 @@ product_fields = {
     'ordered': fields.Integer,
 }
 
+# These are the model columns each field of the JSON response needs
+product_columns = {
+    'id': ['id'],
+    'name': ['name'],
+    'description': ['description'],
+    'price': ['price'],
+    'inventory': ['inventory'],
+    'ordered': ['ordered_quantity'],
+}
+
 
 class ProductAPI(Resource):
     """
     This class is used to handle the REST API requests for products
     """
-    @marshal_with(product_fields)
     @login_required
+    @etag_cached
     def get(self, product_id):
         """
         This method is used to handle the GET request for products
         :param product_id: The id of the product to get
         """
-        product = product_service.get_product_by_id(product_id)
+        fields, columns = get_fieldset_args(product_fields, product_columns, required_columns=['seller_id'])
+        product = product_service.get_product_by_id(product_id, columns)
         if not product:
             abort(404, 'Product not found')
         if not current_user.is_admin and product.seller_id != current_user.id:
             abort(403, 'You are not authorized')
-        return product
+        return marshal(product, fields)
 
     @login_required
     def put(self, product_id):
@@ -51,35 +63,14 @@ class ProductAPI(Resource):
         if not current_user.is_admin and product.seller_id != current_user.id:
             return {'message': 'You are not authorized'}, 403
 
-        name, description, price, inventory = None, None, None, None
-
-        if 'name' in request.json:
-            name = request.json['name']
-            if not validators.length(name, min=1, max=30):
-                return {'message': 'Name is not valid'}, 400
-        if 'description' in request.json:
-            description = request.json['description']
-            if not validators.length(description, min=1, max=300):
-                return {'message': 'Description is not valid'}, 400
-        if 'price' in request.json:
-            try:
-                price = int(request.json['price'])
-            except ValueError:
-                return {'message': 'Price is not valid'}, 400
-
-            if not validators.between(price, min=0.01):
-                return {'message': 'Price is not valid'}, 400
-        if 'inventory' in request.json:
-            try:
-                inventory = int(request.json['inventory'])
-            except ValueError:
-                return {'message': 'Inventory is not valid'}, 400
-
-            if not validators.between(inventory, min=0):
-                return {'message': 'Inventory is not valid'}, 400
+        try:
+            values = validate_product_changes(request.json)
+        except InvalidInput as error:
+            return {'message': error.message}, 400
 
         try:
-            product_service.update_product(product_id, name, description, price, inventory)
+            product_service.update_product(product_id, values['name'], values['description'], values['price'],
+                                           values['inventory'])
         except Exception:
             return {'message': 'Error updating product'}, 500
 
@@ -3,11 +3,14 @@ This module contains the ProductsAPI class which is used to handle the REST API
 """
 
 from flask import request, abort
-from flask_restful import Resource, fields, marshal_with
+from flask_restful import Resource, fields
 from flask_login import login_required, current_user
-import validators
-
-from ecom_app.service import product_service
+from ecom_app.service import product_service, import_service
+from ecom_app.rest.pagination import get_page_args, marshal_page
+from ecom_app.rest.streaming import get_stream_arg, stream_json_array
+from ecom_app.rest.fieldsets import get_fieldset_args
+from ecom_app.rest.etags import etag_cached
+from ecom_app.validation import InvalidInput, parse_count_arg
 
 
 # This is the structure of the JSON response
@@ -20,96 +23,71 @@ products_fields = {
     'ordered': fields.Integer,
 }
 
+# These are the model columns each field of the JSON response needs
+products_columns = {
+    'id': ['id'],
+    'name': ['name'],
+    'description': ['description'],
+    'price': ['price'],
+    'inventory': ['inventory'],
+    'ordered': ['ordered_quantity'],
+}
+
 
 class ProductsAPI(Resource):
     """
     This class is used to handle the REST API requests for products
     """
-    @marshal_with(products_fields)
     @login_required
+    @etag_cached
     def get(self):
         """
         This method is used to handle the GET request for products
         """
-        inventory_from = request.args.get('inventory_from')
-        inventory_to = request.args.get('inventory_to')
-        ordered_from = request.args.get('ordered_from')
-        ordered_to = request.args.get('ordered_to')
-
-        if inventory_from:
-            try:
-                inventory_from = int(inventory_from)
-            except ValueError:
-                abort(400, 'Invalid input')
-
-            if not validators.between(inventory_from, min=0):
-                abort(400, 'Invalid input')
-
-        if inventory_to:
-            try:
-                inventory_to = int(inventory_to)
-            except ValueError:
-                abort(400, 'Invalid input')
-
-            if not validators.between(inventory_to, min=0):
-                abort(400, 'Invalid input')
-
-        if ordered_from:
-            try:
-                ordered_from = int(ordered_from)
-            except ValueError:
-                abort(400, 'Invalid input')
-
-            if not validators.between(ordered_from, min=0):
-                abort(400, 'Invalid input')
-
-        if ordered_to:
-            try:
-                ordered_to = int(ordered_to)
-            except ValueError:
-                abort(400, 'Invalid input')
-
-            if not validators.between(ordered_to, min=0):
-                abort(400, 'Invalid input')
+        try:
+            inventory_from = parse_count_arg(request.args, 'inventory_from')
+            inventory_to = parse_count_arg(request.args, 'inventory_to')
+            ordered_from = parse_count_arg(request.args, 'ordered_from')
+            ordered_to = parse_count_arg(request.args, 'ordered_to')
+        except InvalidInput as error:
+            abort(400, error.message)
+
+        fields, columns = get_fieldset_args(products_fields, products_columns)
+        stream = get_stream_arg()
+        limit, after = get_page_args()
+        page_limit = limit + 1 if limit else None
 
         if current_user.is_admin:
             if any([inventory_from, inventory_to, ordered_from, ordered_to]):
-                products = product_service.get_products_filtered(inventory_from, inventory_to, ordered_from, ordered_to)
+                products = product_service.get_products_filtered(inventory_from, inventory_to, ordered_from, ordered_to,
+                                                                 page_limit, after, stream, columns)
             else:
-                products = product_service.get_products()
+                products = product_service.get_products(page_limit, after, stream, columns)
         else:
             if any([inventory_from, inventory_to, ordered_from, ordered_to]):
                 products = product_service.get_products_by_seller_filtered(current_user.id, inventory_from,
-                                                                           inventory_to, ordered_from, ordered_to)
+                                                                           inventory_to, ordered_from, ordered_to,
+                                                                           page_limit, after, stream, columns)
             else:
-                products = product_service.get_products_by_seller(current_user.id)
+                products = product_service.get_products_by_seller(current_user.id, page_limit, after, stream,
+                                                                  columns)
 
-        return products
+        if stream:
+            return stream_json_array(products, fields)
+        return marshal_page(products, fields, limit)
 
     @login_required
     def post(self):
         """
         This method is used to handle the POST request for products
         """
-
-        try:
-            name = request.json['name']
-            description = request.json['description']
-        except KeyError:
-            return {'message': 'Invalid input'}, 400
-
-        try:
-            price = int(request.json['price'])
-            inventory = int(request.json['inventory'])
-        except ValueError:
-            return {'message': 'Invalid input'}, 400
-
-        if not all([validators.length(name, min=1, max=30), validators.length(description, min=1, max=300),
-                   validators.between(price, min=0.01), validators.between(price, min=0)]):
+        values = import_service.validate_product(request.json)
+        if values is None:
             return {'message': 'Invalid input'}, 400
 
         try:
-            product_service.create_product(name, description, price, inventory, current_user.id)
+            product_service.create_product(values['name'], values['description'], values['price'],
+                                           values['inventory'], current_user.id)
         except Exception:
             return {'message': 'Error creating product'}, 500
 
@@ -0,0 +1,41 @@
+"""
+This module contains the ProductsAutocompleteAPI class which is used to handle the REST API requests
+for the autocompletion of product names
+"""
+
+from flask import request, abort
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+from ecom_app import autocomplete
+from ecom_app.rest.pagination import get_limit_arg
+
+
+class ProductsAutocompleteAPI(Resource):
+    """
+    This class is used to handle the REST API requests for the products whose names start with a prefix,
+    answered from the prefix index of the worker
+    """
+    @login_required
+    def get(self):
+        """
+        This method is used to handle the GET request for the products whose names start with a prefix
+        """
+        prefix = request.args.get('prefix', '').strip()
+        if not prefix:
+            abort(400, 'Prefix is not valid')
+
+        seller_id = current_user.id
+        if current_user.is_admin:
+            seller_id = request.args.get('seller_id')
+            if seller_id:
+                try:
+                    seller_id = int(seller_id)
+                except ValueError:
+                    abort(400, 'Seller id is not valid')
+            else:
+                seller_id = None
+
+        products = autocomplete.complete_product_names(prefix, seller_id, get_limit_arg())
+
+        return [{'id': product_id, 'name': name} for product_id, name in products], 200
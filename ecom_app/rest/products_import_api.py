@@ -0,0 +1,49 @@
+"""
+This module contains the ProductsImportAPI class which is used to handle the REST API requests for product imports
+"""
+
+from flask import request
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+from ecom_app.service import import_service
+
+
+# This is the format of the file for each accepted content type
+import_content_types = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+}
+
+
+class ProductsImportAPI(Resource):
+    """
+    This class is used to handle the REST API requests for product imports
+    """
+    @login_required
+    def post(self):
+        """
+        This method is used to handle the POST request for product imports.
+        The file is read either from the 'file' field of a multipart form or from the request body
+        """
+        file_format = request.args.get('format')
+
+        if 'file' in request.files:
+            stream = request.files['file'].stream
+            if not file_format:
+                file_format = request.files['file'].filename.rsplit('.', 1)[-1].lower()
+        else:
+            stream = request.stream
+            if not file_format:
+                file_format = import_content_types.get(request.mimetype)
+
+        if file_format not in import_service.IMPORT_FORMATS:
+            return {'message': 'Format is not valid'}, 400
+
+        try:
+            summary = import_service.import_products(stream, file_format, current_user.id)
+        except Exception:
+            return {'message': 'Error importing products'}, 500
+
+        return dict(summary, message='Import finished'), 200
@@ -0,0 +1,38 @@
+"""
+This module contains the ProductsSearchAPI class which is used to handle the REST API requests for the full-text
+search of products
+"""
+
+from flask import request, abort
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+from ecom_app.service import search_service
+from ecom_app.rest.pagination import get_limit_arg, decode_ranked_cursor, marshal_ranked_page
+from ecom_app.rest.products_api import products_fields
+from ecom_app.rest.etags import etag_cached
+
+
+class ProductsSearchAPI(Resource):
+    """
+    This class is used to handle the REST API requests for products whose names or descriptions contain words,
+    most relevant first
+    """
+    @login_required
+    @etag_cached
+    def get(self):
+        """
+        This method is used to handle the GET request for a search of products
+        """
+        text = request.args.get('q', '')
+        if not search_service.get_search_words(text):
+            abort(400, 'Search query is not valid')
+
+        limit = get_limit_arg(search_service.SEARCH_PAGE_LIMIT)
+        after = request.args.get('after')
+        after = decode_ranked_cursor(after) if after else None
+
+        results = search_service.search_products(text, None if current_user.is_admin else current_user.id,
+                                                 limit + 1, after)
+
+        return marshal_ranked_page(results, products_fields, limit)
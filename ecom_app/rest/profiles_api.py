@@ -0,0 +1,52 @@
+"""
+This module contains the ProfilesAPI and ProfileAPI classes which are used to handle the REST API requests
+for the stored request profiles
+"""
+
+import os
+
+from flask import request, abort, send_file, Response
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+from ecom_app import profiling
+
+
+class ProfilesAPI(Resource):
+    """
+    This class is used to handle the REST API requests for the list of stored request profiles
+    """
+    @login_required
+    def get(self):
+        """
+        This method is used to handle the GET request for the stored request profiles, newest first
+        """
+        if not current_user.is_admin:
+            abort(403, 'You are not authorized')
+
+        return profiling.list_profiles(), 200
+
+
+class ProfileAPI(Resource):
+    """
+    This class is used to handle the REST API requests for a single stored request profile
+    """
+    @login_required
+    def get(self, profile_id):
+        """
+        This method is used to handle the GET request for a stored request profile. The cProfile data is downloaded
+        by default, format=text returns a report sorted by cumulative time
+        :param profile_id: The id of the profile
+        """
+        if not current_user.is_admin:
+            abort(403, 'You are not authorized')
+
+        path = profiling.get_profile_path(profile_id)
+        if path is None or not os.path.exists(path):
+            abort(404, 'Profile not found')
+
+        if request.args.get('format') == 'text':
+            return Response(profiling.format_profile(profile_id), mimetype='text/plain')
+
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{profile_id}.prof')
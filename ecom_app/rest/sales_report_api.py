@@ -0,0 +1,70 @@
+"""
+This module contains the SalesReportAPI class which is used to handle the REST API requests for sales reports
+"""
+
+from datetime import date
+
+from flask import request, abort
+from flask_restful import Resource
+from flask_login import login_required, current_user
+
+from ecom_app.models import Status
+from ecom_app.service import rollup_service
+from ecom_app.rest.etags import etag_cached
+
+
+def get_date_arg(name):
+    """
+    This function returns the date of the argument of the request in YYYY-MM-DD format, None if it is absent
+    :param name: name of the argument
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400, f'{name.capitalize()} date is not valid')
+
+
+class SalesReportAPI(Resource):
+    """
+    This class is used to handle the REST API requests for the quantity and revenue of orders per day, product,
+    seller or status, read from the daily sales rollup
+    """
+    @login_required
+    @etag_cached
+    def get(self):
+        """
+        This method is used to handle the GET request for a sales report
+        """
+        date_from, date_to = get_date_arg('from'), get_date_arg('to')
+        if date_from and date_to and date_from > date_to:
+            abort(400, 'From date is after to date')
+
+        group_by = [group.strip() for group in request.args.get('group_by', 'day').split(',') if group.strip()]
+        if not group_by or any(group not in rollup_service.SALES_GROUPS for group in group_by) \
+                or len(set(group_by)) != len(group_by):
+            abort(400, 'Group by is not valid')
+        if 'seller' in group_by and not current_user.is_admin:
+            abort(403, 'You are not authorized')
+
+        status = request.args.get('status')
+        if status:
+            statuses = {member.label: member for member in Status}
+            if status not in statuses:
+                abort(400, 'Status is not valid')
+            status = statuses[status]
+
+        sales = rollup_service.get_sales(date_from, date_to, group_by,
+                                         None if current_user.is_admin else current_user.id, status or None)
+
+        for sale in sales:
+            if 'day' in sale:
+                sale['day'] = sale['day'].isoformat()
+            if 'status' in sale:
+                sale['status'] = sale['status'].label
+            sale['revenue'] = round(sale['revenue'], 2)
+
+        return sales, 200
@@ -2,16 +2,14 @@
 This module contains the SellerAPI class which is used to handle the REST API requests for single seller
 """
 
-import re
-
 from flask import request
-from flask_restful import Resource, fields, marshal_with
+from flask_restful import Resource, fields, marshal
 from flask_login import login_required, current_user
-import validators
-import phonenumbers
 from werkzeug.security import generate_password_hash
 
 from ecom_app.service import seller_service
+from ecom_app.rest.fieldsets import get_fieldset_args
+from ecom_app.validation import InvalidInput, validate_seller_changes
 
 
 # This is the structure of the JSON response
@@ -21,26 +19,33 @@ seller_fields = {
     'phone': fields.String,
 }
 
+# These are the model columns each field of the JSON response needs
+seller_columns = {
+    'name': ['name'],
+    'email': ['email'],
+    'phone': ['phone'],
+}
+
 
 class SellerAPI(Resource):
     """
     This class is used to handle the REST API requests for sellers
     """
-    @marshal_with(seller_fields)
     @login_required
     def get(self, seller_id=None):
         """
         This method is used to handle the GET request for sellers
         :param seller_id: The id of the seller
         """
+        fields, columns = get_fieldset_args(seller_fields, seller_columns)
         if seller_id and seller_id != current_user.id and not current_user.is_admin:
             return {'message': 'You are not authorized'}, 403
         if not seller_id:
             seller_id = current_user.id
-        seller = seller_service.get_seller_by_id(seller_id)
+        seller = seller_service.get_seller_by_id(seller_id, columns)
         if not seller:
             return {'message': 'Seller not found'}, 404
-        return seller
+        return marshal(seller, fields)
 
     @login_required
     def put(self, seller_id=None):
@@ -56,37 +61,16 @@ class SellerAPI(Resource):
         if not seller:
             return {'message': 'Seller not found'}, 404
 
-        name, email, phone, password = None, None, None, None
-
-        if 'name' in request.json:
-            name = request.json['name']
-            if not validators.length(name, min=1, max=30):
-                return {'message': 'Name is not valid'}, 400
-        if 'email' in request.json:
-            email = request.json['email']
-            if not validators.email(email):
-                return {'message': 'Email is not valid'}, 400
-        if 'phone' in request.json:
-            phone = request.json['phone']
-            try:
-                a = phonenumbers.parse(phone)
-                if not phonenumbers.is_valid_number(phonenumbers.parse(phone)):
-                    return {'message': 'Phone is not valid'}, 400
-            except phonenumbers.phonenumberutil.NumberParseException:
-                return {'message': 'Phone is not valid'}, 400
-
-        if 'password' in request.json and current_user.is_admin:
-            password = request.json['password']
-            if not validators.length(password, min=8, max=30):
-                return {'message': 'Password is not valid'}, 400
-
-            if not re.match('[A-Za-z0-9_]+$', password):
-                return {'message': 'Password is not valid'}, 400
-
-            password = generate_password_hash(password, method='sha256')
+        try:
+            values = validate_seller_changes(request.json, allow_password=current_user.is_admin)
+        except InvalidInput as error:
+            return {'message': error.message}, 400
+
+        password = generate_password_hash(values['password'], method='sha256') if values['password'] else None
 
         try:
-            update_successful = seller_service.update_seller(seller_id, name, email, phone, password)
+            update_successful = seller_service.update_seller(seller_id, values['name'], values['email'],
+                                                              values['phone'], password)
         except Exception:
             return {'message': 'Error updating seller'}, 500
 
@@ -2,16 +2,15 @@
 This module contains the REST API for sellers which is used to handle the REST API requests for sellers
 """
 
-import re
-
 from flask import request, abort
-from flask_restful import Resource, fields, marshal_with
+from flask_restful import Resource, fields
 from flask_login import login_required, current_user
-import validators
-import phonenumbers
 from werkzeug.security import generate_password_hash
 
 from ecom_app.service import seller_service
+from ecom_app.rest.pagination import get_page_args, marshal_page
+from ecom_app.rest.fieldsets import get_fieldset_args
+from ecom_app.validation import InvalidInput, validate_new_seller
 
 
 # This is the structure of the JSON response
@@ -22,12 +21,19 @@ sellers_fields = {
     'phone': fields.String,
 }
 
+# These are the model columns each field of the JSON response needs
+sellers_columns = {
+    'id': ['id'],
+    'name': ['name'],
+    'email': ['email'],
+    'phone': ['phone'],
+}
+
 
 class SellersAPI(Resource):
     """
     This class is used to handle the REST API requests for sellers
     """
-    @marshal_with(sellers_fields)
     @login_required
     def get(self):
         """
@@ -35,7 +41,12 @@ class SellersAPI(Resource):
         """
         if not current_user.is_admin:
             abort(403, 'You are not authorized')
-        return seller_service.get_sellers()
+
+        fields, columns = get_fieldset_args(sellers_fields, sellers_columns)
+        limit, after = get_page_args()
+        sellers = seller_service.get_sellers(limit + 1 if limit else None, after, columns)
+
+        return marshal_page(sellers, fields, limit)
 
     @login_required
     def post(self):
@@ -46,29 +57,15 @@ class SellersAPI(Resource):
             return {'message': 'You are not authorized'}, 403
 
         try:
-            name = request.json['name']
-            email = request.json['email']
-            phone = request.json['phone']
-            password = request.json['password']
-        except KeyError:
-            return {'message': 'Invalid input'}, 400
-
-        if not all([validators.length(name, min=1, max=30), validators.email(email),
-                    validators.length(password, min=8, max=30)]):
-            return {'message': 'Invalid input'}, 400
-
-        try:
-            phonenumbers.parse(phone)
-        except phonenumbers.phonenumberutil.NumberParseException:
-            return {'message': 'Invalid input'}, 400
-
-        if not re.match('[A-Za-z0-9_]+$', password) or not phonenumbers.is_valid_number(phonenumbers.parse(phone)):
-            return {'message': 'Invalid input'}, 400
+            values = validate_new_seller(request.json)
+        except InvalidInput as error:
+            return {'message': error.message}, 400
 
-        password = generate_password_hash(password, method='sha256')
+        password = generate_password_hash(values['password'], method='sha256')
 
         try:
-            seller_service.create_seller(name, email, phone, password, is_admin=False)
+            seller_service.create_seller(values['name'], values['email'], values['phone'], password,
+                                         is_admin=False)
         except Exception:
             return {'message': 'Error creating seller'}, 500
 
@@ -0,0 +1,41 @@
+"""
+This module contains helpers for the streaming JSON responses of the REST API listings
+"""
+
+import json
+
+from flask import request, abort, Response, stream_with_context
+from flask_restful import marshal
+
+
+def get_stream_arg():
+    """
+    This function returns whether the request asks for a streaming response
+    """
+    stream = request.args.get('stream')
+
+    if not stream:
+        return False
+    if stream not in ('1', 'true'):
+        abort(400, 'Stream is not valid')
+    if request.args.get('limit') or request.args.get('after'):
+        abort(400, 'Streaming responses are not paginated')
+
+    return True
+
+
+def stream_json_array(items, fields):
+    """
+    This function returns a response that writes the marshalled items as a JSON array while iterating them
+    :param items: iterable of items to marshal
+    :param fields: structure of the JSON response for each item
+    """
+    def generate():
+        yield '['
+        for index, item in enumerate(items):
+            if index:
+                yield ','
+            yield json.dumps(marshal(item, fields))
+        yield ']'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
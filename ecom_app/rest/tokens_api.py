@@ -0,0 +1,42 @@
+"""
+This module contains the TokensAPI class which is used to handle the REST API requests for API tokens
+"""
+
+from flask import request, current_app
+from flask_restful import Resource
+from werkzeug.security import check_password_hash
+
+from ecom_app import tokens
+from ecom_app.service import seller_service
+
+
+class TokensAPI(Resource):
+    """
+    This class is used to handle the REST API requests for the bearer tokens of machine clients
+    """
+    def post(self):
+        """
+        This method is used to handle the POST request for a new token of a seller
+        """
+        try:
+            email = request.json['email']
+            password = request.json['password']
+        except (KeyError, TypeError):
+            return {'message': 'Invalid input'}, 400
+
+        seller = seller_service.get_seller_by_email(email)
+        if not seller or not isinstance(password, str) or not check_password_hash(seller.password, password):
+            return {'message': 'Invalid email or password'}, 401
+
+        token, expires_in = tokens.issue_token(current_app, seller)
+        return {'token': token, 'token_type': 'Bearer', 'expires_in': expires_in}, 200
+
+    def delete(self):
+        """
+        This method is used to handle the DELETE request revoking the token of the request
+        """
+        token = tokens.get_bearer_token(request.headers)
+        if not token or not tokens.revoke_token(current_app, token):
+            return {'message': 'Invalid token'}, 401
+
+        return {'message': 'Success'}, 200
@@ -0,0 +1,151 @@
+"""
+This module contains functions to import products from CSV and NDJSON files
+"""
+
+import csv
+import json
+
+import validators
+
+from ecom_app.service import product_service
+
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+def validate_product(values):
+    """
+    This function validates the values of a new product and returns them converted or None if they are not valid
+    :param values: dict with name, description, price and inventory of the product
+    """
+    try:
+        name = values['name']
+        description = values['description']
+        price = int(values['price'])
+        inventory = int(values['inventory'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if not isinstance(name, str) or not isinstance(description, str):
+        return None
+
+    if not all([validators.length(name, min=1, max=30), validators.length(description, min=1, max=300),
+                validators.between(price, min=0.01), validators.between(inventory, min=0)]):
+        return None
+
+    return {'name': name, 'description': description, 'price': price, 'inventory': inventory}
+
+
+class DecodedLines:
+    """
+    This class iterates over the lines of a binary stream decoded from UTF-8 one line at a time, so that a line that
+    is not valid UTF-8 doesn't affect the others. Such lines are decoded with replacement characters and their
+    numbers are kept
+    """
+    def __init__(self, stream):
+        self.lines = iter(stream)
+        self.line_number = 0
+        self.invalid_lines = set()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self.lines)
+        self.line_number += 1
+        try:
+            return line.decode('utf-8')
+        except UnicodeDecodeError:
+            self.invalid_lines.add(self.line_number)
+            return line.decode('utf-8', errors='replace')
+
+
+def read_product_rows(stream, file_format):
+    """
+    This function yields the row number, the parsed values and the error of every row of the file. The values
+    of rows that can't be read or parsed are None and their error is the message reported for them
+    :param stream: binary stream of the file
+    :param file_format: format of the file, csv or ndjson
+    """
+    lines = DecodedLines(stream)
+
+    if file_format == 'csv':
+        reader = csv.DictReader(lines)
+        first_line = 1
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                row = None
+
+            # A row can span several lines when its fields are quoted
+            if lines.invalid_lines.intersection(range(first_line, lines.line_number + 1)):
+                yield lines.line_number, None, 'Invalid encoding'
+            elif row is None:
+                yield lines.line_number, None, 'Invalid input'
+            else:
+                yield lines.line_number, row, None
+            first_line = lines.line_number + 1
+
+    for line in lines:
+        if lines.line_number in lines.invalid_lines:
+            yield lines.line_number, None, 'Invalid encoding'
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        if isinstance(row, dict):
+            yield lines.line_number, row, None
+        else:
+            yield lines.line_number, None, 'Invalid input'
+
+
+def import_products(stream, file_format, seller_id, batch_size=IMPORT_BATCH_SIZE):
+    """
+    This function creates or updates products of the seller by name from a CSV or NDJSON file in batches.
+    The rows that are not valid UTF-8, CSV or JSON are reported as errors of the summary and the others are imported
+    :param stream: binary stream of the file
+    :param file_format: format of the file, csv or ndjson
+    :param seller_id: id of the seller
+    :param batch_size: number of rows to write in one transaction
+    """
+    summary = {'created': 0, 'updated': 0, 'error_count': 0, 'errors': []}
+
+    def report_error(row_number, message):
+        summary['error_count'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'row': row_number, 'message': message})
+
+    def write_batch(batch):
+        created, updated, taken_names = product_service.upsert_products(
+            [values for _, values in batch], seller_id
+        )
+        summary['created'] += created
+        summary['updated'] += updated
+        for row_number, values in batch:
+            if values['name'] in taken_names:
+                report_error(row_number, 'Name is used by another seller')
+
+    batch = []
+    for row_number, row, error in read_product_rows(stream, file_format):
+        values = validate_product(row) if error is None else None
+        if values is None:
+            report_error(row_number, error or 'Invalid input')
+            continue
+
+        batch.append((row_number, values))
+        if len(batch) >= batch_size:
+            write_batch(batch)
+            batch = []
+
+    if batch:
+        write_batch(batch)
+
+    return summary
@@ -2,21 +2,45 @@
 This module contains functions to work with orders table
 """
 
-from ecom_app.database import db
-from ecom_app.models import Order, Status
+from sqlalchemy import func, insert, update, bindparam, select, case
+from sqlalchemy.orm import joinedload, load_only
 
+from ecom_app.database import db, use_replica
+from ecom_app.models import Order, Product, Status
+from ecom_app.service import product_service, rollup_service, version_service
 
-def get_orders():
+
+STREAM_BATCH_SIZE = 1000
+
+
+class OutOfStock(Exception):
+    """
+    This class is the error raised when an order write needs more of some products than their inventories have left
+    """
+    def __init__(self, product_ids):
+        super().__init__('Product is out of stock')
+        self.product_ids = product_ids
+
+
+def get_orders(limit=None, after=None, stream=False, columns=None):
     """
     This function returns all orders
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    :param stream: return an iterator that loads orders in batches instead of a list
+    :param columns: names of the order columns and 'product.' prefixed product columns to load, None for all
     """
-    return Order.query.all()
+    return fetch_orders(paginate_orders(load_order_columns(Order.query, columns), limit, after), stream)
 
 
-def get_orders_filtered(status):
+def get_orders_filtered(status, limit=None, after=None, stream=False, columns=None):
     """
     This function returns all orders filtered by status
     :param status: status of the order
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    :param stream: return an iterator that loads orders in batches instead of a list
+    :param columns: names of the order columns and 'product.' prefixed product columns to load, None for all
     """
     if isinstance(status, Status):
         status = status.name
@@ -31,34 +55,46 @@ def get_orders_filtered(status):
             else:
                 status = None
 
-    order_query = filter_orders_by_status(Order.query, status)
+    order_query = filter_orders_by_status(load_order_columns(Order.query, columns), status)
 
-    return order_query.all()
+    return fetch_orders(paginate_orders(order_query, limit, after), stream)
 
 
-def get_order_by_id(order_id):
+def get_order_by_id(order_id, columns=None):
     """
     This function returns order by id
     :param order_id: id of the order
+    :param columns: names of the order columns and 'product.' prefixed product columns to load, None for all
     """
-    return Order.query.filter_by(id=order_id).first()
+    return load_order_columns(Order.query, columns).filter_by(id=order_id).first()
 
 
-def get_orders_by_seller(seller_id):
+def get_orders_by_seller(seller_id, limit=None, after=None, stream=False, columns=None):
     """
     This function returns all orders filtered by seller
     :param seller_id: id of the seller
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    :param stream: return an iterator that loads orders in batches instead of a list
+    :param columns: names of the order columns and 'product.' prefixed product columns to load, None for all
     """
-    return Order.query.filter_by(seller_id=seller_id).all()
+    order_query = load_order_columns(Order.query, columns).filter_by(seller_id=seller_id)
+
+    return fetch_orders(paginate_orders(order_query, limit, after), stream)
 
 
-def get_orders_by_seller_filtered(seller_id, status):
+def get_orders_by_seller_filtered(seller_id, status, limit=None, after=None, stream=False,
+                                  columns=None):
     """
     This function returns all orders filtered by seller and status
     :param seller_id: id of the seller
     :param status: status of the order
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    :param stream: return an iterator that loads orders in batches instead of a list
+    :param columns: names of the order columns and 'product.' prefixed product columns to load, None for all
     """
-    order_query = Order.query.filter_by(seller_id=seller_id)
+    order_query = load_order_columns(Order.query, columns).filter_by(seller_id=seller_id)
 
     if isinstance(status, Status):
         status = status.name
@@ -76,6 +112,60 @@ def get_orders_by_seller_filtered(seller_id, status):
     if status:
         order_query = filter_orders_by_status(order_query, status)
 
+    return fetch_orders(paginate_orders(order_query, limit, after), stream)
+
+
+def load_order_product(order_query):
+    """
+    This function makes the query load the product name and price of every order in the same joined query
+    :param order_query: query to modify
+    """
+    return order_query.options(joinedload(Order.product).load_only(Product.name, Product.price))
+
+
+def load_order_columns(order_query, columns):
+    """
+    This function makes the query load only the given columns of orders and of their products
+    :param order_query: query to modify
+    :param columns: names of the order columns and 'product.' prefixed product columns to load, None for all
+    """
+    if columns is None:
+        return load_order_product(order_query)
+
+    order_columns = [getattr(Order, column) for column in columns if not column.startswith('product.')]
+    product_columns = [getattr(Product, column[len('product.'):]) for column in columns if column.startswith('product.')]
+
+    order_query = order_query.options(load_only(Order.id, *order_columns))
+    if product_columns:
+        order_query = order_query.options(joinedload(Order.product).load_only(*product_columns))
+
+    return order_query
+
+
+def paginate_orders(order_query, limit, after):
+    """
+    This function restricts the query to the orders following the given order id in id order
+    :param order_query: query to restrict
+    :param limit: maximum number of orders to return
+    :param after: id of the order to return orders after
+    """
+    if after is not None:
+        order_query = order_query.filter(Order.id > after)
+    if limit is not None or after is not None:
+        order_query = order_query.order_by(Order.id).limit(limit)
+    return order_query
+
+
+def fetch_orders(order_query, stream):
+    """
+    This function returns orders of the query as a list or as an iterator over server-side cursor batches.
+    The query is executed on a replica engine if the application has any
+    :param order_query: query to fetch
+    :param stream: return an iterator that loads orders in batches instead of a list
+    """
+    order_query = use_replica(order_query)
+    if stream:
+        return order_query.yield_per(STREAM_BATCH_SIZE)
     return order_query.all()
 
 
@@ -110,13 +200,112 @@ def create_order(quantity, customer_details, status, seller_id, product_id):
                 if status == getattr(Status, name).label:
                     status = name
                     break
+    reserve_inventory({product_id: quantity})
+
     order = Order(quantity=quantity, customer_details=customer_details, status=status, seller_id=seller_id,
                   product_id=product_id)
     db.session.add(order)
+    db.session.flush()
+
+    rollup_service.add_orders(Order.id == order.id)
+    change_product_ordered(order.product_id, get_order_ordered(order))
+    version_service.bump_data_versions([seller_id], [product_id])
+
     db.session.commit()
+
+    product_service.invalidate_ordered_products([product_id])
     return order
 
 
+def create_orders(orders):
+    """
+    This function creates many orders in one transaction with a single multi-row insert
+    :param orders: list of dicts with quantity, customer_details, status, seller_id and product_id of each order
+    """
+    status_names = {member.label: member.name for member in Status}
+    rows = []
+    product_ordered = {}
+    product_quantities = {}
+
+    for order in orders:
+        status = order['status']
+        if isinstance(status, Status):
+            status = status.name
+        status = status_names.get(status, status)
+
+        rows.append({
+            'quantity': order['quantity'],
+            'customer_details': order['customer_details'],
+            'status': status,
+            'seller_id': order['seller_id'],
+            'product_id': order['product_id'],
+        })
+        product_quantities[order['product_id']] = product_quantities.get(order['product_id'], 0) + order['quantity']
+        if status == Status.in_progress.name:
+            product_ordered[order['product_id']] = product_ordered.get(order['product_id'], 0) + order['quantity']
+
+    if not rows:
+        return 0
+
+    reserve_inventory(product_quantities)
+    db.session.execute(insert(Order), rows)
+
+    rollup_service.add_new_orders(rows)
+    change_products_ordered(product_ordered)
+    version_service.bump_data_versions({row['seller_id'] for row in rows}, list(product_quantities))
+
+    db.session.commit()
+
+    product_service.invalidate_ordered_products(list(product_quantities))
+    return len(rows)
+
+
+def update_orders_status(status, order_ids=None, current_status=None, seller_id=None):
+    """
+    This function sets the status of all matching orders with a single update and returns the number of changed orders
+    :param status: new status of the orders
+    :param order_ids: ids of the orders to update, None for any
+    :param current_status: status the orders must have to be updated, None for any
+    :param seller_id: id of the seller the orders must belong to, None for any
+    """
+    status_names = {member.label: member.name for member in Status}
+    if isinstance(status, Status):
+        status = status.name
+    if isinstance(current_status, Status):
+        current_status = current_status.name
+    status = status_names.get(status, status)
+    current_status = status_names.get(current_status, current_status)
+
+    criteria = [Order.status != status]
+    if order_ids is not None:
+        criteria.append(Order.id.in_(order_ids))
+    if current_status is not None:
+        criteria.append(Order.status == current_status)
+    if seller_id is not None:
+        criteria.append(Order.seller_id == seller_id)
+
+    if status == Status.in_progress.name:
+        sign, ordered_criteria = 1, criteria
+    else:
+        sign, ordered_criteria = -1, criteria + [Order.status == Status.in_progress.name]
+    changed_ordered = db.session.query(Order.product_id, func.sum(Order.quantity)).filter(*ordered_criteria).group_by(
+        Order.product_id
+    ).all()
+
+    version_service.bump_data_versions(select(Order.seller_id).where(*criteria),
+                                       [product_id for product_id, _ in changed_ordered] or None)
+    rollup_service.change_orders_status(status, *criteria)
+
+    updated = Order.query.filter(*criteria).update({Order.status: status}, synchronize_session=False)
+
+    change_products_ordered({product_id: sign * ordered for product_id, ordered in changed_ordered})
+
+    db.session.commit()
+
+    product_service.invalidate_ordered_products([product_id for product_id, _ in changed_ordered])
+    return updated
+
+
 def update_order(order_id, quantity=None, customer_details=None, status=None, seller_id=None, product_id=None):
     """
     This function updates order
@@ -131,6 +320,11 @@ def update_order(order_id, quantity=None, customer_details=None, status=None, se
 
     if not order:
         return False
+
+    old_seller_id, old_product_id, old_ordered = order.seller_id, order.product_id, get_order_ordered(order)
+    old_quantity = order.quantity
+    old_rollup = rollup_service.get_order_deltas(Order.id == order_id, sign=-1)
+
     if quantity:
         order.quantity = quantity
     if customer_details:
@@ -156,7 +350,38 @@ def update_order(order_id, quantity=None, customer_details=None, status=None, se
     if product_id:
         order.product_id = product_id
 
+    if order.product_id != old_product_id:
+        reserve_inventory({order.product_id: order.quantity})
+        release_inventory({old_product_id: old_quantity})
+        stock_product_ids = [old_product_id, order.product_id]
+    elif order.quantity > old_quantity:
+        reserve_inventory({order.product_id: order.quantity - old_quantity})
+        stock_product_ids = [order.product_id]
+    elif order.quantity < old_quantity:
+        release_inventory({order.product_id: old_quantity - order.quantity})
+        stock_product_ids = [order.product_id]
+    else:
+        stock_product_ids = []
+
+    db.session.flush()
+
+    rollup_service.change_rollup(old_rollup + rollup_service.get_order_deltas(Order.id == order_id))
+    new_ordered = get_order_ordered(order)
+    if order.product_id != old_product_id:
+        change_product_ordered(old_product_id, -old_ordered)
+        change_product_ordered(order.product_id, new_ordered)
+        changed_product_ids = [product_id for product_id, ordered in ((old_product_id, old_ordered),
+                                                                      (order.product_id, new_ordered)) if ordered]
+    else:
+        change_product_ordered(order.product_id, new_ordered - old_ordered)
+        changed_product_ids = [order.product_id] if new_ordered != old_ordered else []
+    changed_product_ids = list(set(changed_product_ids + stock_product_ids))
+
+    version_service.bump_data_versions({old_seller_id, order.seller_id}, changed_product_ids or None)
+
     db.session.commit()
+
+    product_service.invalidate_ordered_products(changed_product_ids)
     return order
 
 
@@ -170,11 +395,123 @@ def delete_order(order_id):
     if not order:
         return False
 
+    rollup_service.add_orders(Order.id == order_id, sign=-1)
+    change_product_ordered(order.product_id, -get_order_ordered(order))
+    release_inventory({order.product_id: order.quantity})
+    version_service.bump_data_versions([order.seller_id], [order.product_id])
+
     db.session.delete(order)
     db.session.commit()
+
+    product_service.invalidate_ordered_products([order.product_id])
     return True
 
 
+def get_order_ordered(order):
+    """
+    This function returns the quantity the order adds to the ordered quantity of its product
+    :param order: order to check
+    """
+    status = order.status
+    if isinstance(status, str):
+        status = Status[status]
+
+    return order.quantity if status == Status.in_progress else 0
+
+
+def change_products_ordered(product_ordered):
+    """
+    This function changes the ordered quantity counters of many products with one executemany update
+    :param product_ordered: dict of quantities to add to the counters by product id, negative to subtract
+    """
+    if not product_ordered:
+        return
+
+    products = Product.__table__
+    db.session.execute(
+        update(products).where(products.c.id == bindparam('ordered_product_id')).values(
+            ordered_quantity=products.c.ordered_quantity + bindparam('ordered')
+        ),
+        [{'ordered_product_id': product_id, 'ordered': ordered} for product_id, ordered in product_ordered.items()]
+    )
+
+
+def change_product_ordered(product_id, quantity):
+    """
+    This function changes the ordered quantity counter of the product in the current transaction
+    :param product_id: id of the product
+    :param quantity: quantity to add to the counter, negative to subtract
+    """
+    if quantity:
+        Product.query.filter_by(id=product_id).update({Product.ordered_quantity: Product.ordered_quantity + quantity})
+
+
+def get_reserve_statement(product_quantities):
+    """
+    This function returns the statement that takes the quantities from the inventory of the products only if every
+    product has enough left, so it updates fewer rows than there are products when any of them runs out
+    :param product_quantities: dict of the quantities to take by product id
+    """
+    if len(product_quantities) == 1:
+        [(product_id, quantity)] = product_quantities.items()
+        criteria = [Product.id == product_id]
+    else:
+        quantity = case(product_quantities, value=Product.id)
+        criteria = [Product.id.in_(product_quantities)]
+
+    return update(Product).where(*criteria, Product.inventory >= quantity).values(
+        inventory=Product.inventory - quantity
+    ).execution_options(synchronize_session=False)
+
+
+def reserve_inventory(product_quantities):
+    """
+    This function takes the quantities from the inventory of the products with a single conditional update
+    in the current transaction, so concurrent orders can't take the same stock. If any product has not enough left,
+    the transaction is rolled back and OutOfStock is raised with the ids of those products, so it must be called
+    before the other changes of the transaction
+    :param product_quantities: dict of the quantities to take by product id
+    """
+    if not product_quantities:
+        return
+
+    if db.session.execute(get_reserve_statement(product_quantities)).rowcount == len(product_quantities):
+        return
+
+    db.session.rollback()
+    if len(product_quantities) == 1:
+        raise OutOfStock(list(product_quantities))
+
+    # The update took the stock of some products, so it is rolled back and taken again product by product to find out
+    # which products have not enough left
+    out_of_stock = [product_id for product_id, quantity in product_quantities.items()
+                    if not db.session.execute(get_reserve_statement({product_id: quantity})).rowcount]
+    if out_of_stock:
+        db.session.rollback()
+        raise OutOfStock(out_of_stock)
+
+
+def get_release_statement():
+    """
+    This function returns the statement that returns a quantity to the inventory of a product, to be executed with
+    stock_product_id and released parameters
+    """
+    products = Product.__table__
+    return update(products).where(products.c.id == bindparam('stock_product_id')).values(
+        inventory=products.c.inventory + bindparam('released')
+    )
+
+
+def release_inventory(product_quantities):
+    """
+    This function returns the quantities to the inventory of the products in the current transaction
+    :param product_quantities: dict of the quantities to return by product id
+    """
+    if product_quantities:
+        db.session.execute(get_release_statement(), [{'stock_product_id': product_id, 'released': quantity}
+                                                     for product_id, quantity in product_quantities.items()])
+
+
 def get_available_statuses():
     """
     This function returns all available statuses
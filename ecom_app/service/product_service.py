@@ -2,26 +2,48 @@
 This module contains functions to work with products table
 """
 
-from ecom_app.database import db
-from ecom_app.models import Product
+from flask import current_app
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import load_only, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 
+from ecom_app import autocomplete
+from ecom_app.database import db, use_replica
+from ecom_app.models import Product, Order, Status
+from ecom_app.service import rollup_service, search_service, version_service
 
-def get_products():
+
+STREAM_BATCH_SIZE = 1000
+
+# These are the product columns stored in the product cache
+CACHED_PRODUCT_COLUMNS = [column.key for column in Product.__table__.columns]
+
+
+def get_products(limit=None, after=None, stream=False, columns=None):
     """
     This function returns all products
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    :param stream: return an iterator that loads products in batches instead of a list
+    :param columns: names of the product columns to load, None for all
     """
-    return Product.query.all()
+    return fetch_products(paginate_products(load_product_columns(Product.query, columns), limit, after), stream)
 
 
-def get_products_filtered(inventory_from, inventory_to, ordered_from, ordered_to):
+def get_products_filtered(inventory_from, inventory_to, ordered_from, ordered_to, limit=None, after=None,
+                          stream=False, columns=None):
     """
     This function returns all products filtered by inventory and ordered
     :param inventory_from: inventory start range value
     :param inventory_to: inventory end range value
     :param ordered_from: ordered start range value
     :param ordered_to: ordered end range value
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    :param stream: return an iterator that loads products in batches instead of a list
+    :param columns: names of the product columns to load, None for all
     """
-    product_query = Product.query
+    product_query = load_product_columns(Product.query, columns)
 
     if inventory_from or inventory_to:
         product_query = filter_products_by_inventory(product_query, inventory_from, inventory_to)
@@ -29,15 +51,37 @@ def get_products_filtered(inventory_from, inventory_to, ordered_from, ordered_to
     if ordered_from or ordered_to:
         product_query = filter_products_by_ordered(product_query, ordered_from, ordered_to)
 
-    return product_query.all()
+    return fetch_products(paginate_products(product_query, limit, after), stream)
 
 
-def get_product_by_id(product_id):
+def get_product_by_id(product_id, columns=None):
     """
-    This function returns product by id
+    This function returns product by id. Only the products with all their columns are cached
     :param product_id: id of the product
+    :param columns: names of the product columns to load, None for all
+    """
+    cache = get_product_cache()
+    if cache is None or columns is not None:
+        return load_product_columns(Product.query, columns).filter_by(id=product_id).first()
+
+    key = f'product:{product_id}:{cache.get_generation(f"product:{product_id}")}'
+    values = cache.get(key)
+    if values is not None:
+        return load_cached_product(values)
+
+    product = Product.query.filter_by(id=product_id).first()
+    if product:
+        cache.set(key, dump_cached_product(product))
+    return product
+
+
+def get_products_by_ids(product_ids, columns=None):
+    """
+    This function returns products with the given ids in one query
+    :param product_ids: ids of the products
+    :param columns: names of the product columns to load, None for all
     """
-    return Product.query.filter_by(id=product_id).first()
+    return load_product_columns(Product.query, columns).filter(Product.id.in_(product_ids)).all()
 
 
 def get_product_by_name(name):
@@ -48,15 +92,33 @@ def get_product_by_name(name):
     return Product.query.filter_by(name=name).first()
 
 
-def get_products_by_seller(seller_id):
+def get_products_by_seller(seller_id, limit=None, after=None, stream=False, columns=None):
     """
     This function returns all products filtered by seller
     :param seller_id: id of the seller
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    :param stream: return an iterator that loads products in batches instead of a list
+    :param columns: names of the product columns to load, None for all. Only the products with all their columns
+    are cached
     """
-    return Product.query.filter_by(seller_id=seller_id).all()
+    cache = get_product_cache()
+    if cache is None or stream or columns is not None:
+        product_query = load_product_columns(Product.query, columns).filter_by(seller_id=seller_id)
+        return fetch_products(paginate_products(product_query, limit, after), stream)
+
+    key = f'seller_products:{seller_id}:{cache.get_generation(f"seller_products:{seller_id}")}:{limit}:{after}'
+    rows = cache.get(key)
+    if rows is not None:
+        return [load_cached_product(values) for values in rows]
+
+    products = fetch_products(paginate_products(Product.query.filter_by(seller_id=seller_id), limit, after), False)
+    cache.set(key, [dump_cached_product(product) for product in products])
+    return products
 
 
-def get_products_by_seller_filtered(seller_id, inventory_from, inventory_to, ordered_from, ordered_to):
+def get_products_by_seller_filtered(seller_id, inventory_from, inventory_to, ordered_from, ordered_to, limit=None,
+                                    after=None, stream=False, columns=None):
     """
     This function returns all products filtered by seller and inventory and ordered
     :param seller_id: id of the seller
@@ -64,8 +126,12 @@ def get_products_by_seller_filtered(seller_id, inventory_from, inventory_to, ord
     :param inventory_to: inventory end range value
     :param ordered_from: ordered start range value
     :param ordered_to: ordered end range value
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    :param stream: return an iterator that loads products in batches instead of a list
+    :param columns: names of the product columns to load, None for all
     """
-    product_query = Product.query.filter_by(seller_id=seller_id)
+    product_query = load_product_columns(Product.query, columns).filter_by(seller_id=seller_id)
 
     if inventory_from or inventory_to:
         product_query = filter_products_by_inventory(product_query, inventory_from, inventory_to)
@@ -73,6 +139,114 @@ def get_products_by_seller_filtered(seller_id, inventory_from, inventory_to, ord
     if ordered_from or ordered_to:
         product_query = filter_products_by_ordered(product_query, ordered_from, ordered_to)
 
+    return fetch_products(paginate_products(product_query, limit, after), stream)
+
+
+def get_product_cache():
+    """
+    This function returns the product cache of the application, None if it is disabled
+    """
+    return current_app.extensions.get('product_cache')
+
+
+def dump_cached_product(product):
+    """
+    This function returns the values of the product stored in the product cache
+    :param product: product to store
+    """
+    return {column: getattr(product, column) for column in CACHED_PRODUCT_COLUMNS}
+
+
+def load_cached_product(values):
+    """
+    This function returns the product of the values stored in the product cache without a query. A product
+    the session has already loaded is returned as it is, otherwise the product is a detached copy that is not added
+    to the session, so the queries of the session never return the cached values
+    :param values: stored values of the product
+    """
+    product = db.session.identity_map.get(identity_key(Product, values['id']))
+    if product is not None:
+        return product
+
+    product = Product(**values)
+    make_transient_to_detached(product)
+    return product
+
+
+def get_cache_keys(product_ids=(), seller_ids=()):
+    """
+    This function returns the keys of the product cache generations of the products and the listings of the sellers
+    :param product_ids: ids of the products
+    :param seller_ids: ids of the sellers
+    """
+    return [f'product:{product_id}' for product_id in product_ids] + \
+        [f'seller_products:{seller_id}' for seller_id in seller_ids]
+
+
+def invalidate_cached_products(product_ids=(), seller_ids=()):
+    """
+    This function invalidates the cached products and listings of the sellers, after the write changing them
+    is committed
+    :param product_ids: ids of the changed products
+    :param seller_ids: ids of the sellers whose listings changed
+    """
+    cache = get_product_cache()
+    if cache is not None:
+        cache.delete(*get_cache_keys(product_ids, {seller_id for seller_id in seller_ids if seller_id is not None}))
+
+
+def invalidate_ordered_products(product_ids):
+    """
+    This function invalidates the cached products whose ordered quantity or inventory changed and the listings
+    of their sellers, after the write changing them is committed
+    :param product_ids: ids of the changed products
+    """
+    cache = get_product_cache()
+    if cache is None or not product_ids:
+        return
+
+    seller_ids = [seller_id for seller_id, in db.session.query(Product.seller_id).filter(
+        Product.id.in_(product_ids)
+    ).distinct()]
+    invalidate_cached_products(product_ids, seller_ids)
+
+
+def load_product_columns(product_query, columns):
+    """
+    This function makes the query load only the given columns of products
+    :param product_query: query to modify
+    :param columns: names of the product columns to load, None for all
+    """
+    if columns is None:
+        return product_query
+
+    return product_query.options(load_only(Product.id, *[getattr(Product, column) for column in columns]))
+
+
+def paginate_products(product_query, limit, after):
+    """
+    This function restricts the query to the products following the given product id in id order
+    :param product_query: query to restrict
+    :param limit: maximum number of products to return
+    :param after: id of the product to return products after
+    """
+    if after is not None:
+        product_query = product_query.filter(Product.id > after)
+    if limit is not None or after is not None:
+        product_query = product_query.order_by(Product.id).limit(limit)
+    return product_query
+
+
+def fetch_products(product_query, stream):
+    """
+    This function returns products of the query as a list or as an iterator over server-side cursor batches.
+    The query is executed on a replica engine if the application has any
+    :param product_query: query to fetch
+    :param stream: return an iterator that loads products in batches instead of a list
+    """
+    product_query = use_replica(product_query)
+    if stream:
+        return product_query.yield_per(STREAM_BATCH_SIZE)
     return product_query.all()
 
 
@@ -121,10 +295,53 @@ def create_product(name, description, price, inventory, seller_id):
     """
     product = Product(name=name, description=description, price=price, inventory=inventory, seller_id=seller_id)
     db.session.add(product)
+    version_service.bump_data_versions([seller_id])
+    db.session.flush()
+    search_service.index_products([product.id])
     db.session.commit()
+
+    invalidate_cached_products(seller_ids=[seller_id])
+    autocomplete.index_product(product.id, name, seller_id)
     return product
 
 
+def upsert_products(products, seller_id):
+    """
+    This function creates or updates products of the seller by name in one transaction
+    and returns the numbers of created and updated products and the names used by other sellers
+    :param products: list of dicts with name, description, price and inventory of each product
+    :param seller_id: id of the seller
+    """
+    products_by_name = {product['name']: product for product in products}
+
+    existing = db.session.query(Product.id, Product.name, Product.seller_id).filter(
+        Product.name.in_(products_by_name)
+    ).all()
+
+    taken_names = {name for _, name, owner_id in existing if owner_id != seller_id}
+    updates = [dict(products_by_name[name], id=product_id) for product_id, name, owner_id in existing
+               if owner_id == seller_id]
+    existing_names = {name for _, name, _ in existing}
+    inserts = [dict(product, seller_id=seller_id) for name, product in products_by_name.items()
+               if name not in existing_names]
+
+    if inserts:
+        db.session.execute(insert(Product), inserts)
+    if updates:
+        db.session.execute(update(Product), updates)
+        rollup_service.change_revenue({product['id']: product['price'] for product in updates if 'price' in product})
+    if inserts or updates:
+        version_service.bump_data_versions([seller_id], order_product_ids=[product['id'] for product in updates])
+        search_service.index_products(select(Product.id).where(Product.name.in_(products_by_name)))
+
+    db.session.commit()
+
+    if inserts or updates:
+        invalidate_cached_products([product['id'] for product in updates], [seller_id])
+        autocomplete.reset_product_names([seller_id])
+    return len(inserts), len(updates), taken_names
+
+
 def update_product(product_id, name=None, description=None, price=None, inventory=None, seller_id=None):
     """
     This function updates a product
@@ -135,23 +352,34 @@ def update_product(product_id, name=None, description=None, price=None, inventor
     :param inventory: inventory of the product
     :param seller_id: id of the seller
     """
-    product = Product.query.filter_by(id=product_id).first()
+    # The product is loaded again even if the session has it, so that the write starts from its current values
+    product = Product.query.filter_by(id=product_id).populate_existing().first()
 
     if not product:
         return False
 
+    seller_ids = {product.seller_id, seller_id or product.seller_id}
+    version_service.bump_data_versions(seller_ids, order_product_ids=[product_id] if name or price else None)
+
     if name:
         product.name = name
     if description:
         product.description = description
     if price:
         product.price = price
+        rollup_service.change_revenue({product_id: price})
     if inventory:
         product.inventory = inventory
     if seller_id:
         product.seller_id = seller_id
+    if name or description:
+        search_service.index_products([product_id])
 
     db.session.commit()
+
+    invalidate_cached_products([product_id], seller_ids)
+    if name or seller_id:
+        autocomplete.index_product(product_id, product.name, product.seller_id)
     return product
 
 
@@ -160,11 +388,45 @@ def delete_product(product_id):
     This function deletes a product
     :param product_id: id of the product
     """
-    product = Product.query.filter_by(id=product_id).first()
+    # The product is loaded again even if the session has it, so that the write starts from its current values
+    product = Product.query.filter_by(id=product_id).populate_existing().first()
 
     if not product:
         return False
 
+    version_service.bump_data_versions([product.seller_id], order_product_ids=[product_id])
+    rollup_service.remove_orders(product_ids=[product_id])
+    search_service.unindex_products([product_id])
+
     db.session.delete(product)
     db.session.commit()
+
+    invalidate_cached_products([product_id], [product.seller_id])
+    autocomplete.unindex_products([product_id])
     return True
+
+
+def rebuild_ordered_quantity(check_only=False):
+    """
+    This function compares the ordered quantity counters of products with the orders table and fixes them
+    :param check_only: only report mismatched counters without fixing them
+    """
+    ordered_subquery = db.session.query(
+        Order.product_id, func.sum(Order.quantity).label('ordered')
+    ).filter(Order.status == Status.in_progress).group_by(Order.product_id).subquery()
+    actual_ordered = func.coalesce(ordered_subquery.c.ordered, 0)
+
+    mismatches = db.session.query(Product.id, Product.ordered_quantity, actual_ordered).outerjoin(
+        ordered_subquery, ordered_subquery.c.product_id == Product.id
+    ).filter(Product.ordered_quantity != actual_ordered).order_by(Product.id).all()
+
+    if not check_only:
+        for product_id, _, ordered in mismatches:
+            Product.query.filter_by(id=product_id).update({Product.ordered_quantity: ordered})
+        if mismatches:
+            version_service.bump_data_versions(product_ids=[product_id for product_id, _, _ in mismatches])
+        db.session.commit()
+
+        invalidate_ordered_products([product_id for product_id, _, _ in mismatches])
+
+    return mismatches
@@ -0,0 +1,284 @@
+"""
+This module contains functions to work with order_daily_rollup table. The order_service writes add the changes
+of the quantity and revenue of their orders to the rollup in their transaction, so that sales reports read
+the rollup instead of every order
+"""
+
+from sqlalchemy import Date, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from ecom_app.database import db, use_replica
+from ecom_app.models import Order, OrderDailyRollup, Product, Status
+
+
+# These are the insert constructs of the dialects with an upsert clause
+UPSERT_INSERTS = {
+    'mysql': mysql.insert,
+    'mariadb': mysql.insert,
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+# These are the columns the sales report can be grouped by
+SALES_GROUPS = {
+    'day': OrderDailyRollup.day,
+    'product': OrderDailyRollup.product_id,
+    'seller': OrderDailyRollup.seller_id,
+    'status': OrderDailyRollup.status,
+}
+
+# These are the names of the grouped columns in the rows of the sales report
+SALES_GROUP_FIELDS = {
+    'day': 'day',
+    'product': 'product_id',
+    'seller': 'seller_id',
+    'status': 'status',
+}
+
+
+def get_order_day():
+    """
+    This function returns the expression of the day of an order
+    """
+    return func.date(Order.date, type_=Date)
+
+
+def get_orders_select(*criteria):
+    """
+    This function returns the select of the quantity and revenue of the orders per seller, product, day and status
+    :param criteria: criteria of the orders
+    """
+    return select(
+        Order.seller_id, Order.product_id, get_order_day(), Order.status, func.sum(Order.quantity),
+        func.sum(Order.quantity * Product.price)
+    ).join(Product, Product.id == Order.product_id).where(*criteria).group_by(
+        Order.seller_id, Order.product_id, get_order_day(), Order.status
+    )
+
+
+def get_deltas(rows, sign=1, status=None):
+    """
+    This function returns the changes of the rollup rows from the rows of the orders select
+    :param rows: rows of the orders select
+    :param sign: 1 to add the orders to the rollup, -1 to subtract them
+    :param status: status to add the orders under instead of their own, None to keep it
+    """
+    return [{'seller_id': seller_id, 'product_id': product_id, 'day': day, 'status': status or order_status,
+             'quantity': sign * quantity, 'revenue': sign * revenue}
+            for seller_id, product_id, day, order_status, quantity, revenue in rows]
+
+
+def get_status_deltas(rows, status):
+    """
+    This function returns the changes of the rollup rows that move the orders of the rows of the orders select
+    to another status
+    :param rows: rows of the orders select
+    :param status: new status of the orders
+    """
+    return get_deltas(rows, -1) + get_deltas(rows, status=status)
+
+
+def merge_deltas(deltas):
+    """
+    This function returns the changes of the rollup rows with one change per row, without the empty changes
+    :param deltas: changes of the rollup rows
+    """
+    merged = {}
+    for delta in deltas:
+        status = delta['status'].name if isinstance(delta['status'], Status) else delta['status']
+        key = (delta['seller_id'], delta['product_id'], delta['day'], status)
+        quantity, revenue = merged.get(key, (0, 0))
+        merged[key] = (quantity + delta['quantity'], revenue + delta['revenue'])
+
+    return [{'seller_id': seller_id, 'product_id': product_id, 'day': day, 'status': status,
+             'quantity': quantity, 'revenue': revenue}
+            for (seller_id, product_id, day, status), (quantity, revenue) in merged.items() if quantity or revenue]
+
+
+def get_upsert_statement(dialect_name):
+    """
+    This function returns the statement that adds changes to the rollup rows, creating the missing ones
+    :param dialect_name: name of the dialect of the database
+    """
+    if dialect_name not in UPSERT_INSERTS:
+        raise ValueError(f'No upsert for {dialect_name} databases')
+
+    rollup = OrderDailyRollup.__table__
+    statement = UPSERT_INSERTS[dialect_name](rollup)
+
+    if dialect_name in ('mysql', 'mariadb'):
+        return statement.on_duplicate_key_update(quantity=rollup.c.quantity + statement.inserted.quantity,
+                                                 revenue=rollup.c.revenue + statement.inserted.revenue)
+
+    return statement.on_conflict_do_update(
+        index_elements=[column for column in rollup.primary_key],
+        set_={'quantity': rollup.c.quantity + statement.excluded.quantity,
+              'revenue': rollup.c.revenue + statement.excluded.revenue}
+    )
+
+
+def get_revenue_statement():
+    """
+    This function returns the statement that recomputes the revenue of the rollup rows of a product from its price,
+    to be executed with rollup_product_id and price parameters
+    """
+    rollup = OrderDailyRollup.__table__
+    return update(rollup).where(rollup.c.product_id == bindparam('rollup_product_id')).values(
+        revenue=rollup.c.quantity * bindparam('price')
+    )
+
+
+def get_remove_statement(seller_ids=None, product_ids=None):
+    """
+    This function returns the statement that removes the rollup rows of deleted sellers and products
+    :param seller_ids: ids of the sellers whose orders are deleted
+    :param product_ids: ids of the products whose orders are deleted, or a select of them
+    """
+    criteria = []
+    if seller_ids is not None:
+        criteria.append(OrderDailyRollup.seller_id.in_(seller_ids))
+    if product_ids is not None:
+        criteria.append(OrderDailyRollup.product_id.in_(product_ids))
+
+    return delete(OrderDailyRollup).where(or_(*criteria)).execution_options(synchronize_session=False)
+
+
+def get_new_orders_deltas(orders, rows):
+    """
+    This function returns the changes of the rollup rows that add orders inserted today
+    :param orders: dicts with quantity, status, seller_id and product_id of each order
+    :param rows: product id, price and current day rows of the products of the orders
+    """
+    prices = {product_id: (price, day) for product_id, price, day in rows}
+
+    return merge_deltas({'seller_id': order['seller_id'], 'product_id': order['product_id'],
+                         'day': prices[order['product_id']][1], 'status': order['status'],
+                         'quantity': order['quantity'], 'revenue': order['quantity'] * prices[order['product_id']][0]}
+                        for order in orders)
+
+
+def get_new_orders_select(product_ids):
+    """
+    This function returns the select of the prices of the products and of the current day, the day of the orders
+    inserted now by the server default of their date
+    :param product_ids: ids of the products of the orders
+    """
+    return select(Product.id, Product.price, func.date(func.now(), type_=Date)).where(Product.id.in_(product_ids))
+
+
+def change_rollup(deltas):
+    """
+    This function adds changes to the rollup rows in the current transaction
+    :param deltas: changes of the rollup rows
+    """
+    deltas = merge_deltas(deltas)
+    if deltas:
+        db.session.execute(get_upsert_statement(db.engine.dialect.name), deltas)
+
+
+def get_order_deltas(*criteria, sign=1):
+    """
+    This function returns the changes of the rollup rows that add or subtract the orders in the current transaction
+    :param criteria: criteria of the orders
+    :param sign: 1 to add the orders to the rollup, -1 to subtract them
+    """
+    return get_deltas(db.session.execute(get_orders_select(*criteria)).all(), sign)
+
+
+def add_orders(*criteria, sign=1):
+    """
+    This function adds the orders to the rollup, or subtracts them, in the current transaction
+    :param criteria: criteria of the orders
+    :param sign: 1 to add the orders to the rollup, -1 to subtract them
+    """
+    change_rollup(get_order_deltas(*criteria, sign=sign))
+
+
+def add_new_orders(orders):
+    """
+    This function adds orders inserted without their ids being known to the rollup in the current transaction
+    :param orders: dicts with quantity, status, seller_id and product_id of each order
+    """
+    if orders:
+        rows = db.session.execute(get_new_orders_select({order['product_id'] for order in orders})).all()
+        change_rollup(get_new_orders_deltas(orders, rows))
+
+
+def change_orders_status(status, *criteria):
+    """
+    This function moves the orders to another status in the rollup in the current transaction,
+    before the orders are updated
+    :param status: new status of the orders
+    :param criteria: criteria of the orders
+    """
+    change_rollup(get_status_deltas(db.session.execute(get_orders_select(*criteria)).all(), status))
+
+
+def change_revenue(product_prices):
+    """
+    This function recomputes the revenue of the rollup rows of the products in the current transaction
+    :param product_prices: dict of the new prices by product id
+    """
+    if product_prices:
+        db.session.execute(get_revenue_statement(), [{'rollup_product_id': product_id, 'price': price}
+                                                     for product_id, price in product_prices.items()])
+
+
+def remove_orders(seller_ids=None, product_ids=None):
+    """
+    This function removes the rollup rows of deleted sellers and products in the current transaction
+    :param seller_ids: ids of the sellers whose orders are deleted
+    :param product_ids: ids of the products whose orders are deleted, or a select of them
+    """
+    db.session.execute(get_remove_statement(seller_ids, product_ids))
+
+
+def insert_orders(*criteria):
+    """
+    This function inserts the rollup rows of orders whose sellers, products, days and statuses have no rollup rows yet
+    with a single insert from select in the current transaction
+    :param criteria: criteria of the orders
+    """
+    db.session.execute(insert(OrderDailyRollup).from_select(
+        ['seller_id', 'product_id', 'day', 'status', 'quantity', 'revenue'], get_orders_select(*criteria)
+    ))
+
+
+def rebuild_rollup():
+    """
+    This function regenerates the rollup from the orders table and returns the number of rollup rows
+    """
+    rollup = OrderDailyRollup.__table__
+    db.session.execute(delete(rollup))
+    insert_orders()
+    db.session.commit()
+
+    return db.session.query(func.count()).select_from(rollup).scalar()
+
+
+def get_sales(date_from=None, date_to=None, group_by=('day',), seller_id=None, status=None):
+    """
+    This function returns dicts of the grouped columns and the quantity and revenue of the orders, read from
+    the rollup on a replica engine if the application has any
+    :param date_from: first day of the report, None for no limit
+    :param date_to: last day of the report, None for no limit
+    :param group_by: names of the columns of SALES_GROUPS to group by
+    :param seller_id: id of the seller, None for all sellers
+    :param status: status of the orders, None for all statuses
+    """
+    group_columns = [SALES_GROUPS[group] for group in group_by]
+    sales_query = select(*group_columns, func.sum(OrderDailyRollup.quantity), func.sum(OrderDailyRollup.revenue))
+
+    if date_from is not None:
+        sales_query = sales_query.where(OrderDailyRollup.day >= date_from)
+    if date_to is not None:
+        sales_query = sales_query.where(OrderDailyRollup.day <= date_to)
+    if seller_id is not None:
+        sales_query = sales_query.where(OrderDailyRollup.seller_id == seller_id)
+    if status is not None:
+        sales_query = sales_query.where(OrderDailyRollup.status == status)
+
+    sales_query = sales_query.where(OrderDailyRollup.quantity != 0).group_by(*group_columns).order_by(*group_columns)
+
+    return [dict(zip([SALES_GROUP_FIELDS[group] for group in group_by] + ['quantity', 'revenue'], row))
+            for row in db.session.execute(use_replica(sales_query))]
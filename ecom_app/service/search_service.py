@@ -0,0 +1,138 @@
+"""
+This module contains functions to search products by the words of their names and descriptions. Searches use
+the FTS5 table of products on SQLite, which the product_service writes keep in sync, and the FULLTEXT index
+of products on MySQL, which the database keeps in sync
+"""
+
+import re
+
+from sqlalchemy import and_, column, delete, func, insert, literal_column, or_, select, table
+from sqlalchemy.dialects.mysql import match
+
+from ecom_app.database import db, use_replica
+from ecom_app.models import Product
+
+
+SEARCH_PAGE_LIMIT = 20
+
+# This is the FTS5 table of the names and descriptions of products, its rowids are the ids of the products
+products_fts = table('products_fts', column('rowid'), column('name'), column('description'))
+
+
+def get_search_words(text):
+    """
+    This function returns the words of the search text, the characters other than letters and digits are ignored
+    :param text: search text
+    """
+    return re.findall(r'\w+', text or '')
+
+
+def get_search_select(dialect_name, words):
+    """
+    This function returns the select of the ids and relevance scores of the products whose names or descriptions
+    contain all the words or words starting with them. Higher scores are more relevant
+    :param dialect_name: name of the dialect of the database
+    :param words: words to search
+    """
+    if dialect_name == 'sqlite':
+        query = ' '.join(f'"{word}"*' for word in words)
+        return select(products_fts.c.rowid.label('id'),
+                      (-func.bm25(literal_column('products_fts'))).label('score')).where(
+            literal_column('products_fts').op('MATCH')(query)
+        )
+
+    if dialect_name in ('mysql', 'mariadb'):
+        score = match(Product.name, Product.description, against=' '.join(f'+{word}*' for word in words))
+        score = score.in_boolean_mode()
+        return select(Product.id.label('id'), score.label('score')).where(score > 0)
+
+    raise ValueError(f'No full-text search for {dialect_name} databases')
+
+
+def get_results_select(dialect_name, words, seller_id=None, limit=SEARCH_PAGE_LIMIT, after=None):
+    """
+    This function returns the select of the products found by the search with their scores, most relevant first
+    :param dialect_name: name of the dialect of the database
+    :param words: words to search
+    :param seller_id: id of the seller of the products, None for all sellers
+    :param limit: maximum number of products to return
+    :param after: score and id of the product to return products after
+    """
+    found = get_search_select(dialect_name, words).subquery()
+    results_query = select(Product, found.c.score).join(found, found.c.id == Product.id)
+
+    if seller_id is not None:
+        results_query = results_query.where(Product.seller_id == seller_id)
+    if after is not None:
+        after_score, after_id = after
+        results_query = results_query.where(or_(found.c.score < after_score,
+                                                and_(found.c.score == after_score, Product.id > after_id)))
+
+    return results_query.order_by(found.c.score.desc(), Product.id).limit(limit)
+
+
+def search_products(text, seller_id=None, limit=SEARCH_PAGE_LIMIT, after=None):
+    """
+    This function returns the products found by the search text with their relevance scores, most relevant first.
+    The search is executed on a replica engine if the application has any
+    :param text: search text
+    :param seller_id: id of the seller of the products, None for all sellers
+    :param limit: maximum number of products to return
+    :param after: score and id of the product to return products after
+    """
+    words = get_search_words(text)
+    if not words:
+        return []
+
+    results_query = get_results_select(db.engine.dialect.name, words, seller_id, limit, after)
+    return [(product, score) for product, score in db.session.execute(use_replica(results_query))]
+
+
+def get_index_statements(dialect_name, product_ids, reindex=True):
+    """
+    This function returns the statements that update the full-text index of the products
+    :param dialect_name: name of the dialect of the database
+    :param product_ids: ids of the products or a select of them
+    :param reindex: whether to index the current names and descriptions of the products, False to only remove them
+    """
+    if dialect_name != 'sqlite':
+        return []
+
+    statements = [delete(products_fts).where(products_fts.c.rowid.in_(product_ids))]
+    if reindex:
+        statements.append(insert(products_fts).from_select(
+            ['rowid', 'name', 'description'],
+            select(Product.id, Product.name, Product.description).where(Product.id.in_(product_ids))
+        ))
+    return statements
+
+
+def index_products(product_ids):
+    """
+    This function indexes the current names and descriptions of the products in the current transaction
+    :param product_ids: ids of the products or a select of them
+    """
+    db.session.flush()
+    for statement in get_index_statements(db.engine.dialect.name, product_ids):
+        db.session.execute(statement)
+
+
+def unindex_products(product_ids):
+    """
+    This function removes the products from the full-text index in the current transaction
+    :param product_ids: ids of the products or a select of them
+    """
+    for statement in get_index_statements(db.engine.dialect.name, product_ids, reindex=False):
+        db.session.execute(statement)
+
+
+def rebuild_index():
+    """
+    This function regenerates the full-text index from the products table and returns the number of indexed products
+    """
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute(delete(products_fts))
+        index_products(select(Product.id))
+    db.session.commit()
+
+    return db.session.query(func.count(Product.id)).scalar()
@@ -0,0 +1,142 @@
+"""
+This module contains functions to fill the database with a synthetic dataset of sellers, products and orders
+"""
+
+import bisect
+import itertools
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, update, bindparam
+from werkzeug.security import generate_password_hash
+
+from ecom_app.database import db
+from ecom_app.models import Seller, Product, Order, Status
+from ecom_app.service import rollup_service, search_service
+
+
+SEED_BATCH_SIZE = 10000
+
+# These are the quantities of the orders and how often each of them occurs
+ORDER_QUANTITIES = [1, 2, 3, 4, 5, 10]
+ORDER_QUANTITY_WEIGHTS = [55, 20, 10, 6, 5, 4]
+ORDER_QUANTITY_CUM_WEIGHTS = list(itertools.accumulate(ORDER_QUANTITY_WEIGHTS))
+
+
+def get_next_id(model):
+    """
+    This function returns the id following the largest id of the table of the model
+    :param model: model of the table
+    """
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def insert_rows(table, rows, batch_size):
+    """
+    This function inserts the rows into the table in batches, each batch with a multi-row insert in its own transaction
+    :param table: table to insert into
+    :param rows: iterable of dicts with the values of each row
+    :param batch_size: number of rows to insert in one transaction
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        db.session.execute(insert(table), batch)
+        db.session.commit()
+
+
+def get_popularity(count, exponent):
+    """
+    This function returns the cumulative Zipfian weights of the ranks of the given number of items
+    :param count: number of items
+    :param exponent: exponent of the Zipfian distribution, larger values concentrate the weight on the first ranks
+    """
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def seed(sellers, products, orders, random_seed=0, years=3, in_progress_share=0.1, zipf_exponent=1.1, end=None,
+         password='password', batch_size=SEED_BATCH_SIZE):
+    """
+    This function adds synthetic sellers, products and orders to the database and returns the numbers of added rows.
+    Products are sold by random sellers and ordered with a Zipfian popularity, orders are dated over the given years
+    with more orders in recent months, and the ordered quantity counters of the products and the daily sales rollup
+    are kept up to date.
+    The same arguments always generate the same dataset
+    :param sellers: number of sellers to add
+    :param products: number of products to add
+    :param orders: number of orders to add
+    :param random_seed: seed of the random generator
+    :param years: number of years before the end date the orders are spread over
+    :param in_progress_share: share of the orders that are in progress, the others are complete
+    :param zipf_exponent: exponent of the Zipfian popularity of the products
+    :param end: date and time of the newest order, the start of the current day by default
+    :param password: password of the added sellers
+    :param batch_size: number of rows to insert in one transaction
+    """
+    if orders and not products or products and not sellers:
+        raise ValueError('Products need sellers and orders need products')
+
+    rng = random.Random(random_seed)
+    end = end or datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    span = timedelta(days=365 * years).total_seconds()
+
+    first_seller_id, first_product_id = get_next_id(Seller), get_next_id(Product)
+    seller_ids = range(first_seller_id, first_seller_id + sellers)
+    product_ids = range(first_product_id, first_product_id + products)
+
+    password = generate_password_hash(password, method='sha256')
+    insert_rows(Seller.__table__, ({
+        'id': seller_id, 'name': f'Seeded seller {seller_id}', 'email': f'seeded{seller_id}@example.com',
+        'phone': f'+38096{seller_id:07d}', 'password': password, 'is_admin': False,
+    } for seller_id in seller_ids), batch_size)
+
+    product_sellers = {product_id: rng.choice(seller_ids) for product_id in product_ids}
+    product_prices = {product_id: rng.randint(1, 1000) for product_id in product_ids}
+    insert_rows(Product.__table__, ({
+        'id': product_id, 'name': f'Seeded product {product_id}', 'description': f'Description of product {product_id}',
+        'price': product_prices[product_id], 'inventory': rng.randint(0, 1000), 'ordered_quantity': 0,
+        'seller_id': product_sellers[product_id],
+    } for product_id in product_ids), batch_size)
+
+    ranked_product_ids = list(product_ids)
+    rng.shuffle(ranked_product_ids)
+    popularity = get_popularity(products, zipf_exponent)
+    product_ordered = {}
+
+    def generate_orders():
+        for _ in range(orders):
+            product_id = ranked_product_ids[bisect.bisect(popularity, rng.random() * popularity[-1])]
+            quantity = ORDER_QUANTITIES[bisect.bisect(ORDER_QUANTITY_CUM_WEIGHTS,
+                                                      rng.random() * ORDER_QUANTITY_CUM_WEIGHTS[-1])]
+            status = Status.in_progress if rng.random() < in_progress_share else Status.complete
+            if status == Status.in_progress:
+                product_ordered[product_id] = product_ordered.get(product_id, 0) + quantity
+
+            yield {
+                'date': end - timedelta(seconds=int(span * (1 - rng.random() ** 0.5))),
+                'quantity': quantity,
+                'customer_details': f'Customer {rng.randrange(1000000)}',
+                'status': status,
+                'seller_id': product_sellers[product_id],
+                'product_id': product_id,
+            }
+
+    insert_rows(Order.__table__, generate_orders(), batch_size)
+
+    products_table = Product.__table__
+    ordered_rows = [{'ordered_product_id': product_id, 'ordered': ordered}
+                    for product_id, ordered in product_ordered.items()]
+    for start in range(0, len(ordered_rows), batch_size):
+        db.session.execute(
+            update(products_table).where(products_table.c.id == bindparam('ordered_product_id')).values(
+                ordered_quantity=bindparam('ordered')
+            ),
+            ordered_rows[start:start + batch_size]
+        )
+    rollup_service.insert_orders(Order.product_id >= first_product_id)
+    search_service.index_products(select(Product.id).where(Product.id >= first_product_id))
+    db.session.commit()
+
+    return {'sellers': sellers, 'products': products, 'orders': orders}
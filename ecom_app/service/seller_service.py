@@ -2,31 +2,60 @@
 This module contains functions to work with sellers table
 """
 
-from ecom_app.database import db
-from ecom_app.models import Seller
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only
 
+from ecom_app import autocomplete, principal, tokens
+from ecom_app.database import db, use_replica
+from ecom_app.models import Seller, Product, Order, Status
+from ecom_app.service import order_service, product_service, rollup_service, search_service, version_service
 
-def get_sellers():
+
+def get_sellers(limit=None, after=None, columns=None):
     """
-    This function returns all sellers
+    This function returns all sellers, read from a replica engine if the application has any
+    :param limit: maximum number of sellers to return
+    :param after: id of the seller to return sellers after
+    :param columns: names of the seller columns to load, None for all
     """
-    return Seller.query.all()
+    seller_query = load_seller_columns(Seller.query, columns)
+
+    if after is not None:
+        seller_query = seller_query.filter(Seller.id > after)
+    if limit is not None or after is not None:
+        seller_query = seller_query.order_by(Seller.id).limit(limit)
+
+    return use_replica(seller_query).all()
 
 
-def get_seller_by_id(seller_id):
+def get_seller_by_id(seller_id, columns=None):
     """
     This function returns seller by id
     :param seller_id: id of the seller
+    :param columns: names of the seller columns to load, None for all
     """
-    return Seller.query.filter_by(id=seller_id).first()
+    return load_seller_columns(Seller.query, columns).filter_by(id=seller_id).first()
+
+
+def load_seller_columns(seller_query, columns):
+    """
+    This function makes the query load only the given columns of sellers
+    :param seller_query: query to modify
+    :param columns: names of the seller columns to load, None for all
+    """
+    if columns is None:
+        return seller_query
+
+    return seller_query.options(load_only(Seller.id, *[getattr(Seller, column) for column in columns]))
 
 
 def get_seller_by_email(email):
     """
-    This function returns seller by email
+    This function returns seller by email, read from a replica engine if the application has any
     :param email: email of the seller
     """
-    return Seller.query.filter_by(email=email).first()
+    return use_replica(Seller.query.filter_by(email=email)).first()
 
 
 def create_seller(name, email, phone, password, is_admin):
@@ -72,6 +101,10 @@ def update_seller(seller_id, name=None, email=None, phone=None, password=None, i
         seller.is_admin = is_admin
 
     db.session.commit()
+
+    principal.invalidate_principal(seller_id)
+    if password or is_admin:
+        tokens.revoke_seller_tokens(current_app, seller_id)
     return seller
 
 
@@ -85,6 +118,30 @@ def delete_seller(seller_id):
     if not seller:
         return False
 
+    seller_ordered = db.session.query(Order.product_id, func.sum(Order.quantity)).filter(
+        Order.seller_id == seller_id, Order.status == Status.in_progress
+    ).group_by(Order.product_id).all()
+    for product_id, ordered in seller_ordered:
+        order_service.change_product_ordered(product_id, -ordered)
+    # The orders of the seller on the products of other sellers are deleted with it, so their quantities are
+    # returned to the inventory of those products
+    seller_reserved = dict(db.session.query(Order.product_id, func.sum(Order.quantity)).join(Order.product).filter(
+        Order.seller_id == seller_id, Product.seller_id != seller_id
+    ).group_by(Order.product_id).all())
+    order_service.release_inventory(seller_reserved)
+    changed_product_ids = list({*[product_id for product_id, _ in seller_ordered], *seller_reserved})
+    version_service.bump_data_versions(product_ids=changed_product_ids,
+                                       order_product_ids=select(Product.id).where(Product.seller_id == seller_id))
+    seller_product_ids = [product.id for product in seller.products]
+    rollup_service.remove_orders([seller_id], seller_product_ids)
+    search_service.unindex_products(seller_product_ids)
+
     db.session.delete(seller)
     db.session.commit()
+
+    principal.invalidate_principal(seller_id)
+    tokens.revoke_seller_tokens(current_app, seller_id)
+    product_service.invalidate_cached_products(seller_product_ids, [seller_id])
+    autocomplete.unindex_products(seller_product_ids)
+    product_service.invalidate_ordered_products(list(seller_reserved))
     return True
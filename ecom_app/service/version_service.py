@@ -0,0 +1,70 @@
+"""
+This module contains functions to work with the data versions of sellers. The data version of a seller changes
+in the transaction of every write that changes the products or orders the seller sees, so that the REST API can tell
+whether a listing changed without loading it. The writes add rows to the data_versions table, which are pruned
+by the prune_data_versions command
+"""
+
+from sqlalchemy import delete, func, insert, select, or_
+
+from ecom_app.database import db, use_replica
+from ecom_app.models import DataVersion, Seller, Product, Order
+
+
+def get_bump_statement(seller_ids=None, product_ids=None, order_product_ids=None):
+    """
+    This function returns the statement that changes the data versions of the sellers, None if there are none
+    :param seller_ids: ids of the sellers or a select of them
+    :param product_ids: ids of the products whose sellers see a change
+    :param order_product_ids: ids of the products whose orders are seen by their sellers with a change
+    """
+    criteria = []
+    if seller_ids is not None:
+        criteria.append(Seller.id.in_(seller_ids))
+    if product_ids is not None:
+        criteria.append(Seller.id.in_(select(Product.seller_id).where(Product.id.in_(product_ids))))
+    if order_product_ids is not None:
+        criteria.append(Seller.id.in_(select(Order.seller_id).where(Order.product_id.in_(order_product_ids))))
+
+    if not criteria:
+        return None
+
+    return insert(DataVersion).from_select(['seller_id'], select(Seller.id).where(or_(*criteria)))
+
+
+def bump_data_versions(seller_ids=None, product_ids=None, order_product_ids=None):
+    """
+    This function changes the data versions of the sellers in the current transaction
+    :param seller_ids: ids of the sellers or a select of them
+    :param product_ids: ids of the products whose sellers see a change
+    :param order_product_ids: ids of the products whose orders are seen by their sellers with a change
+    """
+    statement = get_bump_statement(seller_ids, product_ids, order_product_ids)
+    if statement is not None:
+        db.session.execute(statement)
+
+
+def get_data_version(seller_id=None):
+    """
+    This function returns the data version of the seller, or a version of the data of all sellers if no seller is
+    given. It is read from the replica the listings of the session are read from, so it is never newer than them
+    :param seller_id: id of the seller, None for all sellers
+    """
+    if seller_id is None:
+        return tuple(use_replica(db.session.query(
+            func.count(Seller.id), func.max(Seller.id), select(func.max(DataVersion.id)).scalar_subquery()
+        )).one())
+
+    return use_replica(db.session.query(func.max(DataVersion.id)).filter(DataVersion.seller_id == seller_id)).scalar()
+
+
+def prune_data_versions():
+    """
+    This function removes the rows of the data versions other than the latest row of each seller and returns
+    the number of removed rows
+    """
+    # MySQL can't read the table a delete removes rows from in its subquery, unless the subquery is a derived table
+    latest = select(func.max(DataVersion.id).label('id')).group_by(DataVersion.seller_id).subquery()
+    removed = db.session.execute(delete(DataVersion).where(DataVersion.id.not_in(select(latest.c.id)))).rowcount
+    db.session.commit()
+    return removed
@@ -0,0 +1,220 @@
+"""
+This module contains the signed API tokens of machine clients. A token carries the id, admin flag and name of its
+seller and is signed with the secret key of the application, so it is verified without a database query.
+Revoked tokens and the tokens of deleted sellers or of sellers whose password or admin flag changed are rejected
+by a revocation list checked in the memory of the worker. Servers running several workers can opt in to
+a revocation list kept in an SQLite file of the instance folder, so that a revocation handled by one worker is seen
+by all of them at the cost of reading the file for every token
+"""
+
+import os
+import threading
+import time
+import uuid
+
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+from ecom_app.cache import SharedCache
+from ecom_app.principal import Principal, dump_principal
+
+
+# These are the default token settings, each can be overridden by the config key of the same name
+TOKEN_DEFAULTS = {
+    'API_TOKEN_TTL': 3600,
+    'API_TOKEN_REVOCATIONS_BACKEND': 'memory',
+    'API_TOKEN_REVOCATIONS_PATH': None,
+}
+
+# This is the salt that separates the signatures of the tokens from the other signatures of the secret key
+TOKEN_SALT = 'api-token'
+
+
+class TokenRevocations:
+    """
+    This class is the revocation list of the tokens kept in the memory of a worker. Revoked tokens are kept until
+    they expire, revoked sellers reject all their tokens issued up to the revocation
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tokens = {}
+        self.sellers = {}
+
+    def revoke_token(self, token_id, expires_at):
+        """
+        This method revokes a token
+        :param token_id: id of the token
+        :param expires_at: time the token expires at
+        """
+        now = time.time()
+        with self._lock:
+            self.tokens = {key: value for key, value in self.tokens.items() if value > now}
+            self.tokens[token_id] = expires_at
+
+    def revoke_seller(self, seller_id):
+        """
+        This method revokes all tokens of the seller issued until now
+        :param seller_id: id of the seller
+        """
+        with self._lock:
+            self.sellers[seller_id] = time.time()
+
+    def is_revoked(self, payload):
+        """
+        This method returns whether the token is revoked
+        :param payload: payload of the token
+        """
+        with self._lock:
+            revoked_at = self.sellers.get(payload['id'])
+            return payload['jti'] in self.tokens or (revoked_at is not None and payload['iat'] <= revoked_at)
+
+
+class SharedTokenRevocations:
+    """
+    This class is the revocation list of the tokens of the workers of a server, kept in a shared cache whose TTL is
+    the lifetime of the tokens, so that the revocations are kept until the tokens they reject expire
+    """
+    def __init__(self, ttl, path):
+        self.cache = SharedCache(ttl, path)
+
+    def revoke_token(self, token_id, expires_at):
+        """
+        This method revokes a token
+        :param token_id: id of the token
+        :param expires_at: time the token expires at
+        """
+        self.cache.store(f'token:{token_id}', expires_at)
+
+    def revoke_seller(self, seller_id):
+        """
+        This method revokes all tokens of the seller issued until now
+        :param seller_id: id of the seller
+        """
+        self.cache.store(f'seller:{seller_id}', time.time())
+
+    def is_revoked(self, payload):
+        """
+        This method returns whether the token is revoked
+        :param payload: payload of the token
+        """
+        if self.cache.load(f'token:{payload["jti"]}') is not None:
+            return True
+        revoked_at = self.cache.load(f'seller:{payload["id"]}')
+        return revoked_at is not None and payload['iat'] <= revoked_at
+
+
+def get_token_settings(config):
+    """
+    This function returns the token settings of the config with the defaults of the missing ones
+    :param config: config of the application
+    """
+    return {key: config.get(key) if config.get(key) is not None else default for key, default in TOKEN_DEFAULTS.items()}
+
+
+def create_token_revocations(config, instance_path):
+    """
+    This function returns the token revocation list configured by the config
+    :param config: config of the application
+    :param instance_path: instance folder of the application, where the shared revocation list is kept by default
+    """
+    settings = get_token_settings(config)
+    backend = str(settings['API_TOKEN_REVOCATIONS_BACKEND']).lower()
+
+    if backend == 'memory':
+        return TokenRevocations()
+    if backend == 'shared':
+        return SharedTokenRevocations(float(settings['API_TOKEN_TTL']), settings['API_TOKEN_REVOCATIONS_PATH'] or
+                                      os.path.join(instance_path, 'token_revocations.db'))
+
+    raise ValueError(f'Unknown token revocations backend {backend}')
+
+
+def get_token_ttl(app):
+    """
+    This function returns the lifetime of the tokens of the application in seconds
+    :param app: flask application
+    """
+    return int(get_token_settings(app.config)['API_TOKEN_TTL'])
+
+
+def get_serializer(app):
+    """
+    This function returns the serializer signing the tokens with the secret key of the application
+    :param app: flask application
+    """
+    return URLSafeTimedSerializer(app.secret_key, salt=TOKEN_SALT)
+
+
+def get_bearer_token(headers):
+    """
+    This function returns the bearer token of the Authorization header, None if there is none
+    :param headers: headers of the request
+    """
+    scheme, _, token = headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token.strip()
+
+
+def issue_token(app, seller):
+    """
+    This function returns a new token of the seller and its lifetime in seconds
+    :param app: flask application
+    :param seller: seller to issue the token to
+    """
+    payload = dict(dump_principal(seller), jti=uuid.uuid4().hex, iat=time.time())
+    return get_serializer(app).dumps(payload), get_token_ttl(app)
+
+
+def load_token(app, token):
+    """
+    This function returns the payload of the token, None if it is invalid, expired or revoked
+    :param app: flask application
+    :param token: token to verify
+    """
+    try:
+        payload = get_serializer(app).loads(token, max_age=get_token_ttl(app))
+    except BadSignature:
+        return None
+
+    if app.extensions['token_revocations'].is_revoked(payload):
+        return None
+    return payload
+
+
+def load_token_principal(app, headers):
+    """
+    This function returns the seller the bearer token of the request was issued to, None if there is no valid token
+    :param app: flask application
+    :param headers: headers of the request
+    """
+    token = get_bearer_token(headers)
+    payload = load_token(app, token) if token else None
+    if payload is None:
+        return None
+
+    return Principal(payload['id'], payload['is_admin'], payload['name'])
+
+
+def revoke_token(app, token):
+    """
+    This function revokes the token, it returns whether the token was valid
+    :param app: flask application
+    :param token: token to revoke
+    """
+    payload = load_token(app, token)
+    if payload is None:
+        return False
+
+    app.extensions['token_revocations'].revoke_token(payload['jti'], payload['iat'] + get_token_ttl(app))
+    return True
+
+
+def revoke_seller_tokens(app, seller_id):
+    """
+    This function revokes all tokens of the seller, after the write changing it is committed
+    :param app: flask application
+    :param seller_id: id of the seller
+    """
+    revocations = app.extensions.get('token_revocations')
+    if revocations is not None:
+        revocations.revoke_seller(seller_id)
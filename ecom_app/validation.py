@@ -0,0 +1,219 @@
+"""
+This module contains the validation of the query arguments and JSON bodies of the API requests. It doesn't depend on
+the web framework, so the REST API resources and the endpoints of the ASGI application share it
+"""
+
+import re
+
+import validators
+import phonenumbers
+
+from ecom_app.service.order_service import get_available_statuses
+
+
+class InvalidInput(Exception):
+    """
+    This class is the error raised when a request argument or a value of a request body is not valid, its message is
+    the message of the response
+    """
+    def __init__(self, message='Invalid input'):
+        super().__init__(message)
+        self.message = message
+
+
+def is_valid_phone(phone):
+    """
+    This function checks if a phone number is valid
+    :param phone: phone number to check
+    """
+    try:
+        return phonenumbers.is_valid_number(phonenumbers.parse(phone))
+    except phonenumbers.phonenumberutil.NumberParseException:
+        return False
+
+
+def is_valid_password(password):
+    """
+    This function checks if a password is valid
+    :param password: password to check
+    """
+    return bool(validators.length(password, min=8, max=30) and re.match('[A-Za-z0-9_]+$', password))
+
+
+def get_json_object(body):
+    """
+    This function returns the JSON body of a request if it is an object, an empty dict otherwise
+    :param body: decoded JSON body of the request
+    """
+    return body if isinstance(body, dict) else {}
+
+
+def parse_count_arg(args, name):
+    """
+    This function returns a non-negative integer argument of a request, None if it is absent
+    :param args: query arguments of the request
+    :param name: name of the argument
+    """
+    value = args.get(name)
+
+    if not value:
+        return None
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise InvalidInput()
+
+    if not validators.between(value, min=0):
+        raise InvalidInput()
+
+    return value
+
+
+def validate_new_seller(body):
+    """
+    This function validates the body of a request to create a seller and returns its values
+    :param body: decoded JSON body of the request
+    """
+    body = get_json_object(body)
+    try:
+        name = body['name']
+        email = body['email']
+        phone = body['phone']
+        password = body['password']
+    except KeyError:
+        raise InvalidInput()
+
+    if not all(isinstance(value, str) for value in [name, email, phone, password]):
+        raise InvalidInput()
+
+    if not all([validators.length(name, min=1, max=30), validators.email(email), is_valid_password(password),
+                is_valid_phone(phone)]):
+        raise InvalidInput()
+
+    return {'name': name, 'email': email, 'phone': phone, 'password': password}
+
+
+def validate_seller_changes(body, allow_password):
+    """
+    This function validates the body of a request to update a seller and returns its values, None for the values
+    it doesn't change
+    :param body: decoded JSON body of the request
+    :param allow_password: whether the request may change the password, otherwise a password in the body is ignored
+    """
+    body = get_json_object(body)
+    values = {'name': None, 'email': None, 'phone': None, 'password': None}
+
+    if 'name' in body:
+        values['name'] = body['name']
+        if not isinstance(values['name'], str) or not validators.length(values['name'], min=1, max=30):
+            raise InvalidInput('Name is not valid')
+    if 'email' in body:
+        values['email'] = body['email']
+        if not isinstance(values['email'], str) or not validators.email(values['email']):
+            raise InvalidInput('Email is not valid')
+    if 'phone' in body:
+        values['phone'] = body['phone']
+        if not isinstance(values['phone'], str) or not is_valid_phone(values['phone']):
+            raise InvalidInput('Phone is not valid')
+    if 'password' in body and allow_password:
+        values['password'] = body['password']
+        if not isinstance(values['password'], str) or not is_valid_password(values['password']):
+            raise InvalidInput('Password is not valid')
+
+    return values
+
+
+def validate_product_changes(body):
+    """
+    This function validates the body of a request to update a product and returns its values, None for the values
+    it doesn't change
+    :param body: decoded JSON body of the request
+    """
+    body = get_json_object(body)
+    values = {'name': None, 'description': None, 'price': None, 'inventory': None}
+
+    if 'name' in body:
+        values['name'] = body['name']
+        if not isinstance(values['name'], str) or not validators.length(values['name'], min=1, max=30):
+            raise InvalidInput('Name is not valid')
+    if 'description' in body:
+        values['description'] = body['description']
+        if not isinstance(values['description'], str) or not validators.length(values['description'], min=1,
+                                                                               max=300):
+            raise InvalidInput('Description is not valid')
+    if 'price' in body:
+        try:
+            values['price'] = int(body['price'])
+        except (TypeError, ValueError):
+            raise InvalidInput('Price is not valid')
+
+        if not validators.between(values['price'], min=0.01):
+            raise InvalidInput('Price is not valid')
+    if 'inventory' in body:
+        try:
+            values['inventory'] = int(body['inventory'])
+        except (TypeError, ValueError):
+            raise InvalidInput('Inventory is not valid')
+
+        if not validators.between(values['inventory'], min=0):
+            raise InvalidInput('Inventory is not valid')
+
+    return values
+
+
+def validate_new_order(body, available_statuses=None):
+    """
+    This function validates the body of a request to create an order and returns its values. The product of the order
+    is not checked to exist
+    :param body: decoded JSON body of the request, or one order of a bulk request
+    :param available_statuses: statuses an order can have, all of them by default
+    """
+    body = get_json_object(body)
+    try:
+        product_id = int(body['product_id'])
+        quantity = int(body['quantity'])
+        customer_details = body['customer_details']
+        status = body['status']
+    except (KeyError, TypeError, ValueError):
+        raise InvalidInput()
+
+    if not isinstance(customer_details, str) or not all([validators.between(quantity, min=1),
+                                                         validators.length(customer_details, min=1, max=300)]):
+        raise InvalidInput()
+
+    if status not in (available_statuses or get_available_statuses()):
+        raise InvalidInput('Status is not valid')
+
+    return {'product_id': product_id, 'quantity': quantity, 'customer_details': customer_details, 'status': status}
+
+
+def validate_order_changes(body):
+    """
+    This function validates the body of a request to update an order and returns its values, None for the values
+    it doesn't change. The product of the order is not checked to exist
+    :param body: decoded JSON body of the request
+    """
+    body = get_json_object(body)
+    values = {'product': body.get('product'), 'quantity': None, 'customer_details': None, 'status': None}
+
+    if 'quantity' in body:
+        try:
+            values['quantity'] = int(body['quantity'])
+        except (TypeError, ValueError):
+            raise InvalidInput('Quantity is not valid')
+        if not validators.between(values['quantity'], min=1):
+            raise InvalidInput('Quantity is not valid')
+
+    if 'customer_details' in body:
+        values['customer_details'] = body['customer_details']
+        if not isinstance(values['customer_details'], str) or not validators.length(values['customer_details'],
+                                                                                    min=1, max=300):
+            raise InvalidInput('Customer details is not valid')
+
+    if 'status' in body:
+        values['status'] = body['status']
+        if values['status'] not in get_available_statuses():
+            raise InvalidInput('Status is not valid')
+
+    return values
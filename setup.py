@@ -3,7 +3,7 @@ from setuptools import setup
 setup(
     name='epam_final_project',
     version='1',
-    packages=['ecom_app', 'ecom_app.rest', 'ecom_app.views', 'ecom_app.service'],
+    packages=['ecom_app', 'ecom_app.rest', 'ecom_app.views', 'ecom_app.service', 'ecom_app.aio'],
     url='https://github.com/RezOleksandr/epam_final_project',
     license='',
     author='RezOleksandr',
@@ -63,5 +63,14 @@ setup(
         'validators==0.20.0',
         'Werkzeug==2.2.3',
         'wrapt==1.15.0',
-    ]
+    ],
+    extras_require={
+        'async': [
+            'aiomysql==0.1.1',
+            'aiosqlite==0.18.0',
+            'httpx==0.23.3',
+            'starlette==0.26.1',
+            'uvicorn==0.21.1',
+        ],
+    },
 )
@@ -3,6 +3,8 @@ This module contains the base test class for the application.
 """
 
 import logging
+import os
+import tempfile
 import unittest
 
 from flask_testing import TestCase
@@ -11,6 +13,8 @@ from werkzeug.security import generate_password_hash
 from ecom_app import create_app
 from ecom_app.database import db
 from ecom_app.models import Seller, Product, Order, Status
+from ecom_app.service.rollup_service import rebuild_rollup
+from ecom_app.service.search_service import rebuild_index
 
 
 logging.basicConfig(filename='test_log.log',
@@ -21,6 +25,9 @@ logging.basicConfig(filename='test_log.log',
 
 logger = logging.getLogger(__name__)
 
+# This is the folder of the files the tests write instead of the instance folder
+test_files_dir = tempfile.TemporaryDirectory()
+
 
 class BaseTest(TestCase):
     """
@@ -37,10 +44,14 @@ class BaseTest(TestCase):
                          password=generate_password_hash('seller1password', method='sha256'), is_admin=True)
         seller2 = Seller(name='Seller 2', email='seller2@example.com', phone='+380961238931',
                          password=generate_password_hash('seller2password', method='sha256'))
-        product1 = Product(name='Product 1', description="Description 1", price=100, inventory=1, seller_id=1)
-        product2 = Product(name='Product 2', description="Description 2", price=200, inventory=2, seller_id=1)
-        product3 = Product(name='Product 3', description="Description 3", price=300, inventory=3, seller_id=2)
-        product4 = Product(name='Product 4', description="Description 4", price=400, inventory=4, seller_id=2)
+        product1 = Product(name='Product 1', description="Description 1", price=100, inventory=1,
+                           ordered_quantity=1, seller_id=1)
+        product2 = Product(name='Product 2', description="Description 2", price=200, inventory=2,
+                           ordered_quantity=2, seller_id=1)
+        product3 = Product(name='Product 3', description="Description 3", price=300, inventory=3,
+                           ordered_quantity=3, seller_id=2)
+        product4 = Product(name='Product 4', description="Description 4", price=400, inventory=4,
+                           ordered_quantity=4, seller_id=2)
         order1 = Order(product_id=1, quantity=1, seller_id=1, customer_details='Customer details',
                        status=Status.in_progress)
         order2 = Order(product_id=2, quantity=2, seller_id=1, customer_details='Customer details',
@@ -68,13 +79,18 @@ class BaseTest(TestCase):
         db.session.add(order6)
         db.session.commit()
 
+        rebuild_rollup()
+        rebuild_index()
+
     def create_app(self):
         """
         This function creates the flask application
         """
         logger.debug('Creating app')
         app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'TESTING': True,
-                                      'SECRET_KEY': 'test_key', 'WTF_CSRF_ENABLED': False})
+                                      'SECRET_KEY': 'test_key', 'WTF_CSRF_ENABLED': False,
+                                      'API_TOKEN_REVOCATIONS_PATH': os.path.join(test_files_dir.name,
+                                                                                 'token_revocations.db')})
         return app
 
     def setUp(self):
@@ -2,12 +2,16 @@
 This module contains the tests for app creation
 """
 
+import os
+import tempfile
+
 from flask import Flask
 
 
 from tests.conftest import BaseTest, logger
-from ecom_app import create_app
-from ecom_app.models import Seller
+from ecom_app import create_app, database
+from ecom_app.models import Seller, Product, OrderDailyRollup
+from ecom_app.service.search_service import products_fts, search_products
 
 
 class TestApp(BaseTest):
@@ -35,3 +39,93 @@ class TestApp(BaseTest):
         self.assertIn('Admin created successfully', result.output)
         self.assertEqual(result.exit_code, 0)
         self.assertTrue(Seller.query.filter_by(name='admin').first() is not None)
+
+    def test_rebuild_ordered_cli(self):
+        """
+        This function tests the rebuild_ordered command
+        """
+        app = create_app()
+        runner = app.test_cli_runner()
+
+        Product.query.filter_by(id=1).update({Product.ordered_quantity: 10})
+        database.db.session.commit()
+
+        result = runner.invoke(app.cli.commands['rebuild_ordered'], ['--check'])
+        self.assertIn('Product 1: ordered quantity 10, orders contain 1', result.output)
+        self.assertEqual(result.exit_code, 1)
+
+        result = runner.invoke(app.cli.commands['rebuild_ordered'])
+        self.assertIn('1 ordered quantity counters rebuilt', result.output)
+        self.assertEqual(result.exit_code, 0)
+
+        result = runner.invoke(app.cli.commands['rebuild_ordered'], ['--check'])
+        self.assertIn('Ordered quantity counters are up to date', result.output)
+        self.assertEqual(result.exit_code, 0)
+
+    def test_rebuild_rollup_cli(self):
+        """
+        This function tests the rebuild_rollup command
+        """
+        app = create_app()
+        runner = app.test_cli_runner()
+
+        OrderDailyRollup.query.delete()
+        database.db.session.commit()
+
+        result = runner.invoke(app.cli.commands['rebuild_rollup'])
+        self.assertIn('6 rollup rows rebuilt', result.output)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(OrderDailyRollup.query.count(), 6)
+
+    def test_rebuild_search_index_cli(self):
+        """
+        This function tests the rebuild_search_index command
+        """
+        app = create_app()
+        runner = app.test_cli_runner()
+
+        database.db.session.execute(products_fts.delete())
+        database.db.session.commit()
+
+        result = runner.invoke(app.cli.commands['rebuild_search_index'])
+        self.assertIn('4 products indexed', result.output)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(len(search_products('product')), 4)
+
+    def test_import_products_cli(self):
+        """
+        This function tests the import_products command
+        """
+        app = create_app()
+        runner = app.test_cli_runner()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'products.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('name,description,price,inventory\nProduct 5,Description 5,500,5\nProduct 6,,1,1\n')
+
+            result = runner.invoke(app.cli.commands['import_products'], ['1', path])
+            self.assertIn('Row 3: Invalid input', result.output)
+            self.assertIn('1 products created, 0 products updated, 1 rows rejected', result.output)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(Product.query.filter_by(name='Product 5').first().seller_id, 1)
+
+            result = runner.invoke(app.cli.commands['import_products'], ['10', path])
+            self.assertIn('Seller not found', result.output)
+            self.assertEqual(result.exit_code, 1)
+
+    def test_seed_cli(self):
+        """
+        This function tests the seed command
+        """
+        app = create_app()
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(app.cli.commands['seed'], ['--sellers', '2', '--products', '5', '--orders', '50'])
+        self.assertIn('2 sellers, 5 products and 50 orders added', result.output)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(Product.query.count(), 9)
+
+        result = runner.invoke(app.cli.commands['seed'], ['--sellers', '0', '--products', '5'])
+        self.assertIn('Products need sellers and orders need products', result.output)
+        self.assertEqual(result.exit_code, 1)
@@ -0,0 +1,138 @@
+"""
+This module contains the tests for the prefix index of product names and the ProductsAutocompleteAPI
+RESTful resource
+"""
+
+import time
+
+from flask import current_app, g
+
+from tests.conftest import BaseTest, logger
+from ecom_app.autocomplete import PrefixIndex, complete_product_names
+from ecom_app.database import db
+from ecom_app.models import Product
+from ecom_app.service import product_service, seller_service
+
+
+class TestPrefixIndex(BaseTest):
+    """
+    This class contains the tests for the prefix index of product names
+    """
+    def test_complete(self):
+        """
+        This function tests the completion of names by the prefix index and its incremental updates
+        """
+        logger.info('Testing PrefixIndex class')
+        index = PrefixIndex([(1, 'Oak chair'), (2, 'oak table'), (3, 'Pine chair'), (4, 'Oak')])
+        self.assertEqual(index.complete('OAK', 10), [(4, 'Oak'), (1, 'Oak chair'), (2, 'oak table')])
+        self.assertEqual(index.complete('oak ', 1), [(1, 'Oak chair')])
+        self.assertEqual(index.complete('birch', 10), [])
+
+        index.add(1, 'Birch chair')
+        index.remove(4)
+        index.remove(5)
+        self.assertEqual(index.complete('oak', 10), [(2, 'oak table')])
+        self.assertEqual(index.complete('b', 10), [(1, 'Birch chair')])
+
+    def test_complete_time(self):
+        """
+        This function tests that names are completed from a large index in well under 5 ms
+        """
+        logger.info('Testing PrefixIndex completion time')
+        index = PrefixIndex((product_id, f'Product {product_id:06}') for product_id in range(100000))
+
+        start = time.perf_counter()
+        for product_id in range(0, 100000, 1000):
+            self.assertEqual(len(index.complete(f'product {product_id // 10:05}', 10)), 10)
+        self.assertLess((time.perf_counter() - start) / 100, 0.005)
+
+
+class TestAutocomplete(BaseTest):
+    """
+    This class contains the tests for the completion of product names by the prefix indexes of the worker
+    """
+    def test_writes(self):
+        """
+        This function tests that the product writes update the built prefix indexes
+        """
+        logger.info('Testing complete_product_names function')
+        self.assertEqual(complete_product_names('prod', 2), [(3, 'Product 3'), (4, 'Product 4')])
+        self.assertEqual(len(complete_product_names('product ')), 4)
+
+        product = product_service.create_product('Product 5', 'Description 5', 500, 5, 2)
+        self.assertEqual(complete_product_names('product', 2)[-1], (product.id, 'Product 5'))
+
+        product_service.update_product(3, name='Chair')
+        self.assertEqual(complete_product_names('c', 2), [(3, 'Chair')])
+        self.assertEqual(complete_product_names('product', 2), [(4, 'Product 4'), (product.id, 'Product 5')])
+
+        product_service.update_product(4, seller_id=1)
+        self.assertEqual(complete_product_names('product', 2), [(product.id, 'Product 5')])
+        self.assertEqual(complete_product_names('product 4', 1), [(4, 'Product 4')])
+
+        product_service.delete_product(product.id)
+        self.assertEqual(complete_product_names('product', 2), [])
+        self.assertEqual(complete_product_names('product', limit=2), [(1, 'Product 1'), (2, 'Product 2')])
+
+        product_service.upsert_products([{'name': 'Product 6', 'description': 'Description 6', 'price': 600,
+                                          'inventory': 6}], 2)
+        self.assertEqual([name for _, name in complete_product_names('product', 2)], ['Product 6'])
+
+        seller_service.delete_seller(2)
+        self.assertEqual(complete_product_names('c'), [])
+
+        current_app.extensions['autocomplete_index'] = None
+        self.assertEqual(complete_product_names('product 1'), [(1, 'Product 1')])
+
+    def test_expired_index(self):
+        """
+        This function tests that a prefix index is rebuilt after its TTL, seeing the writes of the other workers
+        """
+        logger.info('Testing prefix index TTL')
+        self.assertEqual(complete_product_names('product 1', 1), [(1, 'Product 1')])
+        Product.query.filter_by(id=1).update({Product.name: 'Chair'})
+        db.session.commit()
+        self.assertEqual(complete_product_names('product 1', 1), [(1, 'Product 1')])
+
+        index = current_app.extensions['autocomplete_index']
+        built_at, seller_index = index.indexes[1]
+        index.indexes[1] = (built_at - index.ttl, seller_index)
+        self.assertEqual(complete_product_names('product 1', 1), [])
+        self.assertEqual(complete_product_names('chair', 1), [(1, 'Chair')])
+
+
+class TestProductsAutocompleteAPI(BaseTest):
+    """
+    This class contains the tests for the ProductsAutocompleteAPI RESTful resource
+    """
+    def test_get(self):
+        """
+        This function tests the GET request for the products whose names start with a prefix
+        """
+        logger.info('Testing ProductsAutocompleteAPI GET request')
+        with self.client.session_transaction() as session:
+            session['_user_id'] = '2'
+            session['_fresh'] = True
+
+        response = self.client.get('/api/products/autocomplete?prefix=prod')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{'id': 3, 'name': 'Product 3'}, {'id': 4, 'name': 'Product 4'}])
+
+        # The user loaded by a request is kept in g of the application context the tests share with the requests
+        g.pop('_login_user', None)
+        response = self.client.get('/api/products/autocomplete?prefix=product%204&seller_id=1')
+        self.assertEqual(response.json, [{'id': 4, 'name': 'Product 4'}])
+        self.assertEqual(response.headers['X-DB-Queries'], '0')
+
+        for query in ('', 'prefix=%20', 'prefix=p&limit=0'):
+            self.assertEqual(self.client.get(f'/api/products/autocomplete?{query}').status_code, 400)
+
+        with self.client.session_transaction() as session:
+            session['_user_id'] = '1'
+        g.pop('_login_user', None)
+        response = self.client.get('/api/products/autocomplete?prefix=product&limit=3')
+        self.assertEqual([product['id'] for product in response.json], [1, 2, 3])
+        g.pop('_login_user', None)
+        response = self.client.get('/api/products/autocomplete?prefix=product&seller_id=2')
+        self.assertEqual([product['id'] for product in response.json], [3, 4])
+        self.assertEqual(self.client.get('/api/products/autocomplete?prefix=p&seller_id=x').status_code, 400)
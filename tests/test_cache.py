@@ -0,0 +1,185 @@
+"""
+This module contains the tests for the cache backends, the product cache and the CacheStatsAPI RESTful resource
+"""
+
+import os
+import tempfile
+import time
+
+import sqlalchemy as sa
+from flask import current_app
+from flask_login import login_user, logout_user
+
+from tests.conftest import BaseTest, logger
+from ecom_app import cache
+from ecom_app.database import db
+from ecom_app.models import Product, Seller
+from ecom_app.service import order_service, product_service
+from ecom_app.service.version_service import get_data_version
+
+
+class TestCache(BaseTest):
+    """
+    This class contains the tests for the cache backends and the product cache
+    """
+    def setUp(self):
+        super().setUp()
+        self.statements = []
+        sa.event.listen(db.engine, 'before_cursor_execute', self.count_statement)
+
+    def tearDown(self):
+        sa.event.remove(db.engine, 'before_cursor_execute', self.count_statement)
+        super().tearDown()
+
+    def count_statement(self, conn, cursor, statement, parameters, context, executemany):
+        """
+        This function records the statements run by the tests
+        """
+        self.statements.append(statement)
+
+    def test_lru_cache(self):
+        """
+        This function tests the expiry, eviction and statistics of the LRU cache
+        """
+        logger.info('Testing LRU cache')
+        lru = cache.LRUCache(60, 2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 3)
+
+        lru.delete('a')
+        self.assertIsNone(lru.get('a'))
+
+        snapshot = lru.snapshot()
+        self.assertEqual(snapshot['backend'], 'LRUCache')
+        self.assertEqual(snapshot['size'], 1)
+        self.assertEqual((snapshot['hits'], snapshot['misses'], snapshot['sets']), (2, 2, 3))
+        self.assertEqual((snapshot['evictions'], snapshot['invalidations']), (1, 1))
+        self.assertEqual(snapshot['hit_ratio'], 0.5)
+
+        lru = cache.LRUCache(0.01, 10)
+        lru.set('a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get('a'))
+
+    def test_shared_cache(self):
+        """
+        This function tests that the shared cache entries and generations are seen by every instance of the file
+        """
+        logger.info('Testing shared cache')
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, 'cache.db')
+            first, second = cache.SharedCache(60, path), cache.SharedCache(60, path)
+
+            first.set('a', {'id': 1})
+            self.assertEqual(second.get('a'), {'id': 1})
+
+            generation = first.get_generation('product:1')
+            self.assertEqual(second.get_generation('product:1'), generation)
+            second.delete('product:1')
+            self.assertNotEqual(first.get_generation('product:1'), generation)
+
+            self.assertEqual(first.snapshot()['size'], 2)
+            first.clear()
+            self.assertIsNone(second.get('a'))
+
+    def test_create_cache(self):
+        """
+        This function tests the product cache built from the config
+        """
+        logger.info('Testing create_cache function')
+        self.assertIsInstance(cache.create_cache({}, None), cache.LRUCache)
+        self.assertIsNone(cache.create_cache({'PRODUCT_CACHE_BACKEND': 'none'}, None))
+        with tempfile.TemporaryDirectory() as instance_path:
+            shared = cache.create_cache({'PRODUCT_CACHE_BACKEND': 'shared', 'PRODUCT_CACHE_TTL': '5'}, instance_path)
+            self.assertEqual(shared.path, os.path.join(instance_path, 'product_cache.db'))
+            self.assertEqual(shared.ttl, 5)
+        with self.assertRaises(ValueError):
+            cache.create_cache({'PRODUCT_CACHE_BACKEND': 'memcached'}, None)
+        with self.assertRaises(TypeError):
+            cache.Cache(5)
+
+    def test_product_cache(self):
+        """
+        This function tests that cached products are returned without queries and invalidated by the writes
+        """
+        logger.info('Testing product cache')
+        product_service.get_product_by_id(1)
+        product_service.get_products_by_seller(2)
+        db.session.expunge_all()
+
+        self.statements.clear()
+        product = product_service.get_product_by_id(1)
+        products = product_service.get_products_by_seller(2)
+        self.assertEqual(self.statements, [])
+        self.assertEqual(product.name, 'Product 1')
+        self.assertEqual([product.id for product in products], [3, 4])
+
+        db.session.expunge_all()
+        product = product_service.get_product_by_id(1, ['name'])
+        products = product_service.get_products_by_seller(2, columns=['name'])
+        self.assertEqual(len(self.statements), 2)
+        self.assertIn('description', sa.inspect(product).unloaded)
+        self.assertTrue(all('description' in sa.inspect(product).unloaded for product in products))
+
+        product_service.update_product(1, name='Product 1 renamed')
+        db.session.expunge_all()
+        self.assertEqual(product_service.get_product_by_id(1).name, 'Product 1 renamed')
+
+        product_service.create_product('Product 5', 'Description 5', 500, 5, 2)
+        self.assertEqual(len(product_service.get_products_by_seller(2)), 3)
+
+        ordered = product_service.get_product_by_id(3).ordered
+        order_service.create_order(2, 'Customer', 'In progress', 1, 3)
+        db.session.expunge_all()
+        self.assertEqual(product_service.get_product_by_id(3).ordered, ordered + 2)
+        self.assertEqual(product_service.get_products_by_seller(2)[0].ordered, ordered + 2)
+
+        product_service.delete_product(3)
+        db.session.expunge_all()
+        self.assertIsNone(product_service.get_product_by_id(3))
+
+    def test_cached_product_writes(self):
+        """
+        This function tests that the products of the cache are not returned by the queries of the session,
+        so the writes start from the current values of a product changed by another worker
+        """
+        logger.info('Testing writes of cached products')
+        product_service.get_product_by_id(1)
+        db.session.expunge_all()
+        # Another worker moves the product without invalidating the cache of this worker
+        db.session.execute(sa.update(Product).where(Product.id == 1).values(seller_id=2))
+        db.session.commit()
+
+        # The product is kept, like the product a request checks before writing it
+        cached_product = product_service.get_product_by_id(1)
+        self.assertEqual(cached_product.seller_id, 1)
+        self.assertEqual(Product.query.filter_by(id=1).first().seller_id, 2)
+
+        version = get_data_version(2)
+        product_service.update_product(1, name='Product 1 renamed')
+        self.assertNotEqual(get_data_version(2), version)
+        self.assertEqual(product_service.get_product_by_id(1).seller_id, 2)
+
+    def test_cache_stats_api(self):
+        """
+        This function tests the CacheStatsAPI RESTful resource
+        """
+        logger.info('Testing CacheStatsAPI')
+        with self.client:
+            login_user(db.session.get(Seller, 2))
+            self.assertEqual(self.client.get('/api/stats/cache').status_code, 403)
+
+            logout_user()
+            login_user(db.session.get(Seller, 1))
+            product_service.get_product_by_id(1)
+            response = self.client.get('/api/stats/cache')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['product']['backend'], 'LRUCache')
+            self.assertEqual(response.json['product']['misses'], 1)
+
+            current_app.extensions['product_cache'] = None
+            self.assertIsNone(self.client.get('/api/stats/cache').json['product'])
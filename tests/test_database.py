@@ -0,0 +1,118 @@
+"""
+This module contains the tests for the read replica routing of the database
+"""
+
+import os
+import tempfile
+
+from flask import current_app
+
+from tests.conftest import BaseTest, logger
+from ecom_app import create_app
+from ecom_app.database import db, get_replica_uris
+from ecom_app.models import Seller, Product
+from ecom_app.service import order_service, product_service, seller_service
+
+
+class TestReadReplica(BaseTest):
+    """
+    This class contains the tests for the read replica routing of the database
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        This function creates the directory of the database files
+        """
+        cls.db_dir = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        This function removes the directory of the database files
+        """
+        cls.db_dir.cleanup()
+
+    def create_app(self):
+        """
+        This function creates the flask application with a primary and a replica SQLite file
+        """
+        logger.debug('Creating app with replica')
+        primary_uri = 'sqlite:///' + os.path.join(self.db_dir.name, 'primary.db')
+        replica_uri = 'sqlite:///' + os.path.join(self.db_dir.name, 'replica.db')
+        return create_app(test_config={'SQLALCHEMY_DATABASE_URI': primary_uri, 'SQLALCHEMY_REPLICA_URIS': replica_uri,
+                                       'TESTING': True, 'SECRET_KEY': 'test_key', 'WTF_CSRF_ENABLED': False})
+
+    def setUp(self):
+        """
+        This function sets up the primary database with test data and the replica database with a stale copy of it
+        """
+        super().setUp()
+        replica = current_app.extensions['replicas'][0]
+        db.metadata.create_all(replica)
+        with replica.begin() as connection:
+            connection.execute(Seller.__table__.insert(), [
+                {'id': 1, 'name': 'Replica seller', 'email': 'replica@example.com', 'phone': '+380961234567',
+                 'password': 'password', 'is_admin': False},
+            ])
+            connection.execute(Product.__table__.insert(), [
+                {'id': 1, 'name': 'Replica product', 'description': 'Description', 'price': 100, 'inventory': 1,
+                 'ordered_quantity': 0, 'seller_id': 1},
+            ])
+        db.session.remove()
+
+    def tearDown(self):
+        """
+        This function tears down the primary and the replica databases
+        """
+        super().tearDown()
+        db.metadata.drop_all(current_app.extensions['replicas'][0])
+        current_app.extensions['replicas'][0].dispose()
+
+    def test_replica_uris(self):
+        """
+        This function tests the replica URIs config
+        """
+        self.assertEqual(get_replica_uris('sqlite:///a.db, sqlite:///b.db'), ['sqlite:///a.db', 'sqlite:///b.db'])
+        self.assertEqual(get_replica_uris(['sqlite:///a.db']), ['sqlite:///a.db'])
+        self.assertEqual(get_replica_uris(None), [])
+        self.assertEqual(len(current_app.extensions['replicas']), 1)
+
+    def test_reads_use_replica(self):
+        """
+        This function tests that the listings and the login lookup read from the replica
+        """
+        self.assertEqual([seller.name for seller in seller_service.get_sellers()], ['Replica seller'])
+        self.assertEqual([product.name for product in product_service.get_products()], ['Replica product'])
+        self.assertEqual([product.name for product in product_service.get_products(stream=True)],
+                         ['Replica product'])
+        self.assertEqual(order_service.get_orders(), [])
+        self.assertEqual(seller_service.get_seller_by_email('replica@example.com').name, 'Replica seller')
+        self.assertIsNone(seller_service.get_seller_by_email('seller1@example.com'))
+
+    def test_lookups_use_primary(self):
+        """
+        This function tests that the lookups used before writes read from the primary
+        """
+        self.assertEqual(product_service.get_product_by_id(4).name, 'Product 4')
+        self.assertEqual(seller_service.get_seller_by_id(2).name, 'Seller 2')
+
+    def test_read_after_write_uses_primary(self):
+        """
+        This function tests that reads after a write in the same session go to the primary
+        """
+        seller_service.create_seller('Seller 3', 'seller3@example.com', '+380961234568', 'password', False)
+
+        self.assertEqual(len(seller_service.get_sellers()), 3)
+        self.assertEqual(len(order_service.get_orders()), 6)
+        self.assertEqual(seller_service.get_seller_by_email('seller3@example.com').name, 'Seller 3')
+
+    def test_writes_use_primary(self):
+        """
+        This function tests that writes go to the primary
+        """
+        product_service.delete_product(1)
+        db.session.remove()
+
+        self.assertEqual([product.name for product in product_service.get_products()], ['Replica product'])
+        self.assertIsNone(db.session.get(Product, 1))
+        self.assertEqual(len(Product.query.all()), 3)
@@ -0,0 +1,122 @@
+"""
+This module contains the tests for the ETags of the REST API and the data versions of sellers
+"""
+
+from flask_login import login_user, logout_user
+
+from tests.conftest import BaseTest, logger
+from ecom_app.database import db
+from ecom_app.models import DataVersion, Seller
+from ecom_app.service import order_service, product_service, seller_service
+from ecom_app.service.version_service import get_data_version, prune_data_versions
+
+
+class TestETags(BaseTest):
+    """
+    This class contains the tests for the ETags of the REST API
+    """
+    def login(self, seller_id):
+        """
+        This function logs the client in as the seller
+        :param seller_id: id of the seller
+        """
+        logout_user()
+        login_user(db.session.get(Seller, seller_id))
+
+    def test_not_modified(self):
+        """
+        This function tests that a matching If-None-Match header gets 304 without running the listing query
+        """
+        logger.info('Testing not modified responses')
+        with self.client:
+            self.login(1)
+            for url in ('/api/products', '/api/product/1', '/api/orders?limit=2', '/api/order/1'):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers['ETag']
+
+                response = self.client.get(url, headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.headers['ETag'], etag)
+                self.assertEqual(response.headers['X-DB-Queries'], '1')
+                self.assertEqual(response.data, b'')
+
+                response = self.client.get(url, headers={'If-None-Match': '"other"'})
+                self.assertEqual(response.status_code, 200)
+
+            self.assertNotEqual(self.client.get('/api/products').headers['ETag'],
+                                self.client.get('/api/products?fields=id').headers['ETag'])
+            self.assertNotIn('ETag', self.client.get('/api/product/10').headers)
+
+            self.login(2)
+            self.assertEqual(self.client.get('/api/product/1', headers={'If-None-Match': etag}).status_code, 403)
+
+    def test_changed(self):
+        """
+        This function tests that the ETags change with the writes the user sees
+        """
+        logger.info('Testing changed ETags')
+        with self.client:
+            self.login(2)
+            seller_etag = self.client.get('/api/products').headers['ETag']
+            self.login(1)
+            admin_etag = self.client.get('/api/products').headers['ETag']
+
+            order_service.create_order(1, 'Customer', 'Complete', 1, 1)
+            self.assertNotEqual(self.client.get('/api/products').headers['ETag'], admin_etag)
+            self.login(2)
+            self.assertEqual(self.client.get('/api/products').headers['ETag'], seller_etag)
+
+            order_service.create_order(1, 'Customer', 'In progress', 1, 3)
+            self.assertNotEqual(self.client.get('/api/products').headers['ETag'], seller_etag)
+
+    def test_data_versions(self):
+        """
+        This function tests which sellers the writes increase the data versions of
+        """
+        logger.info('Testing data versions')
+        versions = {seller_id: get_data_version(seller_id) for seller_id in (1, 2)}
+
+        def changed():
+            changed_ids = [seller_id for seller_id in versions if get_data_version(seller_id) != versions[seller_id]]
+            versions.update({seller_id: get_data_version(seller_id) for seller_id in versions})
+            return changed_ids
+
+        order_service.create_order(1, 'Customer', 'In progress', 1, 3)
+        self.assertEqual(changed(), [1, 2])
+        order_service.update_orders_status('Complete', current_status='In progress', seller_id=2)
+        self.assertEqual(changed(), [2])
+        order_service.update_order(4, quantity=5)
+        self.assertEqual(changed(), [2])
+        order_service.delete_order(1)
+        self.assertEqual(changed(), [1])
+        product_service.update_product(3, inventory=10)
+        self.assertEqual(changed(), [2])
+        product_service.update_product(3, price=10)
+        self.assertEqual(changed(), [1, 2])
+        product_service.create_product('Product 5', 'Description 5', 500, 5, 1)
+        self.assertEqual(changed(), [1])
+        product_service.upsert_products([{'name': 'Product 5', 'description': 'Description', 'price': 5,
+                                          'inventory': 5}], 1)
+        self.assertEqual(changed(), [1])
+        product_service.delete_product(3)
+        self.assertEqual(changed(), [1, 2])
+
+        admin_version = get_data_version()
+        seller_service.delete_seller(2)
+        self.assertEqual(changed(), [2])
+        self.assertNotEqual(get_data_version(), admin_version)
+
+    def test_prune_data_versions(self):
+        """
+        This function tests that pruning the data versions keeps the versions of the sellers
+        """
+        logger.info('Testing prune_data_versions function')
+        order_service.create_order(1, 'Customer', 'In progress', 1, 3)
+        order_service.create_order(1, 'Customer', 'In progress', 1, 3)
+        versions = [get_data_version(), get_data_version(1), get_data_version(2)]
+
+        self.assertEqual(prune_data_versions(), 2)
+        self.assertEqual(DataVersion.query.count(), 2)
+        self.assertEqual([get_data_version(), get_data_version(1), get_data_version(2)], versions)
+        self.assertEqual(prune_data_versions(), 0)
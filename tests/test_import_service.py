@@ -0,0 +1,102 @@
+"""
+This module contains the tests for the import service functions
+"""
+
+import io
+import json
+
+from tests.conftest import BaseTest, logger
+
+from ecom_app.models import Product
+from ecom_app.service.import_service import *
+
+
+class TestImportService(BaseTest):
+    """
+    This class contains the tests for the import service functions
+    """
+    def test_validate_product(self):
+        """
+        This function tests the validate_product function
+        """
+        logger.info('Testing validate_product function')
+        values = validate_product({'name': 'Product', 'description': 'Description', 'price': '10', 'inventory': 5})
+        self.assertEqual(values, {'name': 'Product', 'description': 'Description', 'price': 10, 'inventory': 5})
+
+        self.assertIsNone(validate_product({'name': 'Product', 'description': 'Description', 'price': 10}))
+        self.assertIsNone(validate_product({'name': '', 'description': 'Description', 'price': 10, 'inventory': 5}))
+        self.assertIsNone(validate_product({'name': 'Product', 'description': 'Description', 'price': 'a',
+                                            'inventory': 5}))
+        self.assertIsNone(validate_product({'name': 'Product', 'description': 'Description', 'price': 0,
+                                            'inventory': 5}))
+        self.assertIsNone(validate_product({'name': 'Product', 'description': 'Description', 'price': 10,
+                                            'inventory': -1}))
+        self.assertIsNone(validate_product(['Product']))
+
+    def test_import_products_csv(self):
+        """
+        This function tests the import_products function with a CSV file
+        """
+        logger.info('Testing import_products function with CSV')
+        stream = io.BytesIO(
+            b'name,description,price,inventory\n'
+            b'Product 1,Updated description,150,10\n'
+            b'Product 5,Description 5,500,5\n'
+            b'Product 6,Description 6,a,5\n'
+            b'Product 3,Description 3,300,3\n'
+            b'Product 7,Description 7,700,7\n'
+        )
+        summary = import_products(stream, 'csv', 1, batch_size=2)
+
+        self.assertEqual(summary['created'], 2)
+        self.assertEqual(summary['updated'], 1)
+        self.assertEqual(summary['error_count'], 2)
+        self.assertEqual(summary['errors'], [{'row': 4, 'message': 'Invalid input'},
+                                             {'row': 5, 'message': 'Name is used by another seller'}])
+        self.assertEqual(Product.query.filter_by(name='Product 1').first().description, 'Updated description')
+        self.assertEqual(Product.query.filter_by(name='Product 3').first().seller_id, 2)
+        self.assertEqual(Product.query.filter_by(name='Product 7').first().seller_id, 1)
+
+    def test_import_products_ndjson(self):
+        """
+        This function tests the import_products function with an NDJSON file
+        """
+        logger.info('Testing import_products function with NDJSON')
+        rows = [
+            json.dumps({'name': 'Product 5', 'description': 'Description 5', 'price': 500, 'inventory': 5}),
+            '',
+            '{not json',
+            json.dumps({'name': 'Product 4', 'description': 'Updated', 'price': 400, 'inventory': 0}),
+        ]
+        summary = import_products(io.BytesIO('\n'.join(rows).encode()), 'ndjson', 2)
+
+        self.assertEqual((summary['created'], summary['updated'], summary['error_count']), (1, 1, 1))
+        self.assertEqual(summary['errors'], [{'row': 3, 'message': 'Invalid input'}])
+        self.assertEqual(Product.query.filter_by(name='Product 4').first().inventory, 0)
+        self.assertEqual(Product.query.filter_by(name='Product 5').first().ordered, 0)
+
+    def test_import_products_invalid_file(self):
+        """
+        This function tests that the rows that are not valid UTF-8 are reported and the others are imported
+        """
+        logger.info('Testing import_products function with an invalid file')
+        rows = [json.dumps({'name': f'Imported {index}', 'description': 'Description', 'price': 1, 'inventory': 1})
+                for index in range(200)]
+        stream = io.BytesIO('\n'.join(rows).encode() + b'\n\xff\xfe\n')
+        summary = import_products(stream, 'ndjson', 1, batch_size=50)
+
+        self.assertEqual(summary['created'], 200)
+        self.assertEqual(summary['errors'], [{'row': 201, 'message': 'Invalid encoding'}])
+        self.assertEqual(Product.query.filter(Product.name.startswith('Imported')).count(), 200)
+
+        stream = io.BytesIO(
+            b'name,description,price,inventory\n'
+            b'Product 5,Description 5,500,5\n'
+            b'Product 6,Description \xff,600,6\n'
+            b'Product 7,"Description\n7",700,7\n'
+        )
+        summary = import_products(stream, 'csv', 1)
+
+        self.assertEqual(summary['created'], 2)
+        self.assertEqual(summary['errors'], [{'row': 3, 'message': 'Invalid encoding'}])
+        self.assertEqual(Product.query.filter_by(name='Product 7').first().description, 'Description\n7')
@@ -2,9 +2,18 @@
 This module contains the tests for the order service functions
 """
 
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_restful import marshal
+from sqlalchemy import event
+
 from tests.conftest import BaseTest, logger
 
+from ecom_app import create_app
+from ecom_app.rest.orders_api import orders_fields
 from ecom_app.service.order_service import *
+from ecom_app.service.product_service import rebuild_ordered_quantity
 
 
 class TestOrderService(BaseTest):
@@ -81,6 +90,50 @@ class TestOrderService(BaseTest):
         orders = get_orders_by_seller_filtered(1, 'In progress')
         self.assertEqual(len(orders), 2)
 
+    def test_get_orders_paginated(self):
+        """
+        This function tests the limit and after parameters of the order listing functions
+        """
+        logger.info('Testing order listing pagination')
+        self.assertEqual([order.id for order in get_orders(limit=2)], [1, 2])
+        self.assertEqual([order.id for order in get_orders(limit=2, after=2)], [3, 4])
+        self.assertEqual([order.id for order in get_orders(after=4)], [5, 6])
+        self.assertEqual([order.id for order in get_orders_filtered(Status.complete, limit=1, after=3)], [6])
+        self.assertEqual([order.id for order in get_orders_by_seller(2, limit=1, after=4)], [5])
+        self.assertEqual([order.id for order in get_orders_by_seller_filtered(1, Status.in_progress, 5)], [1, 2])
+
+    def test_get_orders_query_count(self):
+        """
+        This function tests that listing and serializing orders takes the same number of queries for any number of orders
+        """
+        logger.info('Testing get_orders query count')
+        statements = []
+
+        def count_statement(*args):
+            statements.append(args[2])
+
+        def count_listing_queries():
+            db.session.expunge_all()
+            statements.clear()
+            event.listen(db.engine, 'before_cursor_execute', count_statement)
+            try:
+                marshal(get_orders(), orders_fields)
+                marshal(get_orders_filtered(Status.in_progress), orders_fields)
+                marshal(get_orders_by_seller(1), orders_fields)
+                marshal(get_orders_by_seller_filtered(1, Status.in_progress), orders_fields)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', count_statement)
+            return len(statements)
+
+        queries_before = count_listing_queries()
+
+        for i in range(50):
+            db.session.add(Order(product_id=i % 4 + 1, quantity=1, seller_id=i % 2 + 1,
+                                 customer_details='Customer details', status=Status.in_progress))
+        db.session.commit()
+
+        self.assertEqual(count_listing_queries(), queries_before)
+
     def test_filter_orders_by_status(self):
         """
         This function tests the filter_orders_by_status function
@@ -110,6 +163,59 @@ class TestOrderService(BaseTest):
         self.assertEqual(order.seller_id, 1)
         self.assertEqual(order.product_id, 1)
 
+    def test_create_orders(self):
+        """
+        This function tests the create_orders function
+        """
+        logger.info('Testing create_orders function')
+        Product.query.update({Product.inventory: 10})
+        db.session.commit()
+
+        created = create_orders([
+            {'quantity': 2, 'customer_details': 'Customer details', 'status': 'In progress', 'seller_id': 1,
+             'product_id': 1},
+            {'quantity': 3, 'customer_details': 'Customer details', 'status': Status.in_progress, 'seller_id': 1,
+             'product_id': 1},
+            {'quantity': 4, 'customer_details': 'Customer details', 'status': 'Complete', 'seller_id': 2,
+             'product_id': 3},
+        ])
+        self.assertEqual(created, 3)
+        self.assertEqual(len(get_orders()), 9)
+        self.assertEqual(get_order_by_id(9).status, Status.complete)
+        self.assertEqual(Product.query.filter_by(id=1).first().ordered_quantity, 6)
+        self.assertEqual(Product.query.filter_by(id=1).first().inventory, 5)
+        self.assertEqual(Product.query.filter_by(id=3).first().inventory, 6)
+        self.assertEqual(rebuild_ordered_quantity(check_only=True), [])
+
+        self.assertEqual(create_orders([]), 0)
+
+        with self.assertRaises(OutOfStock):
+            create_orders([{'quantity': 1, 'customer_details': 'Customer details', 'status': 'Complete',
+                            'seller_id': 1, 'product_id': 1},
+                           {'quantity': 7, 'customer_details': 'Customer details', 'status': 'Complete',
+                            'seller_id': 2, 'product_id': 3}])
+        self.assertEqual(len(get_orders()), 9)
+        self.assertEqual(Product.query.filter_by(id=1).first().inventory, 5)
+
+    def test_update_orders_status(self):
+        """
+        This function tests the update_orders_status function
+        """
+        logger.info('Testing update_orders_status function')
+        ordered = lambda product_id: Product.query.filter_by(id=product_id).first().ordered_quantity
+
+        self.assertEqual(update_orders_status(Status.complete, order_ids=[1, 2, 3, 4], seller_id=1), 2)
+        self.assertEqual(get_order_by_id(2).status, Status.complete)
+        self.assertEqual(get_order_by_id(4).status, Status.in_progress)
+        self.assertEqual((ordered(1), ordered(2)), (0, 0))
+
+        self.assertEqual(update_orders_status('In progress', current_status='Complete'), 4)
+        self.assertEqual(len(get_orders_filtered(Status.in_progress)), 6)
+        self.assertEqual((ordered(1), ordered(2), ordered(4)), (1, 3, 5))
+
+        self.assertEqual(update_orders_status(Status.in_progress, order_ids=[1]), 0)
+        self.assertEqual(rebuild_ordered_quantity(check_only=True), [])
+
     def test_update_order(self):
         """
         This function tests the update_order function
@@ -143,6 +249,111 @@ class TestOrderService(BaseTest):
 
         self.assertFalse(update_order(-1))
 
+    def test_product_ordered_quantity(self):
+        """
+        This function tests that order writes keep the ordered quantity of products up to date
+        """
+        logger.info('Testing ordered quantity maintenance')
+        ordered = lambda product_id: Product.query.filter_by(id=product_id).first().ordered_quantity
+        Product.query.update({Product.inventory: 20})
+        db.session.commit()
+
+        create_order(5, 'Customer details', Status.in_progress, 1, 1)
+        create_order(5, 'Customer details', Status.complete, 1, 1)
+        self.assertEqual(ordered(1), 6)
+
+        update_order(1, quantity=3)
+        self.assertEqual(ordered(1), 8)
+
+        update_order(1, product_id=2)
+        self.assertEqual(ordered(1), 5)
+        self.assertEqual(ordered(2), 5)
+
+        update_order(1, status=Status.complete)
+        self.assertEqual(ordered(2), 2)
+
+        update_order(3, status='In progress', product_id=1)
+        self.assertEqual(ordered(1), 6)
+
+        delete_order(3)
+        self.assertEqual(ordered(1), 5)
+
+        self.assertEqual(rebuild_ordered_quantity(check_only=True), [])
+
+    def test_inventory_reservation(self):
+        """
+        This function tests that order writes take their quantities from the inventory of products and return them
+        """
+        logger.info('Testing inventory reservation')
+        inventory = lambda product_id: Product.query.filter_by(id=product_id).first().inventory
+        Product.query.update({Product.inventory: 5})
+        db.session.commit()
+
+        order = create_order(3, 'Customer details', Status.complete, 1, 1)
+        self.assertEqual(inventory(1), 2)
+
+        with self.assertRaises(OutOfStock):
+            create_order(3, 'Customer details', Status.complete, 1, 1)
+        self.assertEqual(inventory(1), 2)
+        self.assertEqual(len(get_orders()), 7)
+
+        update_order(order.id, quantity=5)
+        self.assertEqual(inventory(1), 0)
+        with self.assertRaises(OutOfStock):
+            update_order(order.id, quantity=6)
+        self.assertEqual(get_order_by_id(order.id).quantity, 5)
+
+        update_order(order.id, quantity=1)
+        self.assertEqual(inventory(1), 4)
+
+        update_order(order.id, product_id=2)
+        self.assertEqual((inventory(1), inventory(2)), (5, 4))
+        with self.assertRaises(OutOfStock):
+            update_order(order.id, quantity=6, product_id=3)
+        self.assertEqual((inventory(2), inventory(3)), (4, 5))
+
+        delete_order(order.id)
+        self.assertEqual(inventory(2), 5)
+
+        orders = [{'quantity': quantity, 'customer_details': 'Customer details', 'status': Status.complete,
+                   'seller_id': 1, 'product_id': product_id} for product_id, quantity in [(1, 5), (2, 6), (3, 6)]]
+        with self.assertRaises(OutOfStock) as context:
+            create_orders(orders)
+        self.assertEqual(context.exception.product_ids, [2, 3])
+        self.assertEqual([inventory(1), inventory(2), inventory(3)], [5, 5, 5])
+
+    def test_concurrent_orders(self):
+        """
+        This function tests that concurrent orders don't take more than the inventory of a product
+        """
+        logger.info('Testing concurrent inventory reservation')
+        with tempfile.TemporaryDirectory() as directory:
+            app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': f'sqlite:///{directory}/orders.db',
+                                          'TESTING': True, 'SECRET_KEY': 'test_key'})
+            with app.app_context():
+                db.create_all()
+                self.populate_db()
+                Product.query.filter_by(id=1).update({Product.inventory: 20})
+                db.session.commit()
+
+            def place_order(_):
+                with app.app_context():
+                    try:
+                        create_order(1, 'Customer details', Status.in_progress, 1, 1)
+                    except OutOfStock:
+                        return False
+                    return True
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                placed = list(executor.map(place_order, range(50)))
+
+            with app.app_context():
+                self.assertEqual(sum(placed), 20)
+                self.assertEqual(Product.query.filter_by(id=1).first().inventory, 0)
+                self.assertEqual(Order.query.filter_by(product_id=1).count(), 21)
+                self.assertEqual(rebuild_ordered_quantity(check_only=True), [])
+                db.engine.dispose()
+
     def test_delete_order(self):
         """
         This function tests the delete_order function
@@ -3,9 +3,11 @@ This module contains the tests for the OrderAPI and OrdersAPI RESTful resources
 """
 
 from flask_login import login_user
+from sqlalchemy import event
 
 from tests.conftest import BaseTest, logger
-from ecom_app.models import Seller, Order
+from ecom_app.database import db
+from ecom_app.models import Seller, Product, Order
 
 
 class TestOrdersAPI(BaseTest):
@@ -46,6 +48,91 @@ class TestOrdersAPI(BaseTest):
             self.assertEqual(response.status_code, 200)
             self.assertEqual(len(response.json), 2)
 
+    def test_get_paginated(self):
+        """
+        This function tests the cursor pagination of the get method
+        """
+        logger.info('Testing get method pagination')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/orders', query_string={'limit': 4})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([order['id'] for order in response.json['items']], [1, 2, 3, 4])
+
+            response = self.client.get('/api/orders', query_string={'limit': 4, 'after': response.json['next']})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([order['id'] for order in response.json['items']], [5, 6])
+            self.assertIsNone(response.json['next'])
+
+            response = self.client.get('/api/orders', query_string={'limit': 1, 'status': 'In progress'})
+            response = self.client.get('/api/orders', query_string={'limit': 2, 'status': 'In progress',
+                                                                    'after': response.json['next']})
+            self.assertEqual([order['id'] for order in response.json['items']], [2, 4])
+
+            response = self.client.get('/api/orders', query_string={'limit': 0})
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.get('/api/orders', query_string={'after': 'invalid'})
+            self.assertEqual(response.status_code, 400)
+
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/orders', query_string={'limit': 2})
+            self.assertEqual([order['id'] for order in response.json['items']], [4, 5])
+            response = self.client.get('/api/orders', query_string={'limit': 2, 'after': response.json['next']})
+            self.assertEqual([order['id'] for order in response.json['items']], [6])
+            self.assertIsNone(response.json['next'])
+
+    def test_get_streamed(self):
+        """
+        This function tests the streaming mode of the get method
+        """
+        logger.info('Testing get method streaming')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/orders', query_string={'stream': 1})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.json, self.client.get('/api/orders').json)
+
+            response = self.client.get('/api/orders', query_string={'stream': 1, 'status': 'Complete'})
+            self.assertEqual([order['id'] for order in response.json], [3, 6])
+
+            response = self.client.get('/api/orders', query_string={'stream': 1, 'limit': 2})
+            self.assertEqual(response.status_code, 400)
+
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/orders', query_string={'stream': 'true'})
+            self.assertEqual(sorted(order['id'] for order in response.json), [4, 5, 6])
+
+    def test_get_fields(self):
+        """
+        This function tests the sparse fieldsets of the get method
+        """
+        logger.info('Testing get method fields')
+        statements = []
+
+        def capture_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            event.listen(db.engine, 'before_cursor_execute', capture_statement)
+            try:
+                response = self.client.get('/api/orders', query_string={'fields': 'id,status,total'})
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', capture_statement)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json[0], {'id': 1, 'status': 'In progress', 'total': 100.0})
+            self.assertFalse(any('customer_details' in statement or 'products.description' in statement
+                                 for statement in statements))
+
+            response = self.client.get('/api/orders', query_string={'fields': 'id,date', 'stream': 1})
+            self.assertEqual(set(response.json[0]), {'id', 'date'})
+
+            response = self.client.get('/api/orders', query_string={'fields': 'id,seller_id'})
+            self.assertEqual(response.status_code, 400)
+
     def test_post(self):
         """
         This function tests the post method
@@ -64,6 +151,15 @@ class TestOrdersAPI(BaseTest):
             })
             self.assertEqual(response.status_code, 201)
 
+            response = self.client.post('/api/orders', follow_redirects=True, json={
+                'product_id': 1,
+                'quantity': 1,
+                'customer_details': 'test',
+                'status': 'In progress',
+            })
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json['message'], 'Product is out of stock')
+
             response = self.client.post('/api/orders', follow_redirects=True, json={
                 'product_id': 'a',
                 'quantity': 1,
@@ -105,6 +201,100 @@ class TestOrdersAPI(BaseTest):
             self.assertEqual(response.status_code, 400)
 
 
+class TestOrdersBulkAPI(BaseTest):
+    """
+    This class contains the tests for the OrdersBulkAPI RESTful resource
+    """
+    def test_post(self):
+        """
+        This function tests the post method
+        """
+        logger.info('Testing post method')
+        order = {'product_id': 1, 'quantity': 1, 'customer_details': 'test', 'status': 'In progress'}
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.post('/api/orders/bulk', json={'orders': [
+                order,
+                dict(order, product_id=3, quantity=3),
+                dict(order, quantity=0),
+                dict(order, product_id=10),
+                dict(order, status='a'),
+                {'product_id': 1},
+            ]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['created'], 2)
+            self.assertEqual([result['status'] for result in response.json['results']], [201, 201, 400, 400, 400, 400])
+            self.assertEqual(response.json['results'][3]['message'], 'Product is not valid')
+            self.assertEqual(Order.query.count(), 8)
+            self.assertTrue(all(order.seller_id == 2 for order in Order.query.filter(Order.id > 6)))
+
+            response = self.client.post('/api/orders/bulk', json={'orders': [dict(order, product_id=4),
+                                                                             dict(order, product_id=3),
+                                                                             dict(order, product_id=4, quantity=2)]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['created'], 2)
+            self.assertEqual([result['status'] for result in response.json['results']], [201, 409, 201])
+            self.assertEqual(response.json['results'][1]['message'], 'Product is out of stock')
+            self.assertEqual(Order.query.count(), 10)
+            self.assertEqual(db.session.get(Product, 4).inventory, 1)
+            self.assertEqual(db.session.get(Product, 3).inventory, 0)
+
+            response = self.client.post('/api/orders/bulk', json={'orders': [dict(order, product_id=4, quantity=2),
+                                                                             dict(order, product_id=3)]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['created'], 0)
+            self.assertEqual([result['status'] for result in response.json['results']], [409, 409])
+            self.assertEqual(Order.query.count(), 10)
+            self.assertEqual(db.session.get(Product, 4).inventory, 1)
+
+            response = self.client.post('/api/orders/bulk', json={'orders': []})
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.post('/api/orders/bulk', json=[order])
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.post('/api/orders/bulk', json={'orders': [order] * 10001})
+            self.assertEqual(response.status_code, 400)
+
+
+class TestOrdersStatusAPI(BaseTest):
+    """
+    This class contains the tests for the OrdersStatusAPI RESTful resource
+    """
+    def test_put(self):
+        """
+        This function tests the put method
+        """
+        logger.info('Testing put method')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.put('/api/orders/status', json={'status': 'Complete', 'ids': [1, 2, 4, 5]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['updated'], 2)
+            self.assertEqual(Order.query.filter_by(id=1).first().status.label, 'In progress')
+
+            response = self.client.put('/api/orders/status', json={'status': 'In progress',
+                                                                   'current_status': 'Complete'})
+            self.assertEqual(response.json['updated'], 3)
+
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.put('/api/orders/status', json={'status': 'Complete',
+                                                                   'current_status': 'In progress'})
+            self.assertEqual(response.json['updated'], 5)
+
+            response = self.client.put('/api/orders/status', json={'status': 'Complete'})
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.put('/api/orders/status', json={'status': 'a', 'ids': [1]})
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.put('/api/orders/status', json={'status': 'Complete', 'ids': ['a']})
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.put('/api/orders/status', json={'status': 'Complete', 'current_status': 'a'})
+            self.assertEqual(response.status_code, 400)
+
+
 class TestOrderAPI(BaseTest):
     """
     This class contains the tests for the OrderAPI RESTful resource
@@ -130,6 +320,23 @@ class TestOrderAPI(BaseTest):
             response = self.client.get('/api/order/10')
             self.assertEqual(response.status_code, 404)
 
+    def test_get_fields(self):
+        """
+        This function tests the sparse fieldsets of the get method
+        """
+        logger.info('Testing get method fields')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/order/4', query_string={'fields': 'product_name,quantity'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, {'product_name': 'Product 3', 'quantity': 3})
+
+            response = self.client.get('/api/order/1', query_string={'fields': 'quantity'})
+            self.assertEqual(response.status_code, 403)
+
+            response = self.client.get('/api/order/4', query_string={'fields': ','})
+            self.assertEqual(response.status_code, 400)
+
     def test_put(self):
         """
         This function tests the put method
@@ -151,6 +358,12 @@ class TestOrderAPI(BaseTest):
             })
             self.assertEqual(response.status_code, 200)
 
+            response = self.client.put('/api/order/1', json={
+                'quantity': 3,
+            })
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(db.session.get(Order, 1).quantity, 2)
+
             response = self.client.put('/api/order/1', json={
                 'product': 10,
             })
@@ -0,0 +1,57 @@
+"""
+This module contains the tests for the cached principal of the logged in seller
+"""
+
+from flask import current_app, g
+
+from tests.conftest import BaseTest, logger
+from ecom_app.models import Seller
+from ecom_app.principal import Principal, load_principal
+from ecom_app.service import seller_service
+
+
+class TestPrincipal(BaseTest):
+    """
+    This class contains the tests for the cached principal of the logged in seller
+    """
+    def test_load_principal(self):
+        """
+        This function tests that the principal is loaded from the cache and invalidated by the seller writes
+        """
+        logger.info('Testing load_principal function')
+        self.assertIsInstance(load_principal(2), Seller)
+
+        principal = load_principal(2)
+        self.assertIsInstance(principal, Principal)
+        self.assertEqual((principal.id, principal.is_admin), (2, False))
+        self.assertEqual(principal.email, seller_service.get_seller_by_id(2).email)
+        self.assertEqual(principal.get_id(), '2')
+
+        seller_service.update_seller(2, name='Seller renamed')
+        self.assertEqual(load_principal(2).name, 'Seller renamed')
+        self.assertEqual(load_principal(2).name, 'Seller renamed')
+
+        seller_service.delete_seller(2)
+        self.assertIsNone(load_principal(2))
+
+        current_app.extensions['principal_cache'] = None
+        self.assertIsInstance(load_principal(1), Seller)
+
+    def test_requests(self):
+        """
+        This function tests that only the first request of a logged in seller queries the sellers table
+        """
+        logger.info('Testing cached principal of requests')
+        with self.client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+
+        # The user loaded by a request is kept in g of the application context the tests share with the requests
+        for queries in ('2', '1', '1'):
+            g.pop('_login_user', None)
+            self.assertEqual(self.client.get('/api/sellers').headers['X-DB-Queries'], queries)
+        self.assertEqual(current_app.extensions['principal_cache'].hits, 2)
+
+        seller_service.update_seller(1, phone='+380961234567')
+        g.pop('_login_user', None)
+        self.assertEqual(self.client.get('/api/sellers').headers['X-DB-Queries'], '2')
@@ -2,8 +2,12 @@
 This module contains the tests for the product service functions
 """
 
+from flask_restful import marshal
+from sqlalchemy import event, inspect
+
 from tests.conftest import BaseTest, logger
 
+from ecom_app.rest.products_api import products_fields
 from ecom_app.service.product_service import *
 
 
@@ -20,6 +24,27 @@ class TestService(BaseTest):
         self.assertEqual(len(products), 4)
         self.assertTrue(all(isinstance(product, Product) for product in products))
 
+    def test_get_products_ordered(self):
+        """
+        This function tests that listed products come with their ordered quantity without loading their orders
+        """
+        logger.info('Testing get_products ordered quantity')
+        db.session.expunge_all()
+        statements = []
+
+        def count_statement(*args):
+            statements.append(args[2])
+
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+        try:
+            products = marshal(get_products(), products_fields)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([product['ordered'] for product in products], [1, 2, 3, 4])
+        self.assertTrue(all('orders' in inspect(product).unloaded for product in get_products_by_seller(1)))
+
     def test_get_products_filtered(self):
         """
         This function tests the get_products_filtered function
@@ -181,3 +206,22 @@ class TestService(BaseTest):
         products = get_products()
         self.assertEqual(len(products), 3)
         self.assertTrue(product not in products)
+
+    def test_rebuild_ordered_quantity(self):
+        """
+        This function tests the rebuild_ordered_quantity function
+        """
+        logger.info('Testing rebuild_ordered_quantity function')
+        self.assertEqual(rebuild_ordered_quantity(), [])
+
+        Product.query.filter_by(id=1).update({Product.ordered_quantity: 10})
+        Product.query.filter_by(id=4).update({Product.ordered_quantity: 0})
+        db.session.commit()
+
+        self.assertEqual(rebuild_ordered_quantity(check_only=True), [(1, 10, 1), (4, 0, 4)])
+        self.assertEqual(get_product_by_id(1).ordered, 10)
+
+        self.assertEqual(len(rebuild_ordered_quantity()), 2)
+        self.assertEqual(get_product_by_id(1).ordered, 1)
+        self.assertEqual(get_product_by_id(4).ordered, 4)
+        self.assertEqual(rebuild_ordered_quantity(check_only=True), [])
@@ -2,6 +2,8 @@
 This module contains the tests for the ProductAPI and ProductsAPI RESTful resources
 """
 
+import io
+
 from flask_login import login_user
 
 from tests.conftest import BaseTest, logger
@@ -86,6 +88,69 @@ class TestProductsAPI(BaseTest):
             self.assertEqual(response.status_code, 200)
             self.assertEqual(len(response.json), 1)
 
+    def test_get_paginated(self):
+        """
+        This function tests the cursor pagination of the get method
+        """
+        logger.info('Testing get method pagination')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/products', query_string={'limit': 3})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([product['id'] for product in response.json['items']], [1, 2, 3])
+
+            response = self.client.get('/api/products', query_string={'limit': 3, 'after': response.json['next']})
+            self.assertEqual([product['id'] for product in response.json['items']], [4])
+            self.assertIsNone(response.json['next'])
+
+            response = self.client.get('/api/products', query_string={'limit': 1, 'inventory_from': 2})
+            response = self.client.get('/api/products', query_string={'limit': 1, 'inventory_from': 2,
+                                                                      'after': response.json['next']})
+            self.assertEqual([product['id'] for product in response.json['items']], [3])
+
+            response = self.client.get('/api/products', query_string={'limit': 'a'})
+            self.assertEqual(response.status_code, 400)
+
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/products', query_string={'limit': 1})
+            self.assertEqual([product['id'] for product in response.json['items']], [3])
+
+    def test_get_streamed(self):
+        """
+        This function tests the streaming mode of the get method
+        """
+        logger.info('Testing get method streaming')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/products', query_string={'stream': 1})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.json, self.client.get('/api/products').json)
+
+            response = self.client.get('/api/products', query_string={'stream': 1, 'ordered_from': 3})
+            self.assertEqual([product['id'] for product in response.json], [3, 4])
+
+            response = self.client.get('/api/products', query_string={'stream': 'a'})
+            self.assertEqual(response.status_code, 400)
+
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/products', query_string={'stream': 1})
+            self.assertEqual([product['id'] for product in response.json], [3, 4])
+
+    def test_get_fields(self):
+        """
+        This function tests the sparse fieldsets of the get method
+        """
+        logger.info('Testing get method fields')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/products', query_string={'fields': 'name,ordered', 'limit': 1})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['items'], [{'name': 'Product 1', 'ordered': 1}])
+
+            response = self.client.get('/api/products', query_string={'fields': 'seller'})
+            self.assertEqual(response.status_code, 400)
+
     def test_post(self):
         """
         This function tests the post method
@@ -137,6 +202,41 @@ class TestProductsAPI(BaseTest):
             self.assertEqual(response.status_code, 200)
 
 
+class TestProductsImportAPI(BaseTest):
+    """
+    This class contains the tests for the ProductsImportAPI RESTful resource
+    """
+    def test_post(self):
+        """
+        This function tests the post method
+        """
+        logger.info('Testing post method')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.post('/api/products/import', content_type='text/csv',
+                                        data='name,description,price,inventory\nProduct 5,Description 5,500,5\n')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['created'], 1)
+            self.assertEqual(Product.query.filter_by(name='Product 5').first().seller_id, 2)
+
+            response = self.client.post('/api/products/import', data={
+                'file': (io.BytesIO(b'{"name": "Product 4", "description": "D", "price": 1, "inventory": 1}\n'
+                                    b'{"name": "Product 1", "description": "D", "price": 1, "inventory": 1}\n'),
+                         'products.ndjson'),
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['updated'], 1)
+            self.assertEqual(response.json['errors'], [{'row': 2, 'message': 'Name is used by another seller'}])
+
+            response = self.client.post('/api/products/import', content_type='text/plain', data='a')
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.post('/api/products/import', query_string={'format': 'csv'},
+                                        data=b'name,description\n\xff\xfe\n')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['errors'], [{'row': 2, 'message': 'Invalid encoding'}])
+
+
 class TestProductAPI(BaseTest):
     """
     This class contains the tests for the ProductAPI RESTful resource
@@ -161,6 +261,17 @@ class TestProductAPI(BaseTest):
             response = self.client.get('/api/product/1')
             self.assertEqual(response.status_code, 403)
 
+    def test_get_fields(self):
+        """
+        This function tests the sparse fieldsets of the get method
+        """
+        logger.info('Testing get method fields')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/product/3', query_string={'fields': 'price'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, {'price': 300.0})
+
     def test_put(self):
         """
         This function tests the put method
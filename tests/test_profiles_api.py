@@ -0,0 +1,84 @@
+"""
+This module contains the tests for the request profiling and the ProfilesAPI and ProfileAPI RESTful resources
+"""
+
+import tempfile
+
+from flask import current_app
+from flask_login import login_user
+
+from tests.conftest import BaseTest, logger
+from ecom_app.models import Seller
+
+
+class TestProfiling(BaseTest):
+    """
+    This class contains the tests for the request profiling
+    """
+    def setUp(self):
+        """
+        This function sets up the test environment with a temporary instance folder
+        """
+        super().setUp()
+        self.instance_dir = tempfile.TemporaryDirectory()
+        current_app.instance_path = self.instance_dir.name
+
+    def tearDown(self):
+        """
+        This function removes the temporary instance folder
+        """
+        super().tearDown()
+        self.instance_dir.cleanup()
+
+    def test_profile_header(self):
+        """
+        This function tests that only administrators can profile a request with the header
+        """
+        logger.info('Testing profile header')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/products', query_string={'ordered_from': 1},
+                                       headers={'X-Profile': '1'})
+            self.assertEqual(response.status_code, 200)
+            profile_id = response.headers['X-Profile-Id']
+
+            self.assertNotIn('X-Profile-Id', self.client.get('/api/products').headers)
+
+            response = self.client.get('/api/profiles')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json), 1)
+            self.assertEqual(response.json[0]['id'], profile_id)
+            self.assertEqual(response.json[0]['path'], '/api/products?ordered_from=1')
+            self.assertEqual(response.json[0]['endpoint'], 'rest_api.productsapi')
+
+            response = self.client.get(f'/api/profile/{profile_id}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['Content-Disposition'], f'attachment; filename={profile_id}.prof')
+
+            response = self.client.get(f'/api/profile/{profile_id}', query_string={'format': 'text'})
+            self.assertIn('cumulative', response.get_data(as_text=True))
+
+            self.assertEqual(self.client.get('/api/profile/..%2Finstance').status_code, 404)
+            self.assertEqual(self.client.get('/api/profile/00000000000000000000-00000000').status_code, 404)
+
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            response = self.client.get('/api/products', headers={'X-Profile': '1'})
+            self.assertNotIn('X-Profile-Id', response.headers)
+            self.assertEqual(self.client.get('/api/profiles').status_code, 403)
+            self.assertEqual(self.client.get(f'/api/profile/{profile_id}').status_code, 403)
+
+    def test_profile_endpoints(self):
+        """
+        This function tests the profiling of the endpoints of the allowlist and the limit of stored profiles
+        """
+        logger.info('Testing profile endpoints')
+        current_app.config['PROFILE_ENDPOINTS'] = ['rest_api.ordersapi']
+        current_app.config['MAX_STORED_PROFILES'] = 2
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=False).first())
+            profile_ids = [self.client.get('/api/orders').headers['X-Profile-Id'] for _ in range(3)]
+            self.assertNotIn('X-Profile-Id', self.client.get('/api/products').headers)
+
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/profiles')
+            self.assertEqual([profile['id'] for profile in response.json], profile_ids[:0:-1])
@@ -0,0 +1,103 @@
+"""
+This module contains the tests for the query plans of the service functions
+"""
+
+from sqlalchemy import event, text
+
+from tests.conftest import BaseTest, logger
+from ecom_app.database import db
+from ecom_app.models import Status
+from ecom_app.service import order_service, product_service, seed_service, seller_service
+
+
+class TestQueryPlans(BaseTest):
+    """
+    This class contains the tests that check the service queries are served by indexes
+    """
+    def setUp(self):
+        """
+        This function adds enough rows and statistics for SQLite to plan the queries as it does on real data
+        """
+        super().setUp()
+        seed_service.seed(20, 500, 5000)
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+    def get_plans(self, service_function, *args):
+        """
+        This function runs the service function and returns its statements with the details of their SQLite plans
+        :param service_function: service function to run
+        :param args: arguments of the service function
+        """
+        statements = []
+
+        def capture_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', capture_statement)
+        try:
+            service_function(*args)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture_statement)
+
+        self.assertTrue(statements)
+        return [(statement, [row[-1] for row in db.session.connection().exec_driver_sql(
+            'EXPLAIN QUERY PLAN ' + statement, parameters
+        ).all()]) for statement, parameters in statements]
+
+    def assert_no_full_scan(self, service_function, *args):
+        """
+        This function runs the service function and fails if SQLite plans a full scan for any of its queries
+        :param service_function: service function to check
+        :param args: arguments of the service function
+        """
+        for statement, plan in self.get_plans(service_function, *args):
+            scans = [detail for detail in plan if detail.startswith('SCAN')]
+            self.assertEqual(scans, [], f'{service_function.__name__} scans a table: {statement}')
+
+    def assert_keyset_listing(self, service_function, after):
+        """
+        This function fails if SQLite plans a sort for the pages of a listing, or a scan for its pages after the first.
+        The first page is read in id order from the start of the table, which stops at the page limit
+        :param service_function: listing service function taking the limit and after arguments
+        :param after: id to read the page after
+        """
+        for page_after in (None, after):
+            for statement, plan in self.get_plans(service_function, 20, page_after):
+                sorts = [detail for detail in plan if detail.startswith('USE TEMP B-TREE')]
+                self.assertEqual(sorts, [], f'{service_function.__name__} sorts a page: {statement}')
+                if page_after is not None:
+                    scans = [detail for detail in plan if detail.startswith('SCAN')]
+                    self.assertEqual(scans, [], f'{service_function.__name__} scans a table: {statement}')
+
+    def test_order_service_plans(self):
+        """
+        This function tests the query plans of the order service functions
+        """
+        logger.info('Testing order service query plans')
+        self.assert_keyset_listing(order_service.get_orders, 100)
+        self.assert_no_full_scan(order_service.get_orders_filtered, Status.in_progress)
+        self.assert_no_full_scan(order_service.get_order_by_id, 1)
+        self.assert_no_full_scan(order_service.get_orders_by_seller, 1)
+        self.assert_no_full_scan(order_service.get_orders_by_seller_filtered, 1, Status.in_progress)
+
+    def test_product_service_plans(self):
+        """
+        This function tests the query plans of the product service functions
+        """
+        logger.info('Testing product service query plans')
+        self.assert_keyset_listing(product_service.get_products, 100)
+        self.assert_no_full_scan(product_service.get_products_filtered, 1, 3, None, None)
+        self.assert_no_full_scan(product_service.get_products_filtered, None, None, 1, 3)
+        self.assert_no_full_scan(product_service.get_product_by_id, 1)
+        self.assert_no_full_scan(product_service.get_product_by_name, 'Product 1')
+        self.assert_no_full_scan(product_service.get_products_by_seller, 1)
+        self.assert_no_full_scan(product_service.get_products_by_seller_filtered, 1, 1, 3, 1, 3)
+
+    def test_seller_service_plans(self):
+        """
+        This function tests the query plans of the seller service functions
+        """
+        logger.info('Testing seller service query plans')
+        self.assert_no_full_scan(seller_service.get_seller_by_id, 1)
+        self.assert_no_full_scan(seller_service.get_seller_by_email, 'seller1@example.com')
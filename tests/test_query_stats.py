@@ -0,0 +1,55 @@
+"""
+This module contains the tests for the query statistics of the requests
+"""
+
+import json
+
+from flask import current_app
+from flask_login import login_user
+
+from tests.conftest import BaseTest, logger
+from ecom_app.models import Seller
+from ecom_app.query_stats import QueryBudgetExceeded
+
+
+class TestQueryStats(BaseTest):
+    """
+    This class contains the tests for the query statistics of the requests
+    """
+    def test_headers(self):
+        """
+        This function tests the query statistics headers and log line
+        """
+        logger.info('Testing query statistics headers')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            with self.assertLogs('ecom_app.query_stats', level='INFO') as logs:
+                response = self.client.get('/api/orders')
+
+            self.assertEqual(response.headers['X-DB-Queries'], '2')
+            self.assertGreater(float(response.headers['X-DB-Time']), 0)
+
+            stats = json.loads(logs.records[-1].getMessage())
+            self.assertEqual(stats['endpoint'], 'rest_api.ordersapi')
+            self.assertEqual(stats['status'], 200)
+            self.assertEqual(stats['db_queries'], 2)
+
+    def test_budget_exceeded(self):
+        """
+        This function tests that exceeding a query budget fails under tests and logs a warning otherwise
+        """
+        logger.info('Testing query budgets')
+        current_app.config['DB_QUERY_BUDGETS'] = {'GET rest_api.ordersapi': 0}
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/orders')
+
+            response = self.client.get('/api/products')
+            self.assertEqual(response.status_code, 200)
+
+            current_app.config['DB_QUERY_BUDGETS_RAISE'] = False
+            with self.assertLogs('ecom_app.query_stats', level='WARNING') as logs:
+                response = self.client.get('/api/orders')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('the budget of GET rest_api.ordersapi is 0', logs.output[-1])
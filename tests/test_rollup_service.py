@@ -0,0 +1,126 @@
+"""
+This module contains the tests for the rollup service functions and the SalesReportAPI RESTful resource
+"""
+
+from datetime import date, timedelta
+
+from flask_login import login_user, logout_user
+
+from tests.conftest import BaseTest, logger
+from ecom_app.database import db
+from ecom_app.models import Seller, Product, Order, OrderDailyRollup
+from ecom_app.service import order_service, product_service, seller_service
+from ecom_app.service.rollup_service import get_orders_select, get_sales, rebuild_rollup
+
+
+class TestService(BaseTest):
+    """
+    This class contains the tests for the rollup service functions
+    """
+    def assertRollupMatchesOrders(self):
+        """
+        This function asserts that the rollup rows contain the quantity and revenue of the orders
+        """
+        rollup = {(row.seller_id, row.product_id, row.day, row.status.name, row.quantity, round(row.revenue, 2))
+                  for row in OrderDailyRollup.query.filter(OrderDailyRollup.quantity != 0)}
+        orders = {(seller_id, product_id, day, status.name, quantity, round(revenue, 2))
+                  for seller_id, product_id, day, status, quantity, revenue in db.session.execute(get_orders_select())}
+        self.assertEqual(rollup, orders)
+
+    def test_writes(self):
+        """
+        This function tests that the writes of orders, products and sellers keep the rollup up to date
+        """
+        logger.info('Testing rollup writes')
+        Product.query.update({Product.inventory: 20})
+        db.session.commit()
+        self.assertRollupMatchesOrders()
+
+        order_service.create_order(2, 'Customer', 'In progress', 1, 3)
+        self.assertRollupMatchesOrders()
+        order_service.create_orders([{'quantity': 1, 'customer_details': 'Customer', 'status': 'Complete',
+                                      'seller_id': 2, 'product_id': 1},
+                                     {'quantity': 3, 'customer_details': 'Customer', 'status': 'Complete',
+                                      'seller_id': 2, 'product_id': 1}])
+        self.assertRollupMatchesOrders()
+        order_service.update_orders_status('Complete', current_status='In progress', seller_id=1)
+        self.assertRollupMatchesOrders()
+        order_service.update_order(4, quantity=7, status='Complete', product_id=1)
+        self.assertRollupMatchesOrders()
+        order_service.update_order(5, customer_details='Other customer')
+        self.assertRollupMatchesOrders()
+        order_service.delete_order(6)
+        self.assertRollupMatchesOrders()
+        product_service.update_product(1, price=150)
+        self.assertRollupMatchesOrders()
+        product_service.upsert_products([{'name': 'Product 3', 'description': 'Description', 'price': 50,
+                                          'inventory': 5}], 2)
+        self.assertRollupMatchesOrders()
+        product_service.delete_product(2)
+        self.assertRollupMatchesOrders()
+        seller_service.delete_seller(2)
+        self.assertRollupMatchesOrders()
+
+    def test_get_sales(self):
+        """
+        This function tests the sales read from the rollup
+        """
+        logger.info('Testing get_sales function')
+        today = db.session.execute(get_orders_select()).first()[2]
+
+        self.assertEqual(get_sales(), [{'day': today, 'quantity': 12, 'revenue': 3600}])
+        self.assertEqual(get_sales(group_by=['product'], seller_id=1),
+                         [{'product_id': 1, 'quantity': 1, 'revenue': 100},
+                          {'product_id': 2, 'quantity': 3, 'revenue': 600}])
+        self.assertEqual(get_sales(group_by=['seller', 'status'], status='complete'),
+                         [{'seller_id': 1, 'status': order_service.Status.complete, 'quantity': 1, 'revenue': 200},
+                          {'seller_id': 2, 'status': order_service.Status.complete, 'quantity': 1, 'revenue': 400}])
+        self.assertEqual(get_sales(today + timedelta(days=1)), [])
+        self.assertEqual(len(get_sales(today, today)), 1)
+
+    def test_rebuild_rollup(self):
+        """
+        This function tests the rebuild of the rollup from the orders
+        """
+        logger.info('Testing rebuild_rollup function')
+        Order.query.filter_by(id=1).update({Order.quantity: 5})
+        db.session.commit()
+
+        self.assertEqual(rebuild_rollup(), 6)
+        self.assertRollupMatchesOrders()
+
+
+class TestSalesReportAPI(BaseTest):
+    """
+    This class contains the tests for the SalesReportAPI RESTful resource
+    """
+    def test_get(self):
+        """
+        This function tests the GET request for a sales report
+        """
+        logger.info('Testing SalesReportAPI GET request')
+        with self.client:
+            login_user(db.session.get(Seller, 2))
+            response = self.client.get('/api/reports/sales?group_by=product,status')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, [
+                {'product_id': 3, 'status': 'In progress', 'quantity': 3, 'revenue': 900.0},
+                {'product_id': 4, 'status': 'Complete', 'quantity': 1, 'revenue': 400.0},
+                {'product_id': 4, 'status': 'In progress', 'quantity': 4, 'revenue': 1600.0},
+            ])
+
+            today = date.fromisoformat(self.client.get('/api/reports/sales').json[0]['day'])
+            response = self.client.get(f'/api/reports/sales?from={today}&to={today}&status=Complete')
+            self.assertEqual(response.json, [{'day': today.isoformat(), 'quantity': 1, 'revenue': 400.0}])
+            self.assertEqual(self.client.get(f'/api/reports/sales?to={today - timedelta(days=1)}').json, [])
+
+            for query in ('from=yesterday', f'from={today}&to={today - timedelta(days=1)}', 'group_by=week',
+                          'group_by=day,day', 'status=Lost'):
+                self.assertEqual(self.client.get(f'/api/reports/sales?{query}').status_code, 400)
+            self.assertEqual(self.client.get('/api/reports/sales?group_by=seller').status_code, 403)
+
+            logout_user()
+            login_user(db.session.get(Seller, 1))
+            response = self.client.get('/api/reports/sales?group_by=seller')
+            self.assertEqual(response.json, [{'seller_id': 1, 'quantity': 4, 'revenue': 700.0},
+                                             {'seller_id': 2, 'quantity': 8, 'revenue': 2900.0}])
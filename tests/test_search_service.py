@@ -0,0 +1,115 @@
+"""
+This module contains the tests for the search service functions and the ProductsSearchAPI RESTful resource
+"""
+
+from flask_login import login_user, logout_user
+
+from tests.conftest import BaseTest, logger
+from ecom_app.database import db
+from ecom_app.models import Seller
+from ecom_app.service import product_service, seller_service
+from ecom_app.service.search_service import get_search_words, search_products, rebuild_index, products_fts
+
+
+class TestService(BaseTest):
+    """
+    This class contains the tests for the search service functions
+    """
+    def search(self, text, seller_id=None):
+        """
+        This function returns the names of the products found by the search text
+        :param text: search text
+        :param seller_id: id of the seller of the products, None for all sellers
+        """
+        return [product.name for product, _ in search_products(text, seller_id)]
+
+    def test_search_products(self):
+        """
+        This function tests the ranked search of products by the words of their names and descriptions
+        """
+        logger.info('Testing search_products function')
+        self.assertEqual(get_search_words(' "Red", chair-2!'), ['Red', 'chair', '2'])
+        self.assertEqual(self.search('product'), ['Product 1', 'Product 2', 'Product 3', 'Product 4'])
+        self.assertEqual(self.search('descr 3'), ['Product 3'])
+        self.assertEqual(self.search('product', seller_id=2), ['Product 3', 'Product 4'])
+        self.assertEqual(self.search('product 5'), [])
+        self.assertEqual(self.search('  *" '), [])
+
+        product_service.create_product('Oak chair', 'Chair chair chair', 10, 1, 1)
+        product_service.create_product('Oak table', 'Table for one chair', 10, 1, 1)
+        self.assertEqual(self.search('table oak'), ['Oak table'])
+        self.assertEqual(self.search('chair'), ['Oak chair', 'Oak table'])
+
+        first_page = search_products('product', limit=3)
+        product, score = first_page[-1]
+        second_page = search_products('product', limit=3, after=(score, product.id))
+        self.assertEqual([product.name for product, _ in first_page + second_page],
+                         ['Product 1', 'Product 2', 'Product 3', 'Product 4'])
+
+    def test_writes(self):
+        """
+        This function tests that the writes of products and sellers keep the search index up to date
+        """
+        logger.info('Testing search index writes')
+        product_service.update_product(1, name='Walnut desk')
+        self.assertEqual(self.search('walnut'), ['Walnut desk'])
+        self.assertEqual(self.search('product'), ['Product 2', 'Product 3', 'Product 4'])
+
+        product_service.update_product(2, description='Made of walnut')
+        self.assertEqual(self.search('walnut'), ['Walnut desk', 'Product 2'])
+
+        product_service.upsert_products([{'name': 'Product 3', 'description': 'Walnut shelf', 'price': 50,
+                                          'inventory': 5},
+                                         {'name': 'Walnut bed', 'description': 'Bed', 'price': 50,
+                                          'inventory': 5}], 2)
+        self.assertEqual(set(self.search('walnut')), {'Walnut desk', 'Product 2', 'Product 3', 'Walnut bed'})
+
+        product_service.delete_product(1)
+        self.assertEqual(set(self.search('walnut')), {'Product 2', 'Product 3', 'Walnut bed'})
+
+        seller_service.delete_seller(2)
+        self.assertEqual(self.search('walnut'), ['Product 2'])
+
+    def test_rebuild_index(self):
+        """
+        This function tests the rebuild of the search index from the products
+        """
+        logger.info('Testing rebuild_index function')
+        db.session.execute(products_fts.delete())
+        db.session.commit()
+        self.assertEqual(self.search('product'), [])
+
+        self.assertEqual(rebuild_index(), 4)
+        self.assertEqual(self.search('product'), ['Product 1', 'Product 2', 'Product 3', 'Product 4'])
+
+
+class TestProductsSearchAPI(BaseTest):
+    """
+    This class contains the tests for the ProductsSearchAPI RESTful resource
+    """
+    def test_get(self):
+        """
+        This function tests the GET request for a search of products
+        """
+        logger.info('Testing ProductsSearchAPI GET request')
+        with self.client:
+            login_user(db.session.get(Seller, 2))
+            response = self.client.get('/api/products/search?q=descr')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([item['name'] for item in response.json['items']], ['Product 3', 'Product 4'])
+            self.assertIsNone(response.json['next'])
+            self.assertIn('score', response.json['items'][0])
+
+            for query in ('', 'q=', 'q=*', 'q=product&limit=0', 'q=product&after=invalid'):
+                self.assertEqual(self.client.get(f'/api/products/search?{query}').status_code, 400)
+
+            logout_user()
+            login_user(db.session.get(Seller, 1))
+            names = []
+            url = '/api/products/search?q=product&limit=3'
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                names += [item['name'] for item in response.json['items']]
+                url = response.json['next'] and f'/api/products/search?q=product&limit=3&after={response.json["next"]}'
+            self.assertEqual(names, ['Product 1', 'Product 2', 'Product 3', 'Product 4'])
@@ -0,0 +1,78 @@
+"""
+This module contains the tests for the seed service functions
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from tests.conftest import BaseTest, logger
+
+from ecom_app.service.seed_service import *
+from ecom_app.service.product_service import rebuild_ordered_quantity
+from ecom_app.models import OrderDailyRollup
+
+
+class TestService(BaseTest):
+    """
+    This class contains the tests for the seed functions
+    """
+    end = datetime(2023, 3, 1)
+
+    def get_seeded_orders(self):
+        """
+        This function returns the values of the seeded orders
+        """
+        return [(order.date, order.quantity, order.customer_details, order.status, order.seller_id, order.product_id)
+                for order in Order.query.filter(Order.id > 6).order_by(Order.id)]
+
+    def test_seed(self):
+        """
+        This function tests the seed function
+        """
+        logger.info('Testing seed function')
+        summary = seed(5, 50, 2000, years=2, end=self.end, batch_size=300)
+        self.assertEqual(summary, {'sellers': 5, 'products': 50, 'orders': 2000})
+
+        self.assertEqual(Seller.query.count(), 7)
+        self.assertEqual(Product.query.count(), 54)
+        self.assertEqual(Order.query.count(), 2006)
+        self.assertEqual(rebuild_ordered_quantity(check_only=True), [])
+
+        orders = self.get_seeded_orders()
+        self.assertTrue(all(self.end - timedelta(days=730) <= order[0] <= self.end for order in orders))
+        self.assertGreater(sum(order[0] > self.end - timedelta(days=365) for order in orders), len(orders) / 2)
+
+        statuses = Counter(order[3] for order in orders)
+        self.assertTrue(100 < statuses[Status.in_progress] < 300)
+
+        popularity = Counter(order[5] for order in orders).most_common()
+        self.assertGreater(popularity[0][1], 10 * popularity[-1][1])
+        self.assertTrue(all(order[4] == db.session.get(Product, order[5]).seller_id for order in orders[:50]))
+
+    def test_seed_deterministic(self):
+        """
+        This function tests that the seed function generates the same dataset from the same seed
+        """
+        logger.info('Testing seed function determinism')
+        seed(2, 10, 100, random_seed=7, end=self.end)
+        orders = self.get_seeded_orders()
+
+        OrderDailyRollup.query.filter(OrderDailyRollup.product_id > 4).delete()
+        Order.query.filter(Order.id > 6).delete()
+        Product.query.filter(Product.id > 4).delete()
+        Seller.query.filter(Seller.id > 2).delete()
+        db.session.commit()
+
+        seed(2, 10, 100, random_seed=7, end=self.end)
+        self.assertEqual(self.get_seeded_orders(), orders)
+
+        seed(2, 10, 100, random_seed=8, end=self.end)
+        self.assertNotEqual([order[:4] for order in self.get_seeded_orders()[100:]], [order[:4] for order in orders])
+
+    def test_seed_not_valid(self):
+        """
+        This function tests the seed function with orders without products
+        """
+        logger.info('Testing seed function with invalid counts')
+        with self.assertRaises(ValueError):
+            seed(1, 0, 10)
@@ -108,3 +108,21 @@ class TestSellerService(BaseTest):
         self.assertEqual(Seller.query.filter_by(id=3).first(), None)
 
         self.assertFalse(delete_seller(seller_id=-1))
+
+    def test_delete_seller_releases_inventory(self):
+        """
+        This function tests that deleting a seller returns the quantities of its orders to the inventory of the
+        products of the other sellers
+        """
+        logger.info('Testing delete_seller function releasing inventory')
+        Product.query.filter_by(id=1).update({Product.inventory: 10})
+        db.session.commit()
+        create_seller(name='Seller 3', email='seller3@example.com', phone='1234567890', password='password',
+                      is_admin=False)
+        order_service.create_order(3, 'Customer details', Status.in_progress, 3, 1)
+        order_service.create_order(2, 'Customer details', Status.complete, 3, 1)
+        self.assertEqual(db.session.get(Product, 1).inventory, 5)
+
+        self.assertTrue(delete_seller(seller_id=3))
+        product = db.session.get(Product, 1)
+        self.assertEqual((product.inventory, product.ordered_quantity), (10, 1))
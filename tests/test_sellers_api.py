@@ -28,6 +28,39 @@ class TestSellersAPI(BaseTest):
             response = self.client.get('/api/sellers')
             self.assertEqual(response.status_code, 403)
 
+    def test_get_paginated(self):
+        """
+        This function tests the cursor pagination of the get method
+        """
+        logger.info('Testing get method pagination')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/sellers', query_string={'limit': 1})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([seller['id'] for seller in response.json['items']], [1])
+
+            response = self.client.get('/api/sellers', query_string={'limit': 1, 'after': response.json['next']})
+            self.assertEqual([seller['id'] for seller in response.json['items']], [2])
+            self.assertIsNone(response.json['next'])
+
+    def test_get_fields(self):
+        """
+        This function tests the sparse fieldsets of the get method
+        """
+        logger.info('Testing get method fields')
+        with self.client:
+            login_user(Seller.query.filter_by(is_admin=True).first())
+            response = self.client.get('/api/sellers', query_string={'fields': 'id,email'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, [{'id': 1, 'email': 'seller1@example.com'},
+                                             {'id': 2, 'email': 'seller2@example.com'}])
+
+            response = self.client.get('/api/seller', query_string={'fields': 'name'})
+            self.assertEqual(response.json, {'name': 'Seller 1'})
+
+            response = self.client.get('/api/seller', query_string={'fields': 'password'})
+            self.assertEqual(response.status_code, 400)
+
     def test_post(self):
         """
         This function tests the post method
@@ -0,0 +1,124 @@
+"""
+This module contains the tests for the signed API tokens and the TokensAPI RESTful resource
+"""
+
+import os
+import tempfile
+import time
+import uuid
+
+from flask import current_app, g
+from werkzeug.security import generate_password_hash
+
+from tests.conftest import BaseTest, logger
+from ecom_app import tokens
+from ecom_app.service import seller_service
+
+
+class TestTokens(BaseTest):
+    """
+    This class contains the tests for the signed API tokens
+    """
+    def get_token(self, email, password):
+        """
+        This function returns a token issued by the TokensAPI
+        :param email: email of the seller
+        :param password: password of the seller
+        """
+        response = self.client.post('/api/tokens', json={'email': email, 'password': password})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['token_type'], 'Bearer')
+        return response.json['token']
+
+    def request(self, method, url, token):
+        """
+        This function sends a request authenticated by the token
+        :param method: method of the request
+        :param url: url of the request
+        :param token: bearer token
+        """
+        # The user loaded by a request is kept in g of the application context the tests share with the requests
+        g.pop('_login_user', None)
+        return self.client.open(url, method=method, headers={'Authorization': f'Bearer {token}'})
+
+    def test_tokens_api(self):
+        """
+        This function tests that tokens authenticate requests without a query until they are revoked
+        """
+        logger.info('Testing TokensAPI')
+        response = self.client.post('/api/tokens', json={'email': 'seller1@example.com', 'password': 'invalid'})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.post('/api/tokens', json={'email': 'seller1@example.com'}).status_code, 400)
+
+        token = self.get_token('seller1@example.com', 'seller1password')
+        response = self.request('GET', '/api/sellers', token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-DB-Queries'], '1')
+
+        self.assertEqual(self.request('GET', '/api/sellers', token.rsplit('.', 1)[0] + '.forged').status_code, 401)
+
+        other_token = self.get_token('seller1@example.com', 'seller1password')
+        self.assertEqual(self.request('DELETE', '/api/tokens', token).status_code, 200)
+        self.assertEqual(self.request('GET', '/api/sellers', token).status_code, 401)
+        self.assertEqual(self.request('DELETE', '/api/tokens', token).status_code, 401)
+        self.assertEqual(self.request('GET', '/api/sellers', other_token).status_code, 200)
+
+    def test_seller_revocation(self):
+        """
+        This function tests that the tokens of a seller are revoked by the seller writes that change its access
+        """
+        logger.info('Testing seller token revocation')
+        token = self.get_token('seller2@example.com', 'seller2password')
+        self.assertEqual(self.request('GET', '/api/products', token).status_code, 200)
+        self.assertEqual(self.request('GET', '/api/sellers', token).status_code, 403)
+
+        seller_service.update_seller(2, name='Seller renamed')
+        self.assertEqual(self.request('GET', '/api/products', token).status_code, 200)
+
+        seller_service.update_seller(2, password=generate_password_hash('newpassword', method='sha256'))
+        self.assertEqual(self.request('GET', '/api/products', token).status_code, 401)
+
+        token = self.get_token('seller2@example.com', 'newpassword')
+        self.assertEqual(self.request('GET', '/api/products', token).status_code, 200)
+
+        seller_service.delete_seller(2)
+        self.assertEqual(self.request('GET', '/api/products', token).status_code, 401)
+
+    def test_expired_token(self):
+        """
+        This function tests that expired tokens are rejected
+        """
+        logger.info('Testing expired tokens')
+        token, _ = tokens.issue_token(current_app, seller_service.get_seller_by_id(1))
+        self.assertIsNotNone(tokens.load_token(current_app, token))
+
+        current_app.config['API_TOKEN_TTL'] = -1
+        self.assertIsNone(tokens.load_token(current_app, token))
+        self.assertIsNone(tokens.get_bearer_token({'Authorization': 'Basic abc'}))
+
+    def test_shared_revocations(self):
+        """
+        This function tests that the revocations of the shared revocation list are seen by the other workers
+        """
+        logger.info('Testing shared token revocations')
+        config = dict(current_app.config, API_TOKEN_REVOCATIONS_BACKEND='shared')
+        first = tokens.create_token_revocations(config, current_app.instance_path)
+        second = tokens.create_token_revocations(config, current_app.instance_path)
+        self.assertEqual(first.cache.path, current_app.config['API_TOKEN_REVOCATIONS_PATH'])
+
+        payload = {'id': 2, 'jti': uuid.uuid4().hex, 'iat': time.time()}
+        self.assertFalse(second.is_revoked(payload))
+        first.revoke_token(payload['jti'], payload['iat'] + 60)
+        self.assertTrue(second.is_revoked(payload))
+
+        payload = dict(payload, jti=uuid.uuid4().hex)
+        first.revoke_seller(2)
+        self.assertTrue(second.is_revoked(payload))
+        self.assertFalse(second.is_revoked(dict(payload, iat=time.time() + 1)))
+
+        with tempfile.TemporaryDirectory() as instance_path:
+            shared = tokens.create_token_revocations({'API_TOKEN_REVOCATIONS_BACKEND': 'shared'}, instance_path)
+            self.assertEqual(shared.cache.path, os.path.join(instance_path, 'token_revocations.db'))
+        self.assertIsInstance(tokens.create_token_revocations({}, None), tokens.TokenRevocations)
+        with self.assertRaises(ValueError):
+            tokens.create_token_revocations({'API_TOKEN_REVOCATIONS_BACKEND': 'redis'}, None)
@@ -0,0 +1,93 @@
+"""
+This module contains the tests for the validation of the API requests
+"""
+
+from tests.conftest import BaseTest, logger
+
+from ecom_app.rest.pagination import MAX_PAGE_LIMIT, encode_cursor, parse_page_args
+from ecom_app.validation import *
+
+
+class TestValidation(BaseTest):
+    """
+    This class contains the tests for the validation of the API requests
+    """
+    def assertInvalid(self, message, function, *args):
+        """
+        This method asserts that a validation function rejects its arguments with a message
+        :param message: expected message of the error
+        :param function: validation function to call
+        """
+        with self.assertRaises(InvalidInput) as context:
+            function(*args)
+        self.assertEqual(context.exception.message, message)
+
+    def test_parse_page_args(self):
+        """
+        This function tests the parse_page_args function
+        """
+        logger.info('Testing parse_page_args function')
+        self.assertEqual(parse_page_args({}), (None, None))
+        self.assertEqual(parse_page_args({'limit': '10'}), (10, None))
+        self.assertEqual(parse_page_args({'after': encode_cursor(5)}), (MAX_PAGE_LIMIT, 5))
+        self.assertInvalid('Limit is not valid', parse_page_args, {'limit': 'a'})
+        self.assertInvalid('Limit is not valid', parse_page_args, {'limit': str(MAX_PAGE_LIMIT + 1)})
+        self.assertInvalid('Cursor is not valid', parse_page_args, {'after': 'a'})
+
+    def test_parse_count_arg(self):
+        """
+        This function tests the parse_count_arg function
+        """
+        logger.info('Testing parse_count_arg function')
+        self.assertIsNone(parse_count_arg({}, 'inventory_from'))
+        self.assertEqual(parse_count_arg({'inventory_from': '0'}, 'inventory_from'), 0)
+        self.assertInvalid('Invalid input', parse_count_arg, {'inventory_from': '-1'}, 'inventory_from')
+        self.assertInvalid('Invalid input', parse_count_arg, {'inventory_from': 'a'}, 'inventory_from')
+
+    def test_validate_sellers(self):
+        """
+        This function tests the validate_new_seller and validate_seller_changes functions
+        """
+        logger.info('Testing validate_new_seller and validate_seller_changes functions')
+        seller = {'name': 'Seller', 'email': 'seller@test.com', 'phone': '+380968102936', 'password': 'password'}
+        self.assertEqual(validate_new_seller(seller), seller)
+        self.assertInvalid('Invalid input', validate_new_seller, dict(seller, phone='123'))
+        self.assertInvalid('Invalid input', validate_new_seller, dict(seller, password='pass word'))
+        self.assertInvalid('Invalid input', validate_new_seller, ['Seller'])
+
+        self.assertEqual(validate_seller_changes({'name': 'Name', 'password': 'password'}, allow_password=False),
+                         {'name': 'Name', 'email': None, 'phone': None, 'password': None})
+        self.assertEqual(validate_seller_changes({'password': 'password'}, allow_password=True)['password'],
+                         'password')
+        self.assertInvalid('Email is not valid', validate_seller_changes, {'email': 'email'}, False)
+        self.assertInvalid('Phone is not valid', validate_seller_changes, {'phone': 'phone'}, False)
+        self.assertInvalid('Password is not valid', validate_seller_changes, {'password': 'short'}, True)
+
+    def test_validate_product_changes(self):
+        """
+        This function tests the validate_product_changes function
+        """
+        logger.info('Testing validate_product_changes function')
+        self.assertEqual(validate_product_changes({'price': '10', 'inventory': 0}),
+                         {'name': None, 'description': None, 'price': 10, 'inventory': 0})
+        self.assertInvalid('Name is not valid', validate_product_changes, {'name': ''})
+        self.assertInvalid('Price is not valid', validate_product_changes, {'price': None})
+        self.assertInvalid('Inventory is not valid', validate_product_changes, {'inventory': -1})
+
+    def test_validate_orders(self):
+        """
+        This function tests the validate_new_order and validate_order_changes functions
+        """
+        logger.info('Testing validate_new_order and validate_order_changes functions')
+        order = {'product_id': '1', 'quantity': 2, 'customer_details': 'Customer', 'status': 'Complete'}
+        self.assertEqual(validate_new_order(order), dict(order, product_id=1))
+        self.assertInvalid('Invalid input', validate_new_order, dict(order, quantity=0))
+        self.assertInvalid('Invalid input', validate_new_order, dict(order, customer_details=5))
+        self.assertInvalid('Status is not valid', validate_new_order, dict(order, status='Unknown'))
+        self.assertInvalid('Status is not valid', validate_new_order, order, ['In progress'])
+
+        self.assertEqual(validate_order_changes({'product': 1, 'quantity': '3'}),
+                         {'product': 1, 'quantity': 3, 'customer_details': None, 'status': None})
+        self.assertInvalid('Quantity is not valid', validate_order_changes, {'quantity': 'a'})
+        self.assertInvalid('Customer details is not valid', validate_order_changes, {'customer_details': ''})
+        self.assertInvalid('Status is not valid', validate_order_changes, {'status': 'Unknown'})